@@ -3,19 +3,50 @@ import dash_bootstrap_components as dbc
 from dash import dcc, html
 from dash.dependencies import Input, Output, State
 import pandas as pd
-import io
-import base64
+import json
 import logging
+import os
 from pydantic import BaseModel, Field, ValidationError
-from src.calculations import calculate_overnight_temp
-from src.data_preperation import load_data_from_csv
-from src.models import WeatherInput
-import plotly.express as px
+from src.calculations import (
+    CLOUD_BIN_COLUMN,
+    WIND_BIN_COLUMN,
+    calculate_overnight_temp,
+)
+from src.models import WeatherInput, validate_weather_batch
+from src.figures import build_forecast_figures
+from src.ingest import MISSING_COLUMNS_MESSAGE, parse_upload
+from src.instrumentation import configure_logging, render_prometheus, timed
+from src.jobs import CANCELLED, DONE, QUEUED, RUNNING, JobQueue, JobQueueFull
+from src.reference_cache import get_reference_table
+from src.reports import forecast_reports, reports_zip
+from src.result_store import (
+    DEFAULT_MAX_BYTES,
+    DEFAULT_SPILL_MAX_AGE,
+    DEFAULT_SPILL_MAX_BYTES,
+    ResultStore,
+)
+from src.scalar import forecast_one
+from src.service import create_forecast_api
 import plotly.graph_objects as go
+import plotly.io as pio
 
 # Initialize the Dash app with Bootstrap theme
 app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
+# Reference table, compiled once per worker and reloaded when the file changes
+REFERENCE_PATH = "./data/processed/transformed_reference.csv"
+
+
+# JSON/NDJSON batch forecasts for other services, at POST /api/forecast
+app.server.register_blueprint(create_forecast_api(REFERENCE_PATH))
+
+
+# Prometheus-style stage timings, populated when FORECAST_METRICS=1
+@app.server.route("/metrics")
+def metrics():
+    return render_prometheus(), 200, {"Content-Type": "text/plain; version=0.0.4"}
+
+
 # Layout of the app
 def create_layout():
     return dbc.Container(
@@ -44,6 +75,16 @@ def create_layout():
                                 multiple=False,
                             ),
                             html.Div(id="upload-status", className="mt-3"),
+                            dbc.Button(
+                                "Cancel Upload",
+                                id="cancel-btn",
+                                color="secondary",
+                                className="mt-2",
+                                disabled=True,
+                            ),
+                            # Background upload job and its progress polling
+                            dcc.Store(id="job-id"),
+                            dcc.Interval(id="job-poll", interval=1000, disabled=True),
                         ],
                         width=12,
                     )
@@ -177,24 +218,205 @@ def create_layout():
                         ),
                         width={"size": 4},
                         className="d-flex justify-content-center",
-                    )
+                    ),
+                    dbc.Col(
+                        dbc.Button(
+                            "Download Location/Date Reports",
+                            id="reports-btn",
+                            color="secondary",
+                            className="mt-3 mb-3",
+                            disabled=True,
+                        ),
+                        width={"size": 4},
+                        className="d-flex justify-content-center",
+                    ),
                 ]
             ),
             dcc.Download(id="download-data"),
+            dcc.Download(id="download-reports"),
+            # ID of this browser's latest forecasts in the server-side result store
+            dcc.Store(id="result-key"),
         ],
         fluid=True,
     )
 
-# Helper function to decode uploaded CSV content
+
+# Helper function to decode uploaded CSV content; the header is validated before
+# the body is parsed, and the payload is decoded in chunks straight to bytes
 def parse_uploaded_file(contents):
-    content_type, content_string = contents.split(",")
-    decoded = base64.b64decode(content_string)
-    return pd.read_csv(io.StringIO(decoded.decode("utf-8")))
+    with timed("parse_upload") as timer:
+        df = parse_upload(contents)
+        timer.rows = len(df)
+    return df
+
+
+# Server-side store for forecast downloads, keyed by a per-result ID kept in the
+# browser, so results never leak between users or depend on worker globals
+result_store = ResultStore(
+    max_bytes=int(os.environ.get("RESULT_STORE_MAX_BYTES", DEFAULT_MAX_BYTES)),
+    spill_dir=os.environ.get("RESULT_STORE_SPILL_DIR") or None,
+    write_through=os.environ.get("RESULT_STORE_WRITE_THROUGH", "") == "1",
+    spill_max_bytes=int(
+        os.environ.get("RESULT_STORE_SPILL_MAX_BYTES", DEFAULT_SPILL_MAX_BYTES)
+    ),
+    spill_max_age=float(
+        os.environ.get("RESULT_STORE_SPILL_MAX_AGE", DEFAULT_SPILL_MAX_AGE)
+    ),
+)
+# Zipped Location/Date reports for uploads, under the same ID as their forecasts
+report_store = ResultStore(
+    max_bytes=result_store.max_bytes // 4,
+    spill_dir=(
+        os.path.join(result_store.spill_dir, "reports")
+        if result_store.spill_dir
+        else None
+    ),
+    write_through=result_store.write_through,
+    spill_max_bytes=result_store.spill_max_bytes // 4,
+    spill_max_age=result_store.spill_max_age,
+)
+
+# Uploads are processed by a bounded background pool so large files don't block
+# request threads; the manual calculator stays synchronous
+job_queue = JobQueue(
+    max_workers=int(os.environ.get("FORECAST_JOB_WORKERS", 2)),
+    max_pending=int(os.environ.get("FORECAST_JOB_MAX_PENDING", 8)),
+)
+
+
+def process_upload(job, upload_contents):
+    """Background job: parse, forecast and plot an uploaded file."""
+    job.progress(0.1, "Reading file")
+    df = parse_uploaded_file(upload_contents)  # Rejects missing required columns
+
+    job.progress(0.3, "Validating rows")
+    with timed("validate_upload", rows=len(df)):
+        _, validation_report = validate_weather_batch(df)
+    invalid_rows = int(validation_report["row"].nunique())
 
-# Global variable to store the forecast results
-global_forecasts = None
+    job.progress(0.4, "Calculating forecasts")
+    reference_table = get_reference_table(REFERENCE_PATH)
+    forecasts = calculate_overnight_temp(df, reference_table, keep_bins=True)
+    # The bin columns feed the reports and are left out of the download
+    result_key = result_store.put(
+        forecasts.drop(columns=[WIND_BIN_COLUMN, CLOUD_BIN_COLUMN])
+    )
+
+    job.progress(0.6, "Building reports")
+    reports = forecast_reports(forecasts, reference_table)
+    # Files without Location or Date columns get no reports, and no reports button
+    if reports:
+        report_store.put_bytes(reports_zip(reports), key=result_key)
+
+    job.progress(0.7, "Building figures")
+    with timed("build_figures", rows=len(df)):
+        figures = build_forecast_figures(df)
+    return {
+        "result_key": result_key,
+        "figures": [json.loads(pio.to_json(fig)) for fig in figures],
+        "invalid_rows": invalid_rows,
+        "first_error": (
+            f"row {validation_report['row'].iloc[0]}: "
+            f"{validation_report['field'].iloc[0]} {validation_report['reason'].iloc[0]}"
+            if invalid_rows
+            else None
+        ),
+    }
 
-# Core callback function to handle both file upload and manual data entry
+
+def forecast_outputs(
+    message="",
+    download_disabled=True,
+    download=None,
+    figures=None,
+    result_key=dash.no_update,
+    job_id=dash.no_update,
+    polling_disabled=dash.no_update,
+):
+    """Build the handle_forecast outputs; graphs are hidden unless figures are given."""
+    empty_graph = go.Figure()
+    empty_style = {"display": "none"}
+    graphs = []
+    for figure in figures or [empty_graph] * 3:
+        graphs += [figure, {"display": "block"} if figures else empty_style]
+    return (
+        message,
+        download_disabled,
+        download,
+        *graphs,
+        result_key,
+        job_id,
+        polling_disabled,
+        polling_disabled,  # Cancel is only enabled while a job is being polled
+    )
+
+
+def job_outputs(job_id, record):
+    """Outputs for a polled upload job, depending on its state."""
+    if record is None:
+        return forecast_outputs(
+            dbc.Alert(
+                "Upload job not found. Please try again.",
+                color="danger",
+                className="mt-4",
+            ),
+            job_id=None,
+            polling_disabled=True,
+        )
+    if record["state"] in (QUEUED, RUNNING):
+        progress = int(record["progress"] * 100)
+        return forecast_outputs(
+            html.Div(
+                [
+                    html.Div(record["message"], className="mb-2"),
+                    dbc.Progress(value=progress, label=f"{progress}%"),
+                ]
+            ),
+        )
+
+    job_queue.discard(job_id)
+    if record["state"] == DONE:
+        result = record["result"]
+        message = dbc.Alert(
+            "File processed successfully. You can now download the forecasts.",
+            color="success",
+            className="mt-4",
+        )
+        if result.get("invalid_rows"):
+            message = html.Div(
+                [
+                    message,
+                    dbc.Alert(
+                        f"{result['invalid_rows']} rows are outside the accepted input "
+                        f"ranges (first at {result['first_error']}).",
+                        color="warning",
+                    ),
+                ]
+            )
+        return forecast_outputs(
+            message,
+            download_disabled=False,  # Enable download button
+            figures=result["figures"],
+            result_key=result["result_key"],  # Server-side result for the download
+            job_id=None,
+            polling_disabled=True,
+        )
+    if record["state"] == CANCELLED:
+        message = dbc.Alert("Upload cancelled.", color="warning", className="mt-4")
+    elif record["message"] == MISSING_COLUMNS_MESSAGE:
+        message = record["message"]
+    else:
+        message = dbc.Alert(
+            "Error processing file. Please try again.",
+            color="danger",
+            className="mt-4",
+        )
+    return forecast_outputs(
+        message, result_key=None, job_id=None, polling_disabled=True
+    )
+
+
+# Core callback function to handle file upload, manual data entry and downloads
 @app.callback(
     [
         Output("result-output", "children"),
@@ -206,11 +428,17 @@ global_forecasts = None
         Output("dew-point-vs-overnight", "style"),
         Output("correlation-heatmap", "figure"),
         Output("correlation-heatmap", "style"),
+        Output("result-key", "data"),
+        Output("job-id", "data"),
+        Output("job-poll", "disabled"),
+        Output("cancel-btn", "disabled"),
     ],
     [
         Input("upload-data", "contents"),
         Input("calculate-btn", "n_clicks"),
         Input("download-btn", "n_clicks"),
+        Input("job-poll", "n_intervals"),
+        Input("cancel-btn", "n_clicks"),
     ],
     [
         State("upload-data", "filename"),
@@ -218,141 +446,59 @@ global_forecasts = None
         State("dew-point-temp", "value"),
         State("wind-speed", "value"),
         State("cloud-cover", "value"),
+        State("result-key", "data"),
+        State("job-id", "data"),
     ],
 )
 def handle_forecast(
     upload_contents,
     calc_clicks,
     download_clicks,
+    poll_intervals,
+    cancel_clicks,
     filename,
     midday_temp,
     dew_point_temp,
     wind_speed,
     cloud_cover,
+    result_key,
+    job_id,
 ):
-    global global_forecasts
     triggered_id = dash.callback_context.triggered_id
 
-    # Initialize default values for all graphs
-    empty_graph = go.Figure()
-    empty_style = {"display": "none"}
-
-    # Handle file upload
+    # Handle file upload: queue a background job and start polling it
     if triggered_id == "upload-data" and upload_contents:
+        job_queue.cancel(job_id)  # A new upload replaces any running one
         try:
-            df = parse_uploaded_file(upload_contents)
-
-            # Ensure necessary columns are present
-            required_columns = [
-                "Midday Temperature (°C)",
-                "Midday Dew Point (°C)",
-                "Wind (Kn)",
-                "Cloud (oktas)",
-            ]
-            if not all(col in df.columns for col in required_columns):
-                return (
-                    "Uploaded file is missing required columns.",
-                    True,
-                    None,
-                    empty_graph,
-                    empty_style,
-                    empty_graph,
-                    empty_style,
-                    empty_graph,
-                    empty_style,
-                )
-
-            reference_df = load_data_from_csv(
-                "./data/processed/transformed_reference.csv"
-            )
-            global_forecasts = calculate_overnight_temp(df, reference_df)
-
-            # Generate scatter plots
-            midday_vs_overnight_fig = px.scatter(
-                df,
-                x="Midday Temperature (°C)",
-                y="Overnight Min Temperature (°C)",
-                title="Midday Temperature vs Overnight Minimum Temperature",
-            )
-
-            dew_point_vs_overnight_fig = px.scatter(
-                df,
-                x="Midday Dew Point (°C)",
-                y="Overnight Min Temperature (°C)",
-                title="Dew Point Temperature vs Overnight Minimum Temperature",
-            )
-
-            # Correlation Heatmap
-            corr_matrix = df[
-                [
-                    "Midday Temperature (°C)",
-                    "Midday Dew Point (°C)",
-                    "Wind (Kn)",
-                    "Cloud (oktas)",
-                    "Overnight Min Temperature (°C)",
-                ]
-            ].corr()
-            corr_heatmap_fig = px.imshow(
-                corr_matrix, text_auto=True, title="Correlation Heatmap"
-            )
-            corr_heatmap_fig.update_layout(
-                width=1200,  # Larger width to avoid overlap
-                height=1000,  # Larger height to avoid overlap
-                title={"x": 0.5},
-                xaxis_title="",
-                yaxis_title="",
-                xaxis=dict(
-                    tickvals=list(range(len(corr_matrix.columns))),
-                    ticktext=[str(col) for col in corr_matrix.columns],
-                    tickangle=45,
-                    tickmode="array",
-                    tickfont=dict(size=12),
-                    automargin=True,
-                ),
-                yaxis=dict(
-                    tickvals=list(range(len(corr_matrix.columns))),
-                    ticktext=[str(col) for col in corr_matrix.columns],
-                    tickangle=0,
-                    tickmode="array",
-                    tickfont=dict(size=12),
-                    automargin=True,
-                ),
-                coloraxis_colorbar=dict(title="Correlation"),
-                margin=dict(l=250, r=20, t=50, b=250),  # Larger margins
-            )
-
-            return (
+            new_job_id = job_queue.submit(process_upload, upload_contents)
+        except JobQueueFull:
+            return forecast_outputs(
                 dbc.Alert(
-                    "File processed successfully. You can now download the forecasts.",
-                    color="success",
+                    "The server is busy processing other uploads. Please try again shortly.",
+                    color="warning",
                     className="mt-4",
                 ),
-                False,  # Enable download button
-                dash.no_update,  # No data to update for download yet
-                midday_vs_overnight_fig,  # Midday vs Overnight plot
-                {"display": "block"},  # Show the midday vs overnight graph
-                dew_point_vs_overnight_fig,  # Dew Point vs Overnight plot
-                {"display": "block"},
-                corr_heatmap_fig,  # Correlation Heatmap plot
-                {"display": "block"},
-            )
-        except Exception as e:
-            logging.error(f"Error processing file: {e}")
-            return (
-                dbc.Alert(
-                    "Error processing file. Please try again.",
-                    color="danger",
-                    className="mt-4",
-                ),
-                True,
-                None,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
+                result_key=None,
+                job_id=None,
+                polling_disabled=True,
             )
+        return forecast_outputs(
+            html.Div("Upload queued for processing...", className="mt-4"),
+            result_key=None,
+            job_id=new_job_id,
+            polling_disabled=False,
+        )
+
+    # Poll the running upload job for progress or results
+    elif triggered_id == "job-poll" and job_id:
+        return job_outputs(job_id, job_queue.status(job_id))
+
+    # Cancel the running upload job
+    elif triggered_id == "cancel-btn" and cancel_clicks and job_id:
+        job_queue.cancel(job_id)
+        return forecast_outputs(
+            dbc.Alert("Cancelling upload...", color="warning", className="mt-4")
+        )
 
     # Handle manual input and calculation
     elif triggered_id == "calculate-btn" and calc_clicks:
@@ -365,101 +511,100 @@ def handle_forecast(
                 cloud_cover=cloud_cover,
             )
 
-            # Create dataframe for manual input and process calculation
-            trial_data = pd.DataFrame(
+            # Forecast the single point without pandas, memoized on the inputs
+            overnight_min = forecast_one(
+                input_data.midday_temp,
+                input_data.dew_point_temp,
+                input_data.wind_speed,
+                input_data.cloud_cover,
+                reference=REFERENCE_PATH,
+            )
+
+            # One-row dataframe for the download
+            forecasts = pd.DataFrame(
                 {
                     "Midday Temperature (°C)": [input_data.midday_temp],
                     "Midday Dew Point (°C)": [input_data.dew_point_temp],
                     "Wind (Kn)": [input_data.wind_speed],
                     "Cloud (oktas)": [input_data.cloud_cover],
+                    "Overnight Min Temperature (°C)": [overnight_min],
                 }
             )
 
-            reference_df = load_data_from_csv(
-                "./data/processed/transformed_reference.csv"
-            )
-            global_forecasts = calculate_overnight_temp(trial_data, reference_df)
-
             # Return results without graphs for manual input
-            return (
+            return forecast_outputs(
                 dbc.Alert(
-                    f"Calculated Overnight Min Temperature (°C): {global_forecasts['Overnight Min Temperature (°C)'][0]} °C",
+                    f"Calculated Overnight Min Temperature (°C): {overnight_min} °C",
                     color="success",
                     className="mt-4",
                 ),
-                False,  # Enable download button
-                dash.no_update,  # No data to update for download yet
-                empty_graph,  # Hide the midday vs overnight graph
-                empty_style,  # Hide the midday vs overnight graph
-                empty_graph,  # Hide the dew point vs overnight graph
-                empty_style,  # Hide the dew point vs overnight graph
-                empty_graph,  # Hide the correlation heatmap
-                empty_style,  # Hide the correlation heatmap
+                download_disabled=False,  # Enable download button
+                download=dash.no_update,  # No data to update for download yet
+                result_key=result_store.put(forecasts),
             )
         except ValidationError as e:
-            return (
+            return forecast_outputs(
                 dbc.Alert(
                     f"Validation error: Invalid Input", color="danger", className="mt-4"
                 ),
-                True,
-                None,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
+                result_key=None,
             )
         except Exception as e:
             logging.error(f"Error in calculation: {e}")
-            return (
+            return forecast_outputs(
                 dbc.Alert(
                     "An error occurred during calculation. Please try again.",
                     color="danger",
                     className="mt-4",
                 ),
-                True,
-                None,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
+                result_key=None,
             )
 
     # Handle file download of forecasts
     elif triggered_id == "download-btn" and download_clicks:
-        if global_forecasts is not None:
-            return (
+        forecast_csv = result_store.get(result_key)
+        if forecast_csv is not None:
+            return forecast_outputs(
                 dash.no_update,
-                True,
-                dcc.send_data_frame(
-                    global_forecasts.to_csv, filename="temperature_forecasts_report.csv"
+                download=dcc.send_bytes(
+                    forecast_csv, filename="temperature_forecasts_report.csv"
                 ),
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
-                empty_graph,
-                empty_style,
             )
+        return forecast_outputs(
+            dbc.Alert(
+                "Forecasts have expired. Please upload or calculate again.",
+                color="warning",
+                className="mt-4",
+            ),
+            result_key=None,
+        )
 
     # Default return when no action is triggered
-    return (
-        "",
-        True,
-        None,
-        empty_graph,
-        empty_style,
-        empty_graph,
-        empty_style,
-        empty_graph,
-        empty_style,
-    )
+    return forecast_outputs()
+
+
+# Reports are only available for uploads, not manual calculations
+@app.callback(Output("reports-btn", "disabled"), Input("result-key", "data"))
+def toggle_reports(result_key):
+    return result_key not in report_store
+
+
+@app.callback(
+    Output("download-reports", "data"),
+    Input("reports-btn", "n_clicks"),
+    State("result-key", "data"),
+    prevent_initial_call=True,
+)
+def download_reports(n_clicks, result_key):
+    reports = report_store.get(result_key)
+    if not n_clicks or reports is None:
+        return dash.no_update
+    return dcc.send_bytes(reports, filename="temperature_forecast_reports.zip")
+
 
 # Update layout
 app.layout = create_layout()
 
 if __name__ == "__main__":
+    configure_logging()
     app.run_server(debug=True)
@@ -0,0 +1,46 @@
+"""Load + compute + save time for CSV, Parquet and Feather.
+
+Usage:
+    python -m benchmarks.bench_formats [--rows N]
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.common import best_of, make_trial_data
+from src.calculations import INPUT_COLUMNS, calculate_overnight_temp
+from src.data_preperation import load_data, save_data
+from src.reference_cache import get_reference_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    table = get_reference_table("./data/processed/transformed_reference.csv")
+    trial_data = make_trial_data(args.rows)
+
+    print(
+        f"{'format':>8} {'load':>8} {'compute':>8} {'save':>8} {'total':>8} {'MB':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for extension in (".csv", ".parquet", ".feather"):
+            input_path = os.path.join(tmp, f"trial{extension}")
+            output_path = os.path.join(tmp, f"forecasts{extension}")
+            save_data(trial_data, input_path)
+
+            load_s, df = best_of(lambda: load_data(input_path, columns=INPUT_COLUMNS))
+            compute_s, df = best_of(lambda: calculate_overnight_temp(df, table))
+            save_s, _ = best_of(lambda: save_data(df, output_path))
+            size_mb = os.path.getsize(input_path) / 1e6
+            total = load_s + compute_s + save_s
+            print(
+                f"{extension[1:]:>8} {load_s:>8.3f} {compute_s:>8.3f} "
+                f"{save_s:>8.3f} {total:>8.3f} {size_mb:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
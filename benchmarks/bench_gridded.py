@@ -0,0 +1,65 @@
+"""Throughput of gridded forecasts at 1, 2, 4 ... N worker threads.
+
+Usage:
+    python -m benchmarks.bench_gridded [--shape T Y X] [--max-workers N]
+"""
+
+import argparse
+import os
+
+import numpy as np
+
+from benchmarks.common import best_of
+from src.gridded import DEFAULT_TILE_ELEMENTS, forecast_grid
+from src.reference_cache import get_reference_table
+
+
+def make_grid(shape, seed: int = 0):
+    """Generate float32 temperature, dew point, wind and cloud fields.
+
+    Wind spans past the last range, so some cells fall into the missing K cell
+    and come out as NaN.
+    """
+    rng = np.random.default_rng(seed)
+    return (
+        rng.uniform(-10, 35, shape).astype(np.float32),
+        rng.uniform(-15, 25, shape).astype(np.float32),
+        rng.uniform(0, 50, shape).astype(np.float32),
+        rng.integers(0, 9, shape).astype(np.float32),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shape", type=int, nargs="+", default=[30, 1000, 1000])
+    parser.add_argument("--tile-elements", type=int, default=DEFAULT_TILE_ELEMENTS)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    table = get_reference_table("./data/processed/transformed_reference.csv")
+    fields = make_grid(tuple(args.shape))
+    out = np.empty(args.shape, dtype=np.float32)
+    cells = out.size
+
+    workers = 1
+    print(f"{'workers':>8} {'seconds':>10} {'cells/sec':>14}")
+    while True:
+        seconds, _ = best_of(
+            lambda: forecast_grid(
+                *fields,
+                table,
+                tile_elements=args.tile_elements,
+                workers=workers,
+                out=out,
+            ),
+            repeat=2,
+        )
+        print(f"{workers:>8} {seconds:>10.3f} {cells / seconds:>14,.0f}")
+        if workers >= args.max_workers:
+            break
+        workers = min(workers * 2, args.max_workers)
+    print(f"NaN cells: {np.isnan(out).mean():.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Throughput of the fused kernel against the vectorized and apply engines.
+
+The fused kernel is timed single-threaded and on every thread numba allows.
+Without numba installed it runs its NumPy fallback, reported as such. The
+apply engine is timed on at most --apply-rows rows.
+
+Usage:
+    python -m benchmarks.bench_kernels [--rows N] [--apply-rows N]
+"""
+
+import argparse
+
+from benchmarks.common import best_of, make_trial_data
+from src.calculations import INPUT_COLUMNS, calculate_overnight_temp, forecast_arrays
+from src.kernels import HAVE_NUMBA, forecast_fused
+from src.reference_cache import get_reference_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--apply-rows", type=int, default=10_000)
+    args = parser.parse_args()
+
+    table = get_reference_table("./data/processed/transformed_reference.csv")
+    trial_data = make_trial_data(args.rows)
+    columns = [trial_data[column].to_numpy() for column in INPUT_COLUMNS]
+    # Compile (or load the cached kernels) outside the timings
+    forecast_fused(*(column[:10] for column in columns), table)
+    forecast_fused(*(column[:10] for column in columns), table, threads=0)
+
+    fused = "fused" if HAVE_NUMBA else "fused (NumPy fallback)"
+    timings = [
+        ("vectorized", args.rows, lambda: forecast_arrays(*columns, table)),
+        (fused, args.rows, lambda: forecast_fused(*columns, table)),
+        (
+            f"{fused}, all threads",
+            args.rows,
+            lambda: forecast_fused(*columns, table, threads=0),
+        ),
+    ]
+    apply_rows = min(args.apply_rows, args.rows)
+    apply_data = trial_data.head(apply_rows)
+    timings.append(
+        (
+            "apply",
+            apply_rows,
+            lambda: calculate_overnight_temp(apply_data.copy(), table, engine="apply"),
+        )
+    )
+
+    print(f"{'engine':>32} {'rows':>10} {'seconds':>10} {'ns/row':>10}")
+    for name, rows, func in timings:
+        seconds, _ = best_of(func, repeat=1 if name == "apply" else 3)
+        print(f"{name:>32} {rows:>10} {seconds:>10.3f} {seconds / rows * 1e9:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
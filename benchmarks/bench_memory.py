@@ -0,0 +1,71 @@
+"""Peak RSS of loading and forecasting a CSV, default vs compact mode.
+
+Each mode runs in a fresh subprocess so peak RSS is measured independently.
+
+Usage:
+    python -m benchmarks.bench_memory [--rows N]
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+from benchmarks.common import make_trial_data
+
+REFERENCE_PATH = "./data/processed/transformed_reference.csv"
+GENERATE_CHUNK_ROWS = 500_000
+
+
+def run_child(mode: str, input_path: str) -> None:
+    """Load and forecast the input in one mode, then print peak RSS in MB."""
+    from src.calculations import calculate_overnight_temp
+    from src.data_preperation import load_data
+    from src.reference_cache import get_reference_table
+
+    compact = mode == "compact"
+    table = get_reference_table(REFERENCE_PATH)
+    df = load_data(input_path, compact=compact)
+    calculate_overnight_temp(df, table, compact=compact)
+    # ru_maxrss is in kilobytes on Linux
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    frame_mb = df.memory_usage(deep=True).sum() / 1e6
+    print(f"{mode:>8} {peak_mb:>12.0f} {frame_mb:>12.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"))
+    args = parser.parse_args()
+    if args.child:
+        run_child(*args.child)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "trial.csv")
+        # Write in chunks: children inherit the parent's peak RSS across fork/exec
+        for seed, start in enumerate(range(0, args.rows, GENERATE_CHUNK_ROWS)):
+            n_rows = min(GENERATE_CHUNK_ROWS, args.rows - start)
+            make_trial_data(n_rows, seed).to_csv(
+                input_path, mode="a", header=start == 0, index=False
+            )
+        print(f"{'mode':>8} {'peak RSS MB':>12} {'frame MB':>12}")
+        for mode in ("default", "compact"):
+            subprocess.run(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.bench_memory",
+                    "--child",
+                    mode,
+                    input_path,
+                ],
+                check=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
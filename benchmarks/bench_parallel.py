@@ -0,0 +1,37 @@
+"""Throughput of the parallel engine at 1, 2, 4 ... N worker processes.
+
+Usage:
+    python -m benchmarks.bench_parallel [--rows N] [--max-workers N]
+"""
+
+import argparse
+import os
+
+from benchmarks.common import best_of, make_trial_data
+from src.parallel import ParallelForecaster
+from src.reference_cache import get_reference_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    table = get_reference_table("./data/processed/transformed_reference.csv")
+    trial_data = make_trial_data(args.rows)
+
+    workers = 1
+    print(f"{'workers':>8} {'seconds':>10} {'rows/sec':>14}")
+    while True:
+        with ParallelForecaster(table, workers) as forecaster:
+            forecaster.compute(trial_data.head(1000))  # warm up the pool
+            seconds, _ = best_of(lambda: forecaster.compute(trial_data))
+        print(f"{workers:>8} {seconds:>10.3f} {args.rows / seconds:>14,.0f}")
+        if workers >= args.max_workers:
+            break
+        workers = min(workers * 2, args.max_workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Cold-start latency of `python -c "import ..."` for the library, CLI and app.
+
+Each import runs in a fresh interpreter, so the times include interpreter
+startup; the bare interpreter is timed first as the baseline. The heavy
+optional modules each import pulls in are listed alongside.
+
+Usage:
+    python -m benchmarks.bench_startup [--repeat N] [--output FILE]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+DEFAULT_MODULES = [
+    "numpy",
+    "src.calculations",
+    "src.scalar",
+    "src.kernels",
+    "src.cli",
+    "src.service",
+    "app",
+]
+HEAVY_MODULES = ["pandas", "numba", "plotly", "plotly.express", "dash", "pydantic"]
+
+
+def time_import(module: str, repeat: int) -> Dict:
+    """Time importing a module in fresh interpreters and list its heavy imports."""
+    statement = f"import {module}" if module else "pass"
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], check=True)
+        seconds.append(time.perf_counter() - start)
+
+    loaded: List[str] = []
+    if module:
+        probe = (
+            f"import sys, {module}; "
+            f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        loaded = output.split(",") if output else []
+    return {
+        "module": module or "(interpreter)",
+        "min_seconds": min(seconds),
+        "median_seconds": statistics.median(seconds),
+        "heavy_imports": loaded,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Also write the results as JSON.")
+    args = parser.parse_args()
+
+    results = [time_import(module, args.repeat) for module in ["", *args.modules]]
+    print(f"{'module':>18} {'min ms':>8} {'median ms':>10}  heavy imports")
+    for r in results:
+        print(
+            f"{r['module']:>18} {r['min_seconds'] * 1000:>8.0f} "
+            f"{r['median_seconds'] * 1000:>10.0f}  {', '.join(r['heavy_imports'])}"
+        )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def make_trial_data(n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Generate synthetic trial data with the create_trial_data schema.
+
+    Wind and cloud values are drawn from the ranges that have a K value, so every
+    row can be forecast.
+    """
+    rng = np.random.default_rng(seed)
+    wind = rng.integers(0, 38, n_rows) + rng.choice([0.0, 0.5], n_rows)
+    cloud = rng.integers(0, 9, n_rows).astype(np.float64)
+    return pd.DataFrame(
+        {
+            "Date": rng.integers(1, 366, n_rows),
+            "Location": rng.choice(list("ABCDEFGHIJ"), n_rows),
+            "Midday Temperature (°C)": rng.uniform(-10, 35, n_rows).round(1),
+            "Midday Dew Point (°C)": rng.uniform(-15, 25, n_rows).round(1),
+            "Wind (Kn)": wind,
+            "Cloud (oktas)": cloud,
+        }
+    )
+
+
+def best_of(func: Callable[[], object], repeat: int = 3) -> Tuple[float, object]:
+    """Run a function several times and return the fastest time and last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
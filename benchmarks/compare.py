@@ -0,0 +1,48 @@
+"""Compare two benchmark JSON files written by benchmarks/run_suite.py.
+
+Usage:
+    python -m benchmarks.compare BASELINE.json CANDIDATE.json [--threshold 1.1]
+"""
+
+import argparse
+import json
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=1.1,
+        help="Slowdown ratio reported as a regression (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    key = lambda r: (r["benchmark"], r["variant"], r["rows"])
+    before = {key(r): r["seconds"] for r in baseline["results"]}
+    regressions = 0
+    print(f"{baseline['commit']} -> {candidate['commit']}")
+    for result in candidate["results"]:
+        if key(result) not in before:
+            continue
+        ratio = result["seconds"] / before[key(result)]
+        flag = ""
+        if ratio > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(
+            f"{result['benchmark']:>26} {result['variant']:>12} {result['rows']:>10} "
+            f"{before[key(result)]:>10.4f}s {result['seconds']:>10.4f}s {ratio:>6.2f}x{flag}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
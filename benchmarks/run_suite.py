@@ -0,0 +1,238 @@
+"""Benchmark suite for lookup, calculation, I/O and the Dash callback.
+
+Results are written as JSON so runs can be compared between commits with
+benchmarks/compare.py.
+
+Usage:
+    python -m benchmarks.run_suite [--sizes 1000 10000 ...] [--output FILE]
+"""
+
+import argparse
+import base64
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import best_of, make_trial_data
+from src.calculations import ENGINES, calculate_overnight_temp
+from src.data_preperation import load_data_from_csv, save_data_to_csv
+from src.kernels import HAVE_NUMBA
+from src.parallel import calculate_overnight_temp_parallel
+from src.scalar import ScalarForecaster
+from src.utils import KTable, find_range, k_value_lookup
+
+REFERENCE_PATH = "./data/processed/transformed_reference.csv"
+DEFAULT_SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+SCALAR_CALLS = 1_000
+
+
+def _record(name: str, variant: str, rows: int, seconds: float) -> Dict:
+    return {
+        "benchmark": name,
+        "variant": variant,
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds > 0 else None,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def bench_lookups(reference: pd.DataFrame, table: KTable) -> List[Dict]:
+    """Time scalar range and K lookups, reported per SCALAR_CALLS calls."""
+    rng = np.random.default_rng(0)
+    winds = rng.integers(0, 38, SCALAR_CALLS).astype(float)
+    clouds = rng.integers(0, 9, SCALAR_CALLS).astype(float)
+
+    uncached = ScalarForecaster(table, maxsize=0)
+    cached = ScalarForecaster(table)
+
+    def run(func: Callable[[float, float], object]) -> float:
+        seconds, _ = best_of(lambda: [func(w, c) for w, c in zip(winds, clouds)])
+        return seconds
+
+    return [
+        _record(
+            "find_range",
+            "dataframe",
+            SCALAR_CALLS,
+            run(lambda w, c: find_range(w, "Wind Speed Range (kn)", reference)),
+        ),
+        _record(
+            "find_range", "ktable", SCALAR_CALLS, run(lambda w, c: table.wind_range(w))
+        ),
+        _record(
+            "k_value_lookup",
+            "dataframe",
+            SCALAR_CALLS,
+            run(lambda w, c: k_value_lookup(w, c, reference)),
+        ),
+        _record(
+            "k_value_lookup",
+            "ktable",
+            SCALAR_CALLS,
+            run(lambda w, c: k_value_lookup(w, c, table)),
+        ),
+        _record(
+            "forecast_one",
+            "uncached",
+            SCALAR_CALLS,
+            run(lambda w, c: uncached.forecast(20.0, 10.0, w, c)),
+        ),
+        _record(
+            "forecast_one",
+            "cached",
+            SCALAR_CALLS,
+            run(lambda w, c: cached.forecast(20.0, 10.0, w, c)),
+        ),
+    ]
+
+
+def bench_calculation(
+    trial_data: pd.DataFrame, table: KTable, apply_max_rows: int
+) -> List[Dict]:
+    """Time every calculation engine side by side on the same input."""
+    rows = len(trial_data)
+    results = []
+    for engine in ENGINES:
+        if engine == "apply" and rows > apply_max_rows:
+            continue
+        seconds, _ = best_of(
+            lambda: calculate_overnight_temp(trial_data.copy(), table, engine=engine)
+        )
+        # Without numba the fused engine runs its NumPy fallback
+        variant = "fused-numpy" if engine == "fused" and not HAVE_NUMBA else engine
+        results.append(_record("calculate_overnight_temp", variant, rows, seconds))
+
+    seconds, _ = best_of(
+        lambda: calculate_overnight_temp(trial_data.copy(), table, compact=True)
+    )
+    results.append(_record("calculate_overnight_temp", "compact", rows, seconds))
+    workers = os.cpu_count() or 1
+    if workers > 1:
+        seconds, _ = best_of(
+            lambda: calculate_overnight_temp_parallel(
+                trial_data.copy(), table, workers=workers
+            ),
+            repeat=1,
+        )
+        results.append(
+            _record("calculate_overnight_temp", f"parallel-{workers}", rows, seconds)
+        )
+    return results
+
+
+def bench_csv_io(trial_data: pd.DataFrame, tmp: str) -> List[Dict]:
+    """Time CSV save and load of the trial data."""
+    rows = len(trial_data)
+    path = os.path.join(tmp, "trial.csv")
+    save_s, _ = best_of(lambda: save_data_to_csv(trial_data, path), repeat=1)
+    load_s, _ = best_of(lambda: load_data_from_csv(path))
+    return [
+        _record("save_csv", "pandas", rows, save_s),
+        _record("load_csv", "pandas", rows, load_s),
+    ]
+
+
+def bench_handle_forecast(trial_data: pd.DataFrame) -> List[Dict]:
+    """Time the Dash upload flow end to end, from base64 contents to figures.
+
+    The upload callback queues a background job; the time covers the job and the
+    poll that collects its figures.
+    """
+    from dash._callback_context import context_value
+    from dash._utils import AttributeDict
+
+    import app
+
+    contents = "data:text/csv;base64," + base64.b64encode(
+        trial_data.to_csv(index=False).encode("utf-8")
+    ).decode("ascii")
+
+    def trigger(prop_id: str, value: object) -> None:
+        context_value.set(
+            AttributeDict(triggered_inputs=[{"prop_id": prop_id, "value": value}])
+        )
+
+    def run() -> None:
+        trigger("upload-data.contents", contents)
+        outputs = app.handle_forecast(
+            contents, *[None] * 4, "trial.csv", *[None] * 4, None, None
+        )
+        job_id = outputs[-3]
+        app.job_queue.wait(job_id)
+        trigger("job-poll.n_intervals", 1)
+        app.handle_forecast(None, None, None, 1, None, *[None] * 6, job_id)
+
+    seconds, _ = best_of(run, repeat=1)
+    return [_record("handle_forecast", "upload", len(trial_data), seconds)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--apply-max-rows",
+        type=int,
+        default=10_000,
+        help="Largest input for the per-row apply engine (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--app-max-rows",
+        type=int,
+        default=100_000,
+        help="Largest input for the Dash callback (default: %(default)s).",
+    )
+    args = parser.parse_args()
+
+    reference = pd.read_csv(REFERENCE_PATH)
+    table = KTable.from_frame(reference)
+    results = bench_lookups(reference, table)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            trial_data = make_trial_data(size)
+            results += bench_calculation(trial_data, table, args.apply_max_rows)
+            results += bench_csv_io(trial_data, tmp)
+            if size <= args.app_max_rows:
+                results += bench_handle_forecast(trial_data)
+            print(f"Finished {size} rows")
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for r in results:
+        print(
+            f"{r['benchmark']:>26} {r['variant']:>12} {r['rows']:>10} {r['seconds']:>10.4f}s"
+        )
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from .calculations import INPUT_COLUMNS, OUTPUT_COLUMN, forecast_arrays
+from .data_preperation import load_data
+from .utils import KTable, as_ktable
+
+MANIFEST_NAME = "manifest.json"
+ARCHIVE_VERSION = 1
+DEFAULT_BLOCK_ROWS = 1_000_000
+
+
+def _column_file(column: str) -> str:
+    """Return the .npy file name for a column, e.g. "wind_kn.npy"."""
+    stem = re.sub(r"[^0-9a-z]+", "_", column.lower()).strip("_")
+    return f"{stem}.npy"
+
+
+def _check_column_files(columns: Iterable[str]) -> None:
+    """Raise if two columns would be stored in the same .npy file."""
+    files: Dict[str, str] = {}
+    for column in columns:
+        name = _column_file(column)
+        if name in files:
+            raise ValueError(
+                f"Columns {files[name]!r} and {column!r} would both be stored as {name}."
+            )
+        files[name] = column
+
+
+def _read_chunks(input_path: str, chunksize: int):
+    """Yield the input file in chunks; columnar formats are read in one go."""
+    if os.path.splitext(input_path)[1].lower() == ".csv":
+        yield from pd.read_csv(input_path, chunksize=chunksize)
+    else:
+        yield load_data(input_path)
+
+
+def convert_to_archive(
+    input_path: str, archive_dir: str, chunksize: int = DEFAULT_BLOCK_ROWS
+) -> Dict:
+    """Convert a trial data file into a directory of memory-mapped .npy columns.
+
+    Numeric columns are stored with their own dtype. Text columns such as
+    Location are stored as int32 codes, with the labels kept in the manifest;
+    missing values get code -1. CSV input is streamed in two passes (count, then fill), so memory use is
+    bounded by the chunk size.
+
+    Args:
+        input_path (str): Trial data file (CSV, Parquet or Feather).
+        archive_dir (str): Directory to write the columns and manifest to.
+        chunksize (int): Rows to read at a time from CSV input.
+
+    Returns:
+        Dict: The archive manifest.
+
+    Raises:
+        ValueError: If two column names map to the same file name.
+    """
+    n_rows = 0
+    dtypes: Dict[str, np.dtype] = {}
+    text_columns: List[str] = []
+    for chunk in _read_chunks(input_path, chunksize):
+        n_rows += len(chunk)
+        for column in chunk.columns:
+            if column in text_columns:
+                continue
+            if not pd.api.types.is_numeric_dtype(chunk[column]):
+                text_columns.append(column)
+                dtypes[column] = np.dtype(np.int32)
+            else:
+                dtype = chunk[column].dtype
+                dtypes[column] = np.result_type(dtypes.get(column, dtype), dtype)
+    _check_column_files(dtypes)
+
+    os.makedirs(archive_dir, exist_ok=True)
+    arrays = {
+        column: np.lib.format.open_memmap(
+            os.path.join(archive_dir, _column_file(column)),
+            mode="w+",
+            dtype=dtype,
+            shape=(n_rows,),
+        )
+        for column, dtype in dtypes.items()
+    }
+    categories: Dict[str, Dict[object, int]] = {column: {} for column in text_columns}
+
+    start = 0
+    for chunk in _read_chunks(input_path, chunksize):
+        stop = start + len(chunk)
+        for column, array in arrays.items():
+            if column in categories:
+                # Codes within the chunk, then mapped to the archive-wide codes
+                chunk_codes, labels = pd.factorize(chunk[column])
+                codes = categories[column]
+                to_archive = np.array(
+                    [codes.setdefault(label, len(codes)) for label in labels] + [-1],
+                    dtype=np.int32,
+                )
+                array[start:stop] = to_archive[chunk_codes]
+            else:
+                array[start:stop] = chunk[column].to_numpy()
+        start = stop
+
+    for array in arrays.values():
+        array.flush()
+    manifest = {
+        "version": ARCHIVE_VERSION,
+        "rows": n_rows,
+        "columns": {
+            column: {
+                "file": _column_file(column),
+                "dtype": str(dtypes[column]),
+                **(
+                    {"categories": list(categories[column])}
+                    if column in categories
+                    else {}
+                ),
+            }
+            for column in dtypes
+        },
+    }
+    _write_manifest(archive_dir, manifest)
+    return manifest
+
+
+def _write_manifest(archive_dir: str, manifest: Dict) -> None:
+    """Write the manifest atomically."""
+    path = os.path.join(archive_dir, MANIFEST_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(path + ".tmp", path)
+
+
+def open_archive(
+    archive_dir: str, columns: Optional[List[str]] = None
+) -> Tuple[Dict, Dict[str, np.ndarray]]:
+    """Open archive columns as read-only memory maps.
+
+    Args:
+        archive_dir (str): Directory written by convert_to_archive.
+        columns (List[str], optional): Only open these columns.
+
+    Returns:
+        Tuple[Dict, Dict[str, np.ndarray]]: The manifest and the memory-mapped
+            columns by name.
+    """
+    with open(os.path.join(archive_dir, MANIFEST_NAME)) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != ARCHIVE_VERSION:
+        raise ValueError(f"Unsupported archive version: {manifest.get('version')}")
+
+    selected = columns if columns is not None else list(manifest["columns"])
+    arrays = {
+        column: np.load(
+            os.path.join(archive_dir, manifest["columns"][column]["file"]),
+            mmap_mode="r",
+        )
+        for column in selected
+    }
+    return manifest, arrays
+
+
+def forecast_archive(
+    archive_dir: str,
+    reference: Union[pd.DataFrame, KTable],
+    block_rows: int = DEFAULT_BLOCK_ROWS,
+    save: bool = False,
+) -> np.ndarray:
+    """Compute overnight minimums straight from the memory-mapped archive columns.
+
+    The inputs are processed in blocks of rows, so temporaries stay bounded and the
+    columns are never copied into a DataFrame.
+
+    Args:
+        archive_dir (str): Directory written by convert_to_archive.
+        reference (pd.DataFrame | KTable): Reference data for the K lookup.
+        block_rows (int): Rows to compute at a time.
+        save (bool): Also store the result as a column of the archive.
+
+    Returns:
+        np.ndarray: The overnight minimum for every row, memory-mapped if saved.
+    """
+    table = as_ktable(reference)
+    manifest, arrays = open_archive(archive_dir, INPUT_COLUMNS)
+    n_rows = manifest["rows"]
+
+    if save:
+        _check_column_files({*manifest["columns"], OUTPUT_COLUMN})
+        result = np.lib.format.open_memmap(
+            os.path.join(archive_dir, _column_file(OUTPUT_COLUMN)),
+            mode="w+",
+            dtype=np.float64,
+            shape=(n_rows,),
+        )
+    else:
+        result = np.empty(n_rows, dtype=np.float64)
+
+    for start in range(0, n_rows, block_rows):
+        block = slice(start, start + block_rows)
+        result[block] = forecast_arrays(
+            *(arrays[column][block] for column in INPUT_COLUMNS), table
+        )
+
+    if save:
+        result.flush()
+        manifest["columns"][OUTPUT_COLUMN] = {
+            "file": _column_file(OUTPUT_COLUMN),
+            "dtype": "float64",
+            "reference_version": table.version,
+        }
+        _write_manifest(archive_dir, manifest)
+    return result
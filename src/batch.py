@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import TYPE_CHECKING, Dict, Union
+
+from .calculations import OUTPUT_COLUMN, calculate_overnight_temp
+from .utils import KTable, as_ktable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def forecast_csv_in_chunks(
+    input_path: str,
+    output_path: str,
+    reference: Union[pd.DataFrame, KTable],
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    engine: str = "vectorized",
+    workers: int = 1,
+) -> Dict[str, Union[float, str]]:
+    """Stream a forecast input CSV through the calculation in fixed-size chunks.
+
+    Each chunk gets an "Overnight Min Temperature (°C)" column and is appended to
+    the output file, so memory use is bounded by the chunk size rather than the
+    file size.
+
+    Args:
+        input_path (str): Path to the input CSV with the trial data columns.
+        output_path (str): Path of the output CSV, overwritten if it exists.
+        reference (pd.DataFrame | KTable): Reference data for the K lookup.
+        chunksize (int): Number of rows to read and compute at a time.
+        engine (str): Calculation engine passed to calculate_overnight_temp.
+        workers (int): Number of processes to spread each chunk over; more than
+            one requires the vectorized engine.
+
+    Returns:
+        Dict[str, Union[float, str]]: Rows processed, chunks, elapsed seconds,
+            rows/sec and the reference version used.
+
+    Raises:
+        ValueError: If chunksize or workers is less than one, or workers is
+            more than one with another engine.
+    """
+    if chunksize < 1:
+        raise ValueError(f"Chunk size must be positive, got {chunksize}.")
+    if workers < 1:
+        raise ValueError(f"Workers must be positive, got {workers}.")
+    if workers > 1 and engine != "vectorized":
+        raise ValueError("Parallel workers only support the vectorized engine.")
+
+    import pandas as pd
+    from .parallel import ParallelForecaster
+
+    table = as_ktable(reference)
+    rows = 0
+    chunks = 0
+    start = time.perf_counter()
+    with ParallelForecaster(table, workers) as pool:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            if workers > 1:
+                chunk[OUTPUT_COLUMN] = pool.compute(chunk)
+                forecasts = chunk
+            else:
+                forecasts = calculate_overnight_temp(chunk, table, engine=engine)
+            forecasts.to_csv(
+                output_path,
+                mode="w" if chunks == 0 else "a",
+                header=chunks == 0,
+                index=False,
+            )
+            rows += len(forecasts)
+            chunks += 1
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "rows": rows,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "rows_per_sec": rows / elapsed if elapsed > 0 else 0.0,
+        "reference_version": table.version,
+    }
+    logging.info(
+        f"Forecast {rows} rows in {chunks} chunks to {output_path} "
+        f"({stats['rows_per_sec']:.0f} rows/sec, reference {table.version})"
+    )
+    return stats
@@ -1,5 +1,34 @@
-import pandas as pd
-from .utils import k_value_lookup
+from __future__ import annotations
+
+import numpy as np
+from typing import TYPE_CHECKING, Tuple, Union
+from .instrumentation import timed
+from .kernels import forecast_fused
+from .utils import KTable, as_ktable, k_value_lookup, round_values
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+ENGINES = ("vectorized", "fused", "apply")
+
+# Columns read by the calculation and the column it adds
+INPUT_COLUMNS = [
+    "Midday Temperature (°C)",
+    "Midday Dew Point (°C)",
+    "Wind (Kn)",
+    "Cloud (oktas)",
+]
+OUTPUT_COLUMN = "Overnight Min Temperature (°C)"
+# Columns added with keep_bins=True: each row's wind and cloud range index in the
+# reference table, for reports that group by K bin without re-binning
+WIND_BIN_COLUMN = "Wind Bin"
+CLOUD_BIN_COLUMN = "Cloud Bin"
+# DataFrame.attrs key recording the version of the reference used for a forecast
+REFERENCE_VERSION_ATTR = "reference_version"
+
+# Rows computed at a time in compact mode, bounding the float64 temporaries
+COMPACT_BLOCK_ROWS = 1_000_000
+INT16_MIN, INT16_MAX = np.iinfo(np.int16).min, np.iinfo(np.int16).max
 
 
 def round_value(value: float) -> int:
@@ -12,16 +41,158 @@ def overnight_minimum_temp(midday_temp: float, midday_dew: float, K: float) -> f
     return float(round_value((0.316 * midday_temp) + (0.548 * midday_dew) - 1.24 + K))
 
 
-def calculate_overnight_temp(
-    trial_data: pd.DataFrame, reference: pd.DataFrame
-) -> pd.DataFrame:
-    """Calculate the overnight minimum temperature for each row in the trial data."""
-    trial_data["Overnight Min Temperature (°C)"] = trial_data.apply(
+def overnight_minimum_temps(
+    midday_temp: np.ndarray, midday_dew: np.ndarray, K: np.ndarray
+) -> np.ndarray:
+    """Calculate the overnight minimum temperature for whole columns at once."""
+    midday_temp = np.asarray(midday_temp, dtype=np.float64)
+    midday_dew = np.asarray(midday_dew, dtype=np.float64)
+    return round_values((0.316 * midday_temp) + (0.548 * midday_dew) - 1.24 + K)
+
+
+def _k_values(
+    wind: np.ndarray, cloud: np.ndarray, table: KTable
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Gather the K value for every row, with the wind and cloud range indices."""
+    wind_codes = table.wind_codes(wind)
+    cloud_codes = table.cloud_codes(cloud)
+    k_values = table.k_values[wind_codes, cloud_codes]
+
+    missing = np.isnan(k_values)
+    if missing.any():
+        row = np.flatnonzero(missing)[0]
+        raise ValueError(
+            f"Combination of wind range {table.wind_ranges[wind_codes[row]]} and cloud range {table.cloud_ranges[cloud_codes[row]]} is not found in the reference DataFrame."
+        )
+    return k_values, wind_codes, cloud_codes
+
+
+def forecast_arrays(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    table: KTable,
+    return_codes: bool = False,
+) -> Union[np.ndarray, Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Compute the overnight minimum for same-length input columns as NumPy arrays.
+
+    With return_codes=True, also return the wind and cloud range index of every
+    row, as found for the K lookup.
+
+    Raises:
+        ValueError: If a value is out of range, a wind/cloud combination has no K
+            value, or a result cannot be rounded.
+    """
+    k_values, wind_codes, cloud_codes = _k_values(wind, cloud, table)
+    result = overnight_minimum_temps(midday_temp, midday_dew, k_values)
+    if not np.isfinite(result).all():
+        raise ValueError("Cannot round a non-finite overnight minimum temperature.")
+    if return_codes:
+        return result, wind_codes, cloud_codes
+    return result
+
+
+def _calculate_vectorized(
+    trial_data: pd.DataFrame, table: KTable
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the overnight minimum for all rows with columnar NumPy operations."""
+    return forecast_arrays(
+        trial_data["Midday Temperature (°C)"].to_numpy(),
+        trial_data["Midday Dew Point (°C)"].to_numpy(),
+        trial_data["Wind (Kn)"].to_numpy(),
+        trial_data["Cloud (oktas)"].to_numpy(),
+        table,
+        return_codes=True,
+    )
+
+
+def _calculate_compact(
+    trial_data: pd.DataFrame, table: KTable
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Compute the overnight minimum in blocks of rows into an int16 column."""
+    columns = [trial_data[column].to_numpy() for column in INPUT_COLUMNS]
+    result = np.empty(len(trial_data), dtype=np.int16)
+    wind_codes = np.empty(len(trial_data), dtype=np.int16)
+    cloud_codes = np.empty(len(trial_data), dtype=np.int16)
+    for start in range(0, len(trial_data), COMPACT_BLOCK_ROWS):
+        block = slice(start, start + COMPACT_BLOCK_ROWS)
+        values, wind_codes[block], cloud_codes[block] = forecast_arrays(
+            *(column[block] for column in columns), table, return_codes=True
+        )
+        if len(values) and (values.min() < INT16_MIN or values.max() > INT16_MAX):
+            raise ValueError("Overnight minimum temperature out of int16 range.")
+        result[block] = values
+    return result, wind_codes, cloud_codes
+
+
+def _calculate_fused(trial_data: pd.DataFrame, table: KTable) -> np.ndarray:
+    """Compute the overnight minimum with the fused kernel of src.kernels."""
+    columns = [trial_data[column].to_numpy() for column in INPUT_COLUMNS]
+    result = forecast_fused(*columns, table)
+    # NaN marks rows without a forecast; infinite inputs give infinite results
+    failed = ~np.isfinite(result)
+    if failed.any():
+        # Rerun the failing rows on the NumPy path, which raises the detailed error
+        result[failed] = forecast_arrays(*(column[failed] for column in columns), table)
+    return result
+
+
+def _calculate_apply(trial_data: pd.DataFrame, table: KTable) -> pd.Series:
+    """Reference implementation: evaluate the formula row by row."""
+    return trial_data.apply(
         lambda row: overnight_minimum_temp(
             row["Midday Temperature (°C)"],
             row["Midday Dew Point (°C)"],
-            k_value_lookup(row["Wind (Kn)"], row["Cloud (oktas)"], reference),
+            k_value_lookup(row["Wind (Kn)"], row["Cloud (oktas)"], table),
         ),
         axis=1,
     )
+
+
+def calculate_overnight_temp(
+    trial_data: pd.DataFrame,
+    reference: Union[pd.DataFrame, KTable],
+    engine: str = "vectorized",
+    compact: bool = False,
+    keep_bins: bool = False,
+) -> pd.DataFrame:
+    """Calculate the overnight minimum temperature for each row in the trial data.
+
+    The "vectorized" engine computes the whole batch at once; the "fused" engine
+    runs the compiled single-pass kernel of src.kernels when numba is installed
+    and matches "vectorized" otherwise; the "apply" engine is the original
+    per-row path, kept as a reference for parity checks. The reference
+    may be a DataFrame or a precompiled KTable. The reference version is recorded
+    in trial_data.attrs["reference_version"], which Parquet output preserves.
+
+    With compact=True the vectorized engine runs in blocks of rows and stores the
+    result as int16, keeping peak memory low for large frames loaded with compact
+    dtypes. Float32 inputs can round differently from float64 ones when a value
+    lies within float32 precision of a bin edge or a .5 rounding boundary.
+
+    With keep_bins=True the vectorized engine also adds "Wind Bin" and "Cloud Bin"
+    columns holding each row's range index in the reference table.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}', expected one of {ENGINES}.")
+    if compact and engine != "vectorized":
+        raise ValueError("Compact mode only supports the vectorized engine.")
+    if keep_bins and engine != "vectorized":
+        raise ValueError("keep_bins only supports the vectorized engine.")
+
+    with timed("calculate", rows=len(trial_data)):
+        table = as_ktable(reference)
+        if engine == "apply":
+            trial_data[OUTPUT_COLUMN] = _calculate_apply(trial_data, table)
+        elif engine == "fused":
+            trial_data[OUTPUT_COLUMN] = _calculate_fused(trial_data, table)
+        else:
+            calculate = _calculate_compact if compact else _calculate_vectorized
+            result, wind_codes, cloud_codes = calculate(trial_data, table)
+            trial_data[OUTPUT_COLUMN] = result
+            if keep_bins:
+                trial_data[WIND_BIN_COLUMN] = wind_codes.astype(np.int16)
+                trial_data[CLOUD_BIN_COLUMN] = cloud_codes.astype(np.int16)
+    trial_data.attrs[REFERENCE_VERSION_ATTR] = table.version
     return trial_data
@@ -0,0 +1,102 @@
+"""Command-line batch forecasting.
+
+Usage:
+    python -m src.cli INPUT.csv OUTPUT.csv [--chunksize N] [--workers N]
+                      [--reference PATH] [--store DIR]
+"""
+
+import argparse
+from typing import List, Optional
+
+from .batch import DEFAULT_CHUNKSIZE, forecast_csv_in_chunks
+from .calculations import ENGINES
+from .instrumentation import configure_logging
+from .reference_cache import get_reference_table
+
+DEFAULT_REFERENCE = "./data/processed/transformed_reference.csv"
+
+
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least one."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be positive, got {number}")
+    return number
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the batch forecasting command."""
+    parser = argparse.ArgumentParser(
+        prog="python -m src.cli",
+        description="Compute overnight minimum temperatures for a CSV file.",
+    )
+    parser.add_argument("input", help="Input CSV with the trial data columns.")
+    parser.add_argument("output", help="Output CSV for the forecasts.")
+    parser.add_argument(
+        "--reference",
+        default=DEFAULT_REFERENCE,
+        help="Reference CSV in long or wide layout (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=positive_int,
+        default=DEFAULT_CHUNKSIZE,
+        help="Rows to process per chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="vectorized",
+        help="Calculation engine (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=positive_int,
+        default=1,
+        help="Processes to spread each chunk over (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--store",
+        help="Forecast store directory; only rows that are new or changed since "
+        "the last run are recomputed. Loads the whole input at once.",
+    )
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the batch forecasting command."""
+    args = build_parser().parse_args(argv)
+    if args.store:
+        # The store loads the whole input through pandas, so import it here
+        from .data_preperation import load_data, save_data
+        from .incremental import ForecastStore
+
+        trial_data = load_data(args.input)
+        stats = ForecastStore(args.store).update(
+            trial_data, get_reference_table(args.reference), engine=args.engine
+        )
+        save_data(trial_data, args.output)
+        print(
+            f"{stats['rows']} rows: {stats['reused']} reused, "
+            f"{stats['recomputed']} recomputed"
+        )
+        return 0
+
+    stats = forecast_csv_in_chunks(
+        args.input,
+        args.output,
+        get_reference_table(args.reference),
+        chunksize=args.chunksize,
+        engine=args.engine,
+        workers=args.workers,
+    )
+    print(
+        f"{stats['rows']} rows in {stats['seconds']:.2f}s "
+        f"({stats['rows_per_sec']:.0f} rows/sec, reference {stats['reference_version']})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    configure_logging()
+    raise SystemExit(main())
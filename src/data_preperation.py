@@ -1,18 +1,44 @@
+import os
 import pandas as pd
 import logging
-from typing import Optional, Dict
+from pandas.api.types import union_categoricals
+from typing import Optional, Dict, List
+from .instrumentation import configure_logging, timed
+from .utils import KTable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
-)
 
+# Default locations of the generated data files
+PROCESSED_DIR = "./data/processed"
+REFERENCE_PATH = os.path.join(PROCESSED_DIR, "reference.csv")
+TRIAL_DATA_PATH = os.path.join(PROCESSED_DIR, "trial_data.csv")
+TRANSFORMED_REFERENCE_PATH = os.path.join(PROCESSED_DIR, "transformed_reference.csv")
+REFERENCE_ARTIFACT_PATH = os.path.join(PROCESSED_DIR, "reference.ktable")
 
-def load_data_from_csv(file_path: str) -> pd.DataFrame:
+# File extensions handled by load_data and save_data
+CSV_EXTENSIONS = (".csv",)
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+FEATHER_EXTENSIONS = (".feather", ".arrow", ".ipc")
+
+
+# Narrow dtypes used by the compact loading mode
+COMPACT_DTYPES = {
+    "Location": "category",
+    "Midday Temperature (°C)": "float32",
+    "Midday Dew Point (°C)": "float32",
+    "Wind (Kn)": "float32",
+    "Cloud (oktas)": "float32",
+}
+COMPACT_CHUNK_ROWS = 500_000
+
+
+def load_data_from_csv(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
     """Load data from a CSV file into a DataFrame.
 
     Args:
         file_path (str): Path to the CSV file.
+        columns (List[str], optional): Only read these columns.
 
     Returns:
         pd.DataFrame: DataFrame containing the loaded data.
@@ -21,7 +47,9 @@ def load_data_from_csv(file_path: str) -> pd.DataFrame:
         FileNotFoundError: If the file does not exist.
     """
     try:
-        df = pd.read_csv(file_path)
+        with timed("load_csv") as timer:
+            df = pd.read_csv(file_path, usecols=columns)
+            timer.rows = len(df)
         logging.info(f"Data loaded successfully from file: {file_path}")
         return df
     except FileNotFoundError as e:
@@ -44,9 +72,234 @@ def save_data_to_csv(df: pd.DataFrame, file_path: str) -> None:
         raise
 
 
-def create_reference_data() -> pd.DataFrame:
+def load_data_from_parquet(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Load data from a Parquet file into a DataFrame (requires pyarrow).
+
+    Args:
+        file_path (str): Path to the Parquet file.
+        columns (List[str], optional): Only read these columns.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the loaded data.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    try:
+        df = pd.read_parquet(file_path, columns=columns)
+        logging.info(f"Data loaded successfully from file: {file_path}")
+        return df
+    except FileNotFoundError as e:
+        logging.error(f"File not found: {e}")
+        raise
+
+
+def save_data_to_parquet(df: pd.DataFrame, file_path: str) -> None:
+    """Save a DataFrame to a Parquet file (requires pyarrow).
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        file_path (str): Path to save the Parquet file.
+    """
+    try:
+        df.to_parquet(file_path, index=False)
+        logging.info(f"Data saved successfully to file: {file_path}")
+    except Exception as e:
+        logging.error(f"Error saving data to file: {e}")
+        raise
+
+
+def load_data_from_feather(
+    file_path: str, columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Load data from an Arrow IPC (Feather) file into a DataFrame (requires pyarrow).
+
+    Args:
+        file_path (str): Path to the Feather file.
+        columns (List[str], optional): Only read these columns.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the loaded data.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    try:
+        df = pd.read_feather(file_path, columns=columns)
+        logging.info(f"Data loaded successfully from file: {file_path}")
+        return df
+    except FileNotFoundError as e:
+        logging.error(f"File not found: {e}")
+        raise
+
+
+def save_data_to_feather(df: pd.DataFrame, file_path: str) -> None:
+    """Save a DataFrame to an Arrow IPC (Feather) file (requires pyarrow).
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        file_path (str): Path to save the Feather file.
+    """
+    try:
+        df.reset_index(drop=True).to_feather(file_path)
+        logging.info(f"Data saved successfully to file: {file_path}")
+    except Exception as e:
+        logging.error(f"Error saving data to file: {e}")
+        raise
+
+
+def _file_format(file_path: str) -> str:
+    """Return the data format implied by a file's extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in CSV_EXTENSIONS:
+        return "csv"
+    if extension in PARQUET_EXTENSIONS:
+        return "parquet"
+    if extension in FEATHER_EXTENSIONS:
+        return "feather"
+    raise ValueError(f"Unsupported file extension '{extension}' for file: {file_path}")
+
+
+def compact_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast trial data columns in place to reduce their memory footprint.
+
+    Temperature, dew point, wind and cloud become float32, Location becomes
+    categorical and Date the smallest integer dtype (or datetime64 for date
+    strings). Columns that are missing or already compact are left alone.
+
+    Args:
+        df (pd.DataFrame): DataFrame with trial data columns.
+
+    Returns:
+        pd.DataFrame: The same DataFrame, with compact columns.
+    """
+    for column, dtype in COMPACT_DTYPES.items():
+        if column in df.columns and df[column].dtype != dtype:
+            df[column] = df[column].astype(dtype)
+    if "Date" in df.columns:
+        if pd.api.types.is_numeric_dtype(df["Date"]):
+            df["Date"] = pd.to_numeric(df["Date"], downcast="integer")
+        elif not pd.api.types.is_datetime64_any_dtype(df["Date"]):
+            df["Date"] = pd.to_datetime(df["Date"])
+    return df
+
+
+def load_compact_csv(
+    file_path: str,
+    columns: Optional[List[str]] = None,
+    chunksize: int = COMPACT_CHUNK_ROWS,
+) -> pd.DataFrame:
+    """Load a CSV in chunks, compacting each chunk before the next is parsed.
+
+    Peak memory stays close to the size of the compact result, rather than the
+    full float64/object frame.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        columns (List[str], optional): Only read these columns.
+        chunksize (int): Rows to parse at a time.
+
+    Returns:
+        pd.DataFrame: DataFrame with compact dtypes.
+    """
+    chunks = [
+        compact_dtypes(chunk)
+        for chunk in pd.read_csv(file_path, usecols=columns, chunksize=chunksize)
+    ]
+    if not chunks:
+        return compact_dtypes(pd.read_csv(file_path, usecols=columns))
+    # Give every chunk the same categories so concat keeps the categorical dtype
+    for column in chunks[0].columns:
+        if isinstance(chunks[0][column].dtype, pd.CategoricalDtype):
+            categories = union_categoricals([chunk[column] for chunk in chunks])
+            for chunk in chunks:
+                chunk[column] = chunk[column].cat.set_categories(categories.categories)
+    df = pd.concat(chunks, ignore_index=True)
+    logging.info(f"Data loaded successfully from file: {file_path}")
+    return df
+
+
+def load_data(
+    file_path: str, columns: Optional[List[str]] = None, compact: bool = False
+) -> pd.DataFrame:
+    """Load a CSV, Parquet or Feather file, chosen by its extension.
+
+    Args:
+        file_path (str): Path to the data file.
+        columns (List[str], optional): Only read these columns, e.g. the four
+            input columns the calculation needs.
+        compact (bool): Load trial data columns with compact dtypes. CSV files are
+            parsed in chunks so the full float64/object frame never exists.
+
+    Returns:
+        pd.DataFrame: DataFrame containing the loaded data.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    file_format = _file_format(file_path)
+    if file_format == "parquet":
+        df = load_data_from_parquet(file_path, columns)
+    elif file_format == "feather":
+        df = load_data_from_feather(file_path, columns)
+    elif compact:
+        return load_compact_csv(file_path, columns)
+    else:
+        df = load_data_from_csv(file_path, columns)
+    return compact_dtypes(df) if compact else df
+
+
+def compact_forecast_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast the rounded overnight minimum column to the smallest integer dtype.
+
+    The column is left as floats if it contains missing values.
+
+    Args:
+        df (pd.DataFrame): DataFrame with forecast results.
+
+    Returns:
+        pd.DataFrame: A copy of the DataFrame with the compact column.
+    """
+    column = "Overnight Min Temperature (°C)"
+    if column not in df.columns:
+        return df
+    df = df.copy(deep=False)
+    df[column] = pd.to_numeric(df[column], downcast="integer")
+    return df
+
+
+def save_data(df: pd.DataFrame, file_path: str, compact: bool = True) -> None:
+    """Save a DataFrame as CSV, Parquet or Feather, chosen by the file extension.
+
+    Args:
+        df (pd.DataFrame): DataFrame to be saved.
+        file_path (str): Path to save the file.
+        compact (bool): Store the overnight minimum as a small integer in the
+            columnar formats.
+
+    Raises:
+        ValueError: If the file extension is not supported.
+    """
+    file_format = _file_format(file_path)
+    if file_format == "csv":
+        save_data_to_csv(df, file_path)
+        return
+    if compact:
+        df = compact_forecast_dtypes(df)
+    if file_format == "parquet":
+        save_data_to_parquet(df, file_path)
+    else:
+        save_data_to_feather(df, file_path)
+
+
+def create_reference_data(file_path: str = REFERENCE_PATH) -> pd.DataFrame:
     """Create reference data for wind speed and cloud cover ranges and save it to a CSV file.
 
+    Args:
+        file_path (str): Path to save the CSV file.
+
     Returns:
         pd.DataFrame: DataFrame containing the reference data.
     """
@@ -59,13 +312,16 @@ def create_reference_data() -> pd.DataFrame:
     }
 
     reference = pd.DataFrame(data)
-    save_data_to_csv(reference, "./data/processed/reference.csv")
+    save_data_to_csv(reference, file_path)
     return reference
 
 
-def create_trial_data() -> pd.DataFrame:
+def create_trial_data(file_path: str = TRIAL_DATA_PATH) -> pd.DataFrame:
     """Create trial data for temperature, dew point, wind speed, and cloud cover and save it to a CSV file.
 
+    Args:
+        file_path (str): Path to save the CSV file.
+
     Returns:
         pd.DataFrame: DataFrame containing the trial data.
     """
@@ -79,15 +335,18 @@ def create_trial_data() -> pd.DataFrame:
     }
 
     trial_data = pd.DataFrame(data)
-    save_data_to_csv(trial_data, "./data/processed/trial_data.csv")
+    save_data_to_csv(trial_data, file_path)
     return trial_data
 
 
-def transform_reference_data(reference: pd.DataFrame) -> pd.DataFrame:
+def transform_reference_data(
+    reference: pd.DataFrame, file_path: str = TRANSFORMED_REFERENCE_PATH
+) -> pd.DataFrame:
     """Transform reference data to a long format suitable for lookups and save it to a CSV file.
 
     Args:
         reference (pd.DataFrame): DataFrame containing reference data.
+        file_path (str): Path to save the CSV file.
 
     Returns:
         pd.DataFrame: Transformed DataFrame.
@@ -109,5 +368,37 @@ def transform_reference_data(reference: pd.DataFrame) -> pd.DataFrame:
                 )
 
     transformed_df = pd.DataFrame(formatted_rows)
-    save_data_to_csv(transformed_df, "./data/processed/transformed_reference.csv")
+    save_data_to_csv(transformed_df, file_path)
     return transformed_df
+
+
+def build_reference_artifact(
+    reference: pd.DataFrame, file_path: str = REFERENCE_ARTIFACT_PATH
+) -> KTable:
+    """Compile reference data into a versioned binary artifact.
+
+    The artifact stores the parsed bin edges, the K matrix, its missing-value mask
+    and a content digest, so consumers load it without parsing range strings.
+    Pass its path anywhere a reference CSV path is accepted.
+
+    Args:
+        reference (pd.DataFrame): Reference data in long or wide layout.
+        file_path (str): Path to save the artifact.
+
+    Returns:
+        KTable: The compiled table; its version is recorded with forecasts.
+    """
+    table = KTable.from_frame(reference)
+    table.save(file_path)
+    logging.info(
+        f"Reference artifact version {table.version} saved to file: {file_path}"
+    )
+    return table
+
+
+if __name__ == "__main__":
+    configure_logging()
+    # Regenerate the processed data files and the compiled reference artifact
+    reference = create_reference_data()
+    create_trial_data()
+    build_reference_artifact(transform_reference_data(reference))
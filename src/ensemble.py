@@ -0,0 +1,152 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from .instrumentation import timed
+from .kernels import forecast_fused
+from .reports import FROST_THRESHOLD
+from .utils import KTable, as_ktable
+
+DEFAULT_PERCENTILES = (10, 50, 90)
+# Member values evaluated per block; about a dozen float64 temporaries of this
+# size are alive at once, so the default keeps a block near 100 MB
+DEFAULT_BLOCK_ELEMENTS = 1_000_000
+
+
+def member_forecasts(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    table: KTable,
+) -> np.ndarray:
+    """Forecast same-shape member arrays, with NaN for members that can't be.
+
+    Unlike forecast_arrays, nothing raises: a perturbed wind or cloud value that
+    falls outside every range or into a cell without a K value, or a NaN input,
+    gives a NaN forecast for that member alone.
+    """
+    return forecast_fused(midday_temp, midday_dew, wind, cloud, table)
+
+
+def _row_percentiles(
+    sorted_values: np.ndarray, counts: np.ndarray, percentiles: Sequence[float]
+) -> np.ndarray:
+    """Linearly interpolated percentiles of the first counts[i] values of each row.
+
+    Matches np.percentile's default method on the valid values, without the
+    per-row Python loop np.nanpercentile falls back to.
+    """
+    rows = np.arange(len(sorted_values))
+    last = np.maximum(counts - 1, 0)
+    result = np.empty((len(sorted_values), len(percentiles)))
+    for i, q in enumerate(percentiles):
+        position = q / 100 * last
+        below = np.floor(position).astype(np.intp)
+        above = np.minimum(below + 1, last)
+        low = sorted_values[rows, below]
+        high = sorted_values[rows, above]
+        result[:, i] = low + (high - low) * (position - below)
+    result[counts == 0] = np.nan
+    return result
+
+
+def ensemble_forecast(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    reference: Union[pd.DataFrame, KTable],
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    frost_threshold: float = FROST_THRESHOLD,
+    block_elements: int = DEFAULT_BLOCK_ELEMENTS,
+    index: Optional[Sequence] = None,
+) -> pd.DataFrame:
+    """Summarize an ensemble of perturbed inputs per station.
+
+    Each input broadcasts to (N stations, M members), so unperturbed fields can
+    be passed as (N, 1) columns and shared perturbations as (1, M) rows without
+    being copied. Stations are processed in blocks of about block_elements
+    member values: each block is binned, looked up and forecast as flat arrays,
+    sorted along the members and reduced to one row per station, so neither an
+    N×M DataFrame nor a full N×M result is ever built.
+
+    Members without a forecast (see member_forecasts) are left out of that
+    station's statistics and counted in "Valid Members".
+
+    Args:
+        midday_temp (np.ndarray): Midday temperature members (°C).
+        midday_dew (np.ndarray): Midday dew point members (°C).
+        wind (np.ndarray): Wind speed members (kn).
+        cloud (np.ndarray): Cloud cover members (oktas).
+        reference (pd.DataFrame | KTable): Reference data with K values.
+        percentiles (Sequence[float]): Percentiles of the forecasts to report.
+        frost_threshold (float): Forecasts below this (°C) count as frost.
+        block_elements (int): Member values evaluated per block.
+        index (Sequence, optional): Station labels for the result.
+
+    Returns:
+        pd.DataFrame: One row per station with "Valid Members", "Mean (°C)",
+        a "P<q> (°C)" column per percentile and "Frost Probability".
+
+    Raises:
+        ValueError: If the inputs don't broadcast to two dimensions, a
+            percentile is outside [0, 100] or block_elements is not positive.
+    """
+    table = as_ktable(reference)
+    inputs = [
+        np.asarray(values, dtype=np.float64)
+        for values in (midday_temp, midday_dew, wind, cloud)
+    ]
+    try:
+        shape = np.broadcast_shapes(*(values.shape for values in inputs))
+    except ValueError as e:
+        raise ValueError(f"Ensemble inputs do not broadcast together: {e}") from e
+    if len(shape) != 2:
+        raise ValueError(
+            f"Ensemble inputs must broadcast to (stations, members), got shape {shape}."
+        )
+    if any(not 0 <= q <= 100 for q in percentiles):
+        raise ValueError("Percentiles must be between 0 and 100.")
+    if block_elements < 1:
+        raise ValueError("block_elements must be positive.")
+
+    n_stations, n_members = shape
+    block_rows = max(1, block_elements // max(n_members, 1))
+    counts = np.zeros(n_stations, dtype=np.int64)
+    means = np.full(n_stations, np.nan)
+    frost = np.full(n_stations, np.nan)
+    quantiles = np.full((n_stations, len(percentiles)), np.nan)
+
+    with timed("ensemble", rows=n_stations * n_members):
+        for start in range(0, n_stations, block_rows):
+            stop = min(start + block_rows, n_stations)
+            block = [
+                np.broadcast_to(values, shape)[start:stop].ravel() for values in inputs
+            ]
+            forecasts = member_forecasts(*block, table).reshape(stop - start, n_members)
+
+            valid = ~np.isnan(forecasts)
+            block_counts = valid.sum(axis=1)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means[start:stop] = (
+                    np.where(valid, forecasts, 0.0).sum(axis=1) / block_counts
+                )
+                frost[start:stop] = (forecasts < frost_threshold).sum(
+                    axis=1
+                ) / block_counts
+            # NaNs sort last, so each row's valid members come first
+            forecasts.sort(axis=1)
+            quantiles[start:stop] = _row_percentiles(
+                forecasts, block_counts, percentiles
+            )
+            counts[start:stop] = block_counts
+
+    summary = pd.DataFrame(
+        {"Valid Members": counts, "Mean (°C)": means},
+        index=None if index is None else pd.Index(index),
+    )
+    for i, q in enumerate(percentiles):
+        summary[f"P{q:g} (°C)"] = quantiles[:, i]
+    summary["Frost Probability"] = frost
+    return summary
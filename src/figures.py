@@ -0,0 +1,158 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Above WEBGL_THRESHOLD rows scatter plots are drawn with WebGL from a sample of
+# at most MAX_SCATTER_POINTS points; above DENSITY_THRESHOLD they are replaced by
+# a 2-D histogram aggregated on the server, so the payload no longer grows with
+# the upload.
+WEBGL_THRESHOLD = 10_000
+DENSITY_THRESHOLD = 200_000
+MAX_SCATTER_POINTS = 50_000
+DENSITY_BINS = 100
+CORRELATION_BLOCK_ROWS = 1_000_000
+
+CORRELATION_COLUMNS = [
+    "Midday Temperature (°C)",
+    "Midday Dew Point (°C)",
+    "Wind (Kn)",
+    "Cloud (oktas)",
+    "Overnight Min Temperature (°C)",
+]
+
+
+def scatter_figure(df: pd.DataFrame, x: str, y: str, title: str) -> go.Figure:
+    """Scatter plot of two columns, switching to WebGL or density for large inputs."""
+    # plotly.express is slow to import and only needed once a file is uploaded
+    import plotly.express as px
+
+    n_rows = len(df)
+    if n_rows <= WEBGL_THRESHOLD:
+        return px.scatter(df, x=x, y=y, title=title)
+
+    if n_rows <= DENSITY_THRESHOLD:
+        sample = df[[x, y]]
+        if n_rows > MAX_SCATTER_POINTS:
+            sample = sample.sample(MAX_SCATTER_POINTS, random_state=0)
+            title = f"{title} ({MAX_SCATTER_POINTS:,} of {n_rows:,} rows)"
+        return px.scatter(sample, x=x, y=y, title=title, render_mode="webgl")
+
+    return density_figure(df[x].to_numpy(), df[y].to_numpy(), x, y, title)
+
+
+def density_figure(
+    x_values: np.ndarray, y_values: np.ndarray, x: str, y: str, title: str
+) -> go.Figure:
+    """2-D histogram of two columns, binned on the server."""
+    counts, x_edges, y_edges = np.histogram2d(x_values, y_values, bins=DENSITY_BINS)
+    figure = go.Figure(
+        go.Heatmap(
+            x=(x_edges[:-1] + x_edges[1:]) / 2,
+            y=(y_edges[:-1] + y_edges[1:]) / 2,
+            # Heatmap rows are y bins; empty bins are left transparent
+            z=np.where(counts.T > 0, counts.T, np.nan),
+            colorscale="Viridis",
+            colorbar=dict(title="Rows"),
+        )
+    )
+    figure.update_layout(
+        title=f"{title} ({len(x_values):,} rows, density)",
+        xaxis_title=x,
+        yaxis_title=y,
+    )
+    return figure
+
+
+def correlation_matrix(
+    df: pd.DataFrame,
+    columns: List[str] = CORRELATION_COLUMNS,
+    block_rows: int = CORRELATION_BLOCK_ROWS,
+) -> pd.DataFrame:
+    """Pearson correlation of the columns, accumulated block by block.
+
+    Only one block is converted to float64 at a time, so memory stays bounded for
+    large or compact (float32) frames. Values are shifted by the first block's
+    means before accumulating to keep the one-pass sums numerically stable.
+    """
+    k = len(columns)
+    n = 0
+    shift = None
+    sums = np.zeros(k)
+    products = np.zeros((k, k))
+    # Column arrays once, without copying; each block then copies only its rows
+    arrays = [df[column].to_numpy() for column in columns]
+    for start in range(0, len(df), block_rows):
+        block = np.empty((min(block_rows, len(df) - start), k))
+        for j, values in enumerate(arrays):
+            block[:, j] = values[start : start + block_rows]
+        if shift is None:
+            shift = block.mean(axis=0)
+        block -= shift
+        n += len(block)
+        sums += block.sum(axis=0)
+        products += block.T @ block
+
+    if n < 2:
+        return pd.DataFrame(np.nan, index=columns, columns=columns)
+    mean = sums / n
+    cov = products / n - np.outer(mean, mean)
+    std = np.sqrt(np.diag(cov))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = cov / np.outer(std, std)
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return pd.DataFrame(np.clip(corr, -1.0, 1.0), index=columns, columns=columns)
+
+
+def correlation_heatmap(corr_matrix: pd.DataFrame) -> go.Figure:
+    """Annotated heatmap of a correlation matrix."""
+    import plotly.express as px
+
+    corr_heatmap_fig = px.imshow(
+        corr_matrix.round(3), text_auto=True, title="Correlation Heatmap"
+    )
+    corr_heatmap_fig.update_layout(
+        width=1200,  # Larger width to avoid overlap
+        height=1000,  # Larger height to avoid overlap
+        title={"x": 0.5},
+        xaxis_title="",
+        yaxis_title="",
+        xaxis=dict(
+            tickvals=list(range(len(corr_matrix.columns))),
+            ticktext=[str(col) for col in corr_matrix.columns],
+            tickangle=45,
+            tickmode="array",
+            tickfont=dict(size=12),
+            automargin=True,
+        ),
+        yaxis=dict(
+            tickvals=list(range(len(corr_matrix.columns))),
+            ticktext=[str(col) for col in corr_matrix.columns],
+            tickangle=0,
+            tickmode="array",
+            tickfont=dict(size=12),
+            automargin=True,
+        ),
+        coloraxis_colorbar=dict(title="Correlation"),
+        margin=dict(l=250, r=20, t=50, b=250),  # Larger margins
+    )
+    return corr_heatmap_fig
+
+
+def build_forecast_figures(df: pd.DataFrame) -> Tuple[go.Figure, go.Figure, go.Figure]:
+    """Build the midday, dew point and correlation figures for a forecast upload."""
+    midday_vs_overnight_fig = scatter_figure(
+        df,
+        x="Midday Temperature (°C)",
+        y="Overnight Min Temperature (°C)",
+        title="Midday Temperature vs Overnight Minimum Temperature",
+    )
+    dew_point_vs_overnight_fig = scatter_figure(
+        df,
+        x="Midday Dew Point (°C)",
+        y="Overnight Min Temperature (°C)",
+        title="Dew Point Temperature vs Overnight Minimum Temperature",
+    )
+    corr_heatmap_fig = correlation_heatmap(correlation_matrix(df))
+    return midday_vs_overnight_fig, dew_point_vs_overnight_fig, corr_heatmap_fig
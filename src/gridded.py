@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from .instrumentation import timed
+from .kernels import forecast_fused
+from .utils import KTable, as_ktable
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Grid cells forecast per tile; a tile needs about ten temporaries of this size
+DEFAULT_TILE_ELEMENTS = 1_000_000
+
+
+def grid_tiles(
+    shape: Sequence[int], tile_elements: int = DEFAULT_TILE_ELEMENTS
+) -> Iterator[Tuple[slice, ...]]:
+    """Split a grid into tiles of at most tile_elements cells, where possible.
+
+    Trailing axes are kept whole while they fit in a tile, and the next axis out
+    is cut into blocks; any axes before it are walked one index at a time. A
+    (time, lat, lon) grid is therefore tiled by blocks of time steps, or by
+    blocks of latitude rows when one time step is larger than a tile.
+    """
+    if tile_elements < 1:
+        raise ValueError("tile_elements must be positive.")
+    axis = len(shape) - 1
+    inner = 1
+    while axis >= 0 and inner * shape[axis] <= tile_elements:
+        inner *= shape[axis]
+        axis -= 1
+    if axis < 0:
+        yield tuple(slice(None) for _ in shape)
+        return
+
+    step = max(1, tile_elements // inner)
+    rest = tuple(slice(None) for _ in shape[axis + 1 :])
+    for outer in np.ndindex(*shape[:axis]):
+        lead = tuple(slice(i, i + 1) for i in outer)
+        for start in range(0, shape[axis], step):
+            yield lead + (slice(start, start + step),) + rest
+
+
+def forecast_grid(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    reference: Union[pd.DataFrame, KTable],
+    tile_elements: int = DEFAULT_TILE_ELEMENTS,
+    workers: int = 1,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Forecast an overnight minimum field from gridded inputs.
+
+    The inputs are same-shaped 2-D (lat, lon) or 3-D (time, lat, lon) fields;
+    anything np.asarray accepts works, including xarray DataArrays, whose
+    coordinates can be restored with `temp.copy(data=result)`. The grid is
+    forecast tile by tile (see grid_tiles) into the output, so memory beyond
+    the inputs and output is bounded by the tile size.
+
+    Cells without a forecast are NaN rather than an error: masked (NaN) inputs,
+    wind or cloud values outside every range, and combinations without a K
+    value, such as 39-51 kn with 6-8 oktas.
+
+    Each tile is forecast by kernels.forecast_fused: the compiled single-pass
+    loop when numba is installed, else its NumPy fallback. With workers > 1,
+    tiles are forecast on a thread pool. Both paths release the GIL, and every
+    tile writes its own slice of the shared output, so nothing is copied
+    between workers.
+
+    Args:
+        midday_temp (np.ndarray): Midday temperature field (°C).
+        midday_dew (np.ndarray): Midday dew point field (°C).
+        wind (np.ndarray): Wind speed field (kn).
+        cloud (np.ndarray): Cloud cover field (oktas).
+        reference (pd.DataFrame | KTable): Reference data with K values.
+        tile_elements (int): Grid cells forecast per tile.
+        workers (int): Threads forecasting tiles; 0 uses every CPU.
+        out (np.ndarray, optional): Array of the grid's shape to write into.
+
+    Returns:
+        np.ndarray: Overnight minimum field (°C), float32 when every input is
+        float32 and float64 otherwise.
+
+    Raises:
+        ValueError: If the fields differ in shape, are not 2-D or 3-D, or out
+            has the wrong shape.
+    """
+    table = as_ktable(reference)
+    fields = [np.asarray(field) for field in (midday_temp, midday_dew, wind, cloud)]
+    shape = fields[0].shape
+    if any(field.shape != shape for field in fields):
+        raise ValueError(
+            f"Gridded inputs must share one shape, got {[field.shape for field in fields]}."
+        )
+    if len(shape) not in (2, 3):
+        raise ValueError(f"Gridded inputs must be 2-D or 3-D, got shape {shape}.")
+    if out is None:
+        out = np.empty(shape, dtype=np.result_type(*fields, np.float32))
+    elif out.shape != shape:
+        raise ValueError(f"Output shape {out.shape} does not match the grid {shape}.")
+
+    def forecast_tile(tile: Tuple[slice, ...]) -> None:
+        out[tile] = forecast_fused(*(field[tile] for field in fields), table)
+
+    tiles = grid_tiles(shape, tile_elements)
+    workers = workers or os.cpu_count() or 1
+    with timed("gridded", rows=int(np.prod(shape))):
+        if workers == 1:
+            for tile in tiles:
+                forecast_tile(tile)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # Consume the results so a failing tile raises here
+                for _ in pool.map(forecast_tile, tiles):
+                    pass
+    return out
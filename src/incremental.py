@@ -0,0 +1,217 @@
+import json
+import os
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+from .calculations import (
+    INPUT_COLUMNS,
+    OUTPUT_COLUMN,
+    REFERENCE_VERSION_ATTR,
+    calculate_overnight_temp,
+)
+from .utils import KTable, as_ktable
+
+KEY_COLUMNS = ["Date", "Location"]
+HASH_COLUMN = "input_hash"
+MANIFEST_NAME = "manifest.json"
+STORE_VERSION = 1
+# Parts kept before update() merges them back into one
+MAX_PARTS = 16
+
+
+def _part_name(number: int) -> str:
+    return f"forecasts-{number:05d}.parquet"
+
+
+def input_hashes(trial_data: pd.DataFrame) -> np.ndarray:
+    """Hash the input columns of every row into a uint64.
+
+    Values are hashed at float32 precision, the dtype of compact loads, so
+    compact and full-precision loads of the same file agree. Corrections below
+    float32 precision (about seven significant digits) are not detected.
+    """
+    inputs = trial_data[INPUT_COLUMNS].astype(np.float32)
+    return pd.util.hash_pandas_object(inputs, index=False).to_numpy()
+
+
+class ForecastStore:
+    """Persistent forecasts keyed by (Date, Location), for incremental runs.
+
+    Each stored row keeps a hash of its input columns. On update, rows whose key
+    and hash are already stored reuse the stored forecast; only new or changed
+    rows are recomputed. Stored rows missing from the input are kept, so daily
+    runs can pass just the new and corrected rows. If the reference table
+    changes, everything is recomputed. The store keeps no inputs, so that run
+    must pass every stored row.
+
+    The store is a directory of Parquet parts holding keys, hashes and
+    forecasts, plus a JSON manifest listing the parts (requires pyarrow). Each
+    update writes only its recomputed rows as a new part, and a key's row in a
+    later part replaces earlier ones. Once there are more than MAX_PARTS parts
+    they are merged into one. Every update still reads all parts, to match the
+    input against them.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    def load(self) -> Optional[pd.DataFrame]:
+        """Return the stored keys, hashes and forecasts, or None if empty."""
+        manifest = self._manifest()
+        if manifest is None:
+            return None
+        parts = [
+            pd.read_parquet(os.path.join(self.store_dir, name))
+            for name in manifest["parts"]
+        ]
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts, ignore_index=True).drop_duplicates(
+            KEY_COLUMNS, keep="last", ignore_index=True
+        )
+
+    def update(
+        self,
+        trial_data: pd.DataFrame,
+        reference: Union[pd.DataFrame, KTable],
+        engine: str = "vectorized",
+    ) -> Dict[str, int]:
+        """Add the overnight minimum to trial_data, recomputing only what changed.
+
+        Args:
+            trial_data (pd.DataFrame): Rows to forecast, with Date, Location and
+                the input columns. Modified in place.
+            reference (pd.DataFrame | KTable): Reference data for the K lookup.
+            engine (str): Calculation engine for the recomputed rows.
+
+        Returns:
+            Dict[str, int]: Counts of input rows, rows reused from the store, rows
+                recomputed and rows now stored.
+
+        Raises:
+            ValueError: If a (Date, Location) key appears more than once in the
+                input, the reference changed and stored rows are missing from
+                the input, or a recomputed row is invalid.
+        """
+        table = as_ktable(reference)
+        keys = pd.MultiIndex.from_frame(trial_data[KEY_COLUMNS])
+        if keys.has_duplicates:
+            raise ValueError("Trial data has duplicate (Date, Location) rows.")
+        hashes = input_hashes(trial_data)
+
+        manifest = self._manifest()
+        stored = None
+        if manifest is not None:
+            stored = self.load()
+            if manifest["reference_digest"] != table.digest():
+                # Rows left out could not be recomputed, and would be lost
+                stored_keys = pd.MultiIndex.from_frame(stored[KEY_COLUMNS])
+                missing = int((~stored_keys.isin(keys)).sum())
+                if missing:
+                    raise ValueError(
+                        f"The reference table changed, so every stored row is "
+                        f"recomputed, but {missing} stored rows are missing from "
+                        f"the input. Pass the full input."
+                    )
+                stored = None
+
+        result = np.empty(len(trial_data), dtype=np.float64)
+        if stored is not None:
+            positions = pd.MultiIndex.from_frame(stored[KEY_COLUMNS]).get_indexer(keys)
+            found = positions >= 0
+            stored_hashes = stored[HASH_COLUMN].to_numpy()
+            reuse = found.copy()
+            reuse[found] = stored_hashes[positions[found]] == hashes[found]
+            result[reuse] = stored[OUTPUT_COLUMN].to_numpy()[positions[reuse]]
+        else:
+            positions = np.full(len(trial_data), -1)
+            reuse = np.zeros(len(trial_data), dtype=bool)
+
+        recompute = ~reuse
+        if recompute.any():
+            changed = trial_data.loc[recompute, INPUT_COLUMNS].copy()
+            result[recompute] = calculate_overnight_temp(changed, table, engine=engine)[
+                OUTPUT_COLUMN
+            ].to_numpy()
+        trial_data[OUTPUT_COLUMN] = result
+        trial_data.attrs[REFERENCE_VERSION_ATTR] = table.version
+
+        n_stored = len(stored) if stored is not None else 0
+        if recompute.any() or stored is None:
+            fresh = trial_data.loc[recompute, KEY_COLUMNS].reset_index(drop=True)
+            fresh[HASH_COLUMN] = hashes[recompute]
+            fresh[OUTPUT_COLUMN] = result[recompute]
+            if stored is None:
+                self._save(fresh, table, manifest)
+                n_stored = len(fresh)
+            elif len(manifest["parts"]) >= MAX_PARTS:
+                # Merge: replace changed rows and append new ones in one part
+                replaced = positions[recompute & (positions >= 0)]
+                kept = np.ones(len(stored), dtype=bool)
+                kept[replaced] = False
+                fresh = pd.concat([stored[kept], fresh], ignore_index=True)
+                self._save(fresh, table, manifest)
+                n_stored = len(fresh)
+            else:
+                n_stored += int((recompute & (positions < 0)).sum())
+                self._save(fresh, table, manifest, rows=n_stored, append=True)
+
+        return {
+            "rows": len(trial_data),
+            "reused": int(reuse.sum()),
+            "recomputed": int(recompute.sum()),
+            "stored": n_stored,
+        }
+
+    def _manifest(self) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.store_dir, MANIFEST_NAME)) as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return None
+        if manifest.get("version") != STORE_VERSION:
+            raise ValueError(
+                f"Unsupported forecast store version: {manifest.get('version')}"
+            )
+        return manifest
+
+    def _save(
+        self,
+        forecasts: pd.DataFrame,
+        table: KTable,
+        previous: Optional[Dict],
+        rows: Optional[int] = None,
+        append: bool = False,
+    ) -> None:
+        """Write the forecasts as a new part, then the manifest.
+
+        The manifest is replaced atomically, so readers see either the old or the
+        new parts. Unless appending, the new part replaces every previous one,
+        and their files are deleted once the manifest no longer lists them.
+        """
+        os.makedirs(self.store_dir, exist_ok=True)
+        number = previous["next_part"] if previous is not None else 0
+        name = _part_name(number)
+        forecasts.to_parquet(os.path.join(self.store_dir, name), index=False)
+
+        old_parts = previous["parts"] if previous is not None else []
+        manifest = {
+            "version": STORE_VERSION,
+            "rows": len(forecasts) if rows is None else rows,
+            "reference_digest": table.digest(),
+            "reference_version": table.version,
+            "parts": [*old_parts, name] if append else [name],
+            "next_part": number + 1,
+        }
+        path = os.path.join(self.store_dir, MANIFEST_NAME)
+        with open(path + ".tmp", "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(path + ".tmp", path)
+
+        if not append:
+            for old in old_parts:
+                try:
+                    os.remove(os.path.join(self.store_dir, old))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,95 @@
+import binascii
+import csv
+import tempfile
+from typing import IO, Iterator, List, Optional
+
+import pandas as pd
+from .calculations import INPUT_COLUMNS
+
+MISSING_COLUMNS_MESSAGE = "Uploaded file is missing required columns."
+# Base64 characters decoded per step; a multiple of 4 so chunks decode on their own
+DECODE_CHUNK_CHARS = 4 * 1024 * 1024
+# Decoded uploads larger than this are spooled to a temporary file
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+
+def decode_upload(contents: str, chunk_chars: int = DECODE_CHUNK_CHARS) -> IO[bytes]:
+    """Decode a base64 data URL from dcc.Upload into a bytes buffer, chunk by chunk.
+
+    Only one chunk of the base64 payload is copied at a time. Large files spill
+    from memory to a temporary file.
+
+    Args:
+        contents (str): Data URL of the form "data:<type>;base64,<payload>".
+        chunk_chars (int): Base64 characters to decode per step.
+
+    Returns:
+        IO[bytes]: Buffer holding the decoded file, positioned at the start.
+
+    Raises:
+        ValueError: If the contents are not a valid base64 data URL.
+    """
+    separator = contents.find(",")
+    if separator < 0 or not contents[:separator].endswith(";base64"):
+        raise ValueError("Upload is not a base64 data URL.")
+    if chunk_chars % 4:
+        raise ValueError("Chunk size must be a multiple of 4 characters.")
+
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+    try:
+        for start in range(separator + 1, len(contents), chunk_chars):
+            buffer.write(binascii.a2b_base64(contents[start : start + chunk_chars]))
+    except binascii.Error as e:
+        buffer.close()
+        raise ValueError(f"Upload is not valid base64: {e}") from e
+    buffer.seek(0)
+    return buffer
+
+
+def read_header(buffer: IO[bytes]) -> List[str]:
+    """Read the CSV header line and rewind the buffer."""
+    first_line = buffer.readline()
+    buffer.seek(0)
+    return next(csv.reader([first_line.decode("utf-8-sig")]), [])
+
+
+def validate_header(
+    buffer: IO[bytes], required_columns: List[str] = INPUT_COLUMNS
+) -> List[str]:
+    """Check the header has the required columns before the body is parsed.
+
+    Raises:
+        ValueError: If any required column is missing.
+    """
+    columns = read_header(buffer)
+    if not all(col in columns for col in required_columns):
+        raise ValueError(MISSING_COLUMNS_MESSAGE)
+    return columns
+
+
+def iter_upload_chunks(
+    contents: str, chunksize: int = 100_000
+) -> Iterator[pd.DataFrame]:
+    """Decode and validate an upload, then yield its rows as DataFrame chunks.
+
+    Raises:
+        ValueError: If the upload is malformed or lacks the required columns.
+    """
+    with decode_upload(contents) as buffer:
+        validate_header(buffer)
+        yield from pd.read_csv(buffer, chunksize=chunksize)
+
+
+def parse_upload(contents: str, chunksize: Optional[int] = None) -> pd.DataFrame:
+    """Decode, validate and parse an uploaded CSV into a DataFrame.
+
+    The CSV is parsed straight from bytes, without building a decoded string.
+
+    Raises:
+        ValueError: If the upload is malformed or lacks the required columns.
+    """
+    with decode_upload(contents) as buffer:
+        validate_header(buffer)
+        if chunksize is None:
+            return pd.read_csv(buffer)
+        return pd.concat(pd.read_csv(buffer, chunksize=chunksize), ignore_index=True)
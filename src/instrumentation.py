@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+# Log line format set up by configure_logging in the app and command entry points
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+
+# Switched on with FORECAST_METRICS=1 or configure(enabled=True)
+_enabled = os.environ.get("FORECAST_METRICS", "") == "1"
+_log_stages = False
+_lock = threading.Lock()
+_stages: Dict[str, Dict[str, float]] = {}
+
+
+class _NullTimer:
+    """Shared no-op timer returned while instrumentation is disabled."""
+
+    __slots__ = ("rows",)
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    """Times one execution of a pipeline stage and records it on exit."""
+
+    __slots__ = ("stage", "rows", "_start")
+
+    def __init__(self, stage: str, rows: Optional[int]):
+        self.stage = stage
+        self.rows = rows
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, *exc) -> None:
+        _record(
+            self.stage,
+            time.perf_counter() - self._start,
+            self.rows,
+            exc_type is not None,
+        )
+
+
+def configure(enabled: bool = True, log_stages: bool = False) -> None:
+    """Switch instrumentation on or off.
+
+    Args:
+        enabled (bool): Record per-stage timings and row counts.
+        log_stages (bool): Also write a structured JSON log line per stage run.
+    """
+    global _enabled, _log_stages
+    _enabled = enabled
+    _log_stages = log_stages
+
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Log to stderr in the project format; for entry points, not at import time."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
+
+
+def is_enabled() -> bool:
+    """Return whether instrumentation is switched on."""
+    return _enabled
+
+
+def timed(stage: str, rows: Optional[int] = None):
+    """Context manager timing a pipeline stage.
+
+    Set the row count up front or on the returned timer once it is known:
+
+        with timed("parse_upload") as timer:
+            df = parse(...)
+            timer.rows = len(df)
+
+    When instrumentation is disabled this returns a shared no-op timer.
+    """
+    if not _enabled:
+        return _NULL_TIMER
+    return _StageTimer(stage, rows)
+
+
+def _record(stage: str, seconds: float, rows: Optional[int], failed: bool) -> None:
+    """Add one stage execution to the registry."""
+    with _lock:
+        stats = _stages.setdefault(
+            stage,
+            {"calls": 0, "errors": 0, "seconds": 0.0, "max_seconds": 0.0, "rows": 0},
+        )
+        stats["calls"] += 1
+        stats["errors"] += int(failed)
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["rows"] += rows or 0
+    if _log_stages:
+        logging.info(
+            json.dumps(
+                {
+                    "event": "stage",
+                    "stage": stage,
+                    "seconds": round(seconds, 6),
+                    "rows": rows,
+                    "failed": failed,
+                }
+            )
+        )
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    """Return a copy of the per-stage counters."""
+    with _lock:
+        return {stage: dict(stats) for stage, stats in _stages.items()}
+
+
+def reset() -> None:
+    """Clear all recorded stages."""
+    with _lock:
+        _stages.clear()
+
+
+def log_metrics() -> None:
+    """Write the current counters as one structured JSON log line."""
+    logging.info(json.dumps({"event": "metrics", "stages": snapshot()}))
+
+
+def render_prometheus() -> str:
+    """Render the counters in the Prometheus text exposition format."""
+    metrics = [
+        ("forecast_stage_calls_total", "counter", "calls", "Stage executions."),
+        (
+            "forecast_stage_errors_total",
+            "counter",
+            "errors",
+            "Stage executions that raised.",
+        ),
+        (
+            "forecast_stage_seconds_total",
+            "counter",
+            "seconds",
+            "Time spent in the stage.",
+        ),
+        (
+            "forecast_stage_seconds_max",
+            "gauge",
+            "max_seconds",
+            "Slowest stage execution.",
+        ),
+        (
+            "forecast_stage_rows_total",
+            "counter",
+            "rows",
+            "Rows processed by the stage.",
+        ),
+    ]
+    stages = snapshot()
+    lines = []
+    for name, kind, key, help_text in metrics:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for stage, stats in sorted(stages.items()):
+            lines.append(f'{name}{{stage="{stage}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
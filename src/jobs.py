@@ -0,0 +1,192 @@
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when a job is submitted while the queue is at its pending limit."""
+
+
+class JobCancelled(Exception):
+    """Raised inside a job when cancellation has been requested."""
+
+
+class LocalJobBackend:
+    """In-process stand-in for a Redis hash store holding job records.
+
+    Implements the hset/hgetall/delete subset of the redis-py client that
+    JobQueue uses, so a redis.Redis instance can be passed in its place to share
+    job status between app workers.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def hset(self, name: str, mapping: Dict[str, str]) -> None:
+        with self._lock:
+            self._hashes.setdefault(name, {}).update(mapping)
+
+    def hgetall(self, name: str) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._hashes.get(name, {}))
+
+    def delete(self, name: str) -> None:
+        with self._lock:
+            self._hashes.pop(name, None)
+
+
+class JobContext:
+    """Handle passed to a running job for progress reporting and cancellation."""
+
+    def __init__(self, queue: "JobQueue", job_id: str):
+        self._queue = queue
+        self.job_id = job_id
+
+    def progress(self, fraction: float, message: str = "") -> None:
+        """Record progress between 0 and 1, raising JobCancelled if cancelled."""
+        if self._queue.cancel_requested(self.job_id):
+            raise JobCancelled(self.job_id)
+        self._queue._update(self.job_id, progress=fraction, message=message)
+
+
+class JobQueue:
+    """Bounded background job queue backed by a thread pool.
+
+    At most max_workers jobs run at once and at most max_pending are queued or
+    running; further submissions raise JobQueueFull, so a burst of uploads can't
+    take over the app's request threads. Job records (state, progress, result)
+    live in the backend as JSON strings. Finished records are removed after
+    ttl seconds.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 8,
+        backend: Optional[Any] = None,
+        ttl: float = 600.0,
+    ):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.backend = backend if backend is not None else LocalJobBackend()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="forecast-job"
+        )
+        self._futures: Dict[str, Future] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> str:
+        """Queue func(context, *args) and return the job ID.
+
+        Raises:
+            JobQueueFull: If max_pending jobs are already queued or running.
+        """
+        self._prune()
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            pending = sum(not future.done() for future in self._futures.values())
+            if pending >= self.max_pending:
+                raise JobQueueFull(f"{pending} jobs already pending.")
+            self._update(job_id, state=QUEUED, progress=0.0, message="Queued")
+            self._futures[job_id] = self._executor.submit(self._run, job_id, func, args)
+        return job_id
+
+    def status(self, job_id: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Return the job record, or None if the job is unknown."""
+        if not job_id:
+            return None
+        record = self.backend.hgetall(f"job:{job_id}")
+        if not record:
+            return None
+        return {
+            _decode(key): json.loads(_decode(value)) for key, value in record.items()
+        }
+
+    def cancel(self, job_id: Optional[str]) -> bool:
+        """Cancel a queued job or ask a running one to stop at its next progress call."""
+        record = self.status(job_id)
+        if record is None or record["state"] in FINISHED_STATES:
+            return False
+        self._update(job_id, cancel_requested=True)
+        future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            self._finish(job_id, state=CANCELLED, message="Cancelled")
+        return True
+
+    def cancel_requested(self, job_id: str) -> bool:
+        record = self.status(job_id)
+        return bool(record and record.get("cancel_requested"))
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Block until a job submitted to this queue finishes; mainly for tests."""
+        future = self._futures.get(job_id)
+        if future is not None and not future.cancelled():
+            future.exception(timeout=timeout)
+        return self.status(job_id)
+
+    def discard(self, job_id: str) -> None:
+        """Remove a job record once its result has been collected."""
+        self.backend.delete(f"job:{job_id}")
+        with self._lock:
+            self._futures.pop(job_id, None)
+            self._finished_at.pop(job_id, None)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple) -> None:
+        context = JobContext(self, job_id)
+        try:
+            context.progress(0.0, "Running")
+            self._update(job_id, state=RUNNING)
+            result = func(context, *args)
+        except Exception as e:
+            if isinstance(e, JobCancelled) or self.cancel_requested(job_id):
+                self._finish(job_id, state=CANCELLED, message="Cancelled")
+                return
+            logging.error(f"Job {job_id} failed: {e}")
+            self._finish(job_id, state=FAILED, message=str(e))
+        else:
+            self._finish(
+                job_id, state=DONE, progress=1.0, message="Done", result=result
+            )
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        self.backend.hset(
+            f"job:{job_id}",
+            mapping={key: json.dumps(value) for key, value in fields.items()},
+        )
+
+    def _finish(self, job_id: str, **fields: Any) -> None:
+        self._update(job_id, **fields)
+        with self._lock:
+            self._finished_at[job_id] = time.monotonic()
+
+    def _prune(self) -> None:
+        """Drop finished job records older than the TTL."""
+        cutoff = time.monotonic() - self.ttl
+        with self._lock:
+            expired: List[str] = [
+                job_id for job_id, at in self._finished_at.items() if at < cutoff
+            ]
+        for job_id in expired:
+            self.discard(job_id)
+
+
+def _decode(value: Any) -> str:
+    """Decode bytes returned by a Redis client."""
+    return value.decode("utf-8") if isinstance(value, bytes) else value
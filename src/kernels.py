@@ -0,0 +1,176 @@
+import importlib.util
+import threading
+
+import numpy as np
+from .utils import KTable, round_values
+
+# numba is optional, and imported only when the kernel first runs since it is
+# slow to import; without it the NumPy path is used
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+# Rebound to numba.prange when the kernels are compiled; both iterate like range
+prange = range
+_kernels = None
+_kernels_lock = threading.Lock()
+# Set once the parallel loop has run and numba's thread pool exists
+_thread_pool_started = False
+
+
+def thread_pool_started() -> bool:
+    """Whether numba's thread pool was started, so this process must not fork."""
+    return _thread_pool_started
+
+
+def _round_half_away(value: float) -> float:
+    """round_value for the kernel: round half away from zero, as a float."""
+    if value >= 0:
+        return np.trunc(value + 0.5)
+    # Adding 0.0 turns -0.0 (values in (-0.5, 0)) into 0.0, as round_value does
+    return np.trunc(value - 0.5) + 0.0
+
+
+def _bin_value(value: float, lower: np.ndarray, upper: np.ndarray) -> int:
+    """First range matching the value or its rounded value, -1 if none.
+
+    A linear scan in label order, exactly as find_range; the tables have a
+    handful of ranges, so this is as fast as a binary search.
+    """
+    rounded = _round_half_away(value)
+    for j in range(lower.shape[0]):
+        if (lower[j] <= value <= upper[j]) or (lower[j] <= rounded < upper[j]):
+            return j
+    return -1
+
+
+def _forecast_loop(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    wind_lower: np.ndarray,
+    wind_upper: np.ndarray,
+    cloud_lower: np.ndarray,
+    cloud_upper: np.ndarray,
+    k_values: np.ndarray,
+    out: np.ndarray,
+) -> None:
+    """Bin, gather K, apply the formula and round each row in a single pass."""
+    for i in prange(out.shape[0]):
+        w = _bin_value(np.float64(wind[i]), wind_lower, wind_upper)
+        c = _bin_value(np.float64(cloud[i]), cloud_lower, cloud_upper)
+        if w < 0 or c < 0:
+            out[i] = np.nan
+            continue
+        # Same operation order as overnight_minimum_temps, so results are identical
+        value = (
+            (0.316 * np.float64(midday_temp[i]))
+            + (0.548 * np.float64(midday_dew[i]))
+            - 1.24
+            + k_values[w, c]
+        )
+        out[i] = _round_half_away(value)
+
+
+def _compiled_kernels():
+    """Import numba and compile the serial and parallel loops, once."""
+    global _kernels, prange, _round_half_away, _bin_value
+    with _kernels_lock:
+        if _kernels is None:
+            import numba
+
+            prange = numba.prange
+            # Helpers first, so the loops compile against the jitted versions.
+            # The serial loop releases the GIL, so callers can run it on threads
+            _round_half_away = numba.njit(cache=True, nogil=True)(_round_half_away)
+            _bin_value = numba.njit(cache=True, nogil=True)(_bin_value)
+            _kernels = (
+                numba,
+                numba.njit(cache=True, nogil=True)(_forecast_loop),
+                numba.njit(cache=True, parallel=True)(_forecast_loop),
+            )
+    return _kernels
+
+
+def _kernel_input(values: np.ndarray, shape) -> np.ndarray:
+    """Flatten an input for the kernel, keeping float32/float64 data uncopied."""
+    values = np.broadcast_to(np.asarray(values), shape).ravel()
+    if values.dtype not in (np.float32, np.float64):
+        values = values.astype(np.float64)
+    return values
+
+
+def _forecast_numpy(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    table: KTable,
+) -> np.ndarray:
+    """NumPy equivalent of the fused kernel, with one temporary per step."""
+    wind_codes = table.wind_codes(wind, strict=False)
+    cloud_codes = table.cloud_codes(cloud, strict=False)
+    matched = (wind_codes >= 0) & (cloud_codes >= 0)
+    # Unmatched codes are -1 and index the last row/column; the mask drops them
+    k_values = np.where(matched, table.k_values[wind_codes, cloud_codes], np.nan)
+    midday_temp = np.asarray(midday_temp, dtype=np.float64)
+    midday_dew = np.asarray(midday_dew, dtype=np.float64)
+    return round_values((0.316 * midday_temp) + (0.548 * midday_dew) - 1.24 + k_values)
+
+
+def forecast_fused(
+    midday_temp: np.ndarray,
+    midday_dew: np.ndarray,
+    wind: np.ndarray,
+    cloud: np.ndarray,
+    table: KTable,
+    threads: int = 1,
+) -> np.ndarray:
+    """Forecast broadcastable input arrays, with NaN for rows that can't be.
+
+    With numba installed, binning, the K gather, the formula and rounding run
+    in one compiled loop with no intermediate arrays; inputs are
+    only copied if they must be broadcast or are not float32/float64. Otherwise the same results come from NumPy column operations. Either way a
+    wind or cloud value outside every range, a combination without a K value or
+    a NaN input gives NaN for that row instead of raising.
+
+    Args:
+        midday_temp (np.ndarray): Midday temperature (°C).
+        midday_dew (np.ndarray): Midday dew point (°C).
+        wind (np.ndarray): Wind speed (kn).
+        cloud (np.ndarray): Cloud cover (oktas).
+        table (KTable): Compiled reference table.
+        threads (int): Threads for the compiled loop; 0 uses numba's maximum
+            (NUMBA_NUM_THREADS, else every CPU). The multithreaded loop starts
+            numba's thread pool, which must not be running when the process
+            later forks a multiprocessing pool (see ParallelForecaster), so it
+            is opt-in; ParallelForecaster starts its workers without forking
+            once it has run.
+
+    Returns:
+        np.ndarray: Overnight minimum temperatures (°C) in the broadcast shape.
+    """
+    if not HAVE_NUMBA:
+        return _forecast_numpy(midday_temp, midday_dew, wind, cloud, table)
+
+    shape = np.broadcast_shapes(
+        *(np.shape(x) for x in (midday_temp, midday_dew, wind, cloud))
+    )
+    numba, serial_loop, parallel_loop = _compiled_kernels()
+    out = np.empty(shape, dtype=np.float64)
+    if threads == 1:
+        loop = serial_loop
+    else:
+        max_threads = numba.config.NUMBA_NUM_THREADS
+        numba.set_num_threads(min(threads, max_threads) if threads else max_threads)
+        loop = parallel_loop
+        global _thread_pool_started
+        _thread_pool_started = True
+    loop(
+        *(_kernel_input(x, shape) for x in (midday_temp, midday_dew, wind, cloud)),
+        table.wind_bins.lower,
+        table.wind_bins.upper,
+        table.cloud_bins.lower,
+        table.cloud_bins.upper,
+        table.k_values,
+        out.reshape(-1),
+    )
+    return out
@@ -1,3 +1,7 @@
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
 from pydantic import BaseModel, Field, ValidationError
 
 
@@ -15,3 +19,108 @@ class WeatherInput(BaseModel):
     cloud_cover: int = Field(
         ..., ge=0, le=8, description="Cloud cover must be between 0 and 8 oktas"
     )
+
+
+# Trial data column validated against each WeatherInput field
+BATCH_COLUMNS = {
+    "midday_temp": "Midday Temperature (°C)",
+    "dew_point_temp": "Midday Dew Point (°C)",
+    "wind_speed": "Wind (Kn)",
+    "cloud_cover": "Cloud (oktas)",
+}
+ON_ERROR_MODES = ("report", "drop", "flag", "raise")
+
+
+def _field_bounds(field_name: str) -> List[Tuple[str, float]]:
+    """Return the (operator, limit) constraints declared on a WeatherInput field."""
+    bounds = []
+    for constraint in WeatherInput.model_fields[field_name].metadata:
+        for operator in ("gt", "ge", "lt", "le"):
+            limit = getattr(constraint, operator, None)
+            if limit is not None:
+                bounds.append((operator, float(limit)))
+    return bounds
+
+
+_SYMBOLS = {"gt": ">", "ge": ">=", "lt": "<", "le": "<="}
+_PASSES = {
+    "gt": np.greater,
+    "ge": np.greater_equal,
+    "lt": np.less,
+    "le": np.less_equal,
+}
+
+
+def validate_weather_batch(
+    df: pd.DataFrame, on_error: str = "report"
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Validate whole columns against the WeatherInput bounds with NumPy masks.
+
+    This is the bulk counterpart of WeatherInput: the same numeric bounds are
+    applied to every row at once, instead of building one model per row. Cloud
+    cover is range-checked but not required to be a whole number, since uploaded
+    observations are often fractional.
+
+    Args:
+        df (pd.DataFrame): Trial data with the input columns.
+        on_error (str): What to do with invalid rows: "report" leaves the data
+            unchanged, "drop" removes them, "flag" adds a boolean "Valid Input"
+            column and "raise" raises if any row is invalid.
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The (possibly filtered or flagged) data
+            and an error report with one row per failed check: "row" (index
+            label), "field" (column name) and "reason".
+
+    Raises:
+        ValueError: If a column is missing, on_error is unknown, or on_error is
+            "raise" and any row is invalid.
+    """
+    if on_error not in ON_ERROR_MODES:
+        raise ValueError(
+            f"Unknown on_error '{on_error}', expected one of {ON_ERROR_MODES}."
+        )
+    missing = [column for column in BATCH_COLUMNS.values() if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+    rows: List[np.ndarray] = []
+    fields: List[str] = []
+    reasons: List[str] = []
+    invalid = np.zeros(len(df), dtype=bool)
+    for field_name, column in BATCH_COLUMNS.items():
+        values = pd.to_numeric(df[column], errors="coerce").to_numpy(np.float64)
+        not_number = np.isnan(values)
+        checks = [(not_number, "not a number")]
+        for operator, limit in _field_bounds(field_name):
+            failed = ~_PASSES[operator](values, limit) & ~not_number
+            checks.append((failed, f"must be {_SYMBOLS[operator]} {limit:g}"))
+        for failed, reason in checks:
+            positions = np.flatnonzero(failed)
+            if len(positions):
+                invalid[positions] = True
+                rows.append(positions)
+                fields += [column] * len(positions)
+                reasons += [reason] * len(positions)
+
+    positions = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+    report = pd.DataFrame(
+        {
+            "row": df.index.to_numpy()[positions],
+            "field": pd.Categorical(fields, categories=list(BATCH_COLUMNS.values())),
+            "reason": pd.Categorical(reasons),
+        }
+    )
+    report = report.iloc[np.argsort(positions, kind="stable")].reset_index(drop=True)
+
+    if on_error == "raise" and invalid.any():
+        first = report.iloc[0]
+        raise ValueError(
+            f"{invalid.sum()} rows failed validation, first at row {first['row']}: "
+            f"{first['field']} {first['reason']}"
+        )
+    if on_error == "drop":
+        df = df[~invalid]
+    elif on_error == "flag":
+        df = df.assign(**{"Valid Input": ~invalid})
+    return df, report
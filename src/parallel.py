@@ -0,0 +1,157 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from .calculations import (
+    INPUT_COLUMNS,
+    OUTPUT_COLUMN,
+    REFERENCE_VERSION_ATTR,
+    forecast_arrays,
+)
+from .kernels import thread_pool_started
+from .utils import KTable, as_ktable
+
+# Reference table installed once per worker process by _init_worker
+_worker_table: Optional[KTable] = None
+
+
+def _init_worker(table: KTable) -> None:
+    """Install the reference table in a worker process."""
+    global _worker_table
+    _worker_table = table
+
+
+def _pool_context() -> Optional[multiprocessing.context.BaseContext]:
+    """Start method for the pool: the default, unless forking could hang.
+
+    A process that has run numba's multithreaded kernel (forecast_fused with
+    threads != 1) hangs at exit after forking, so its workers are started by
+    a fork server, or spawned where there is none.
+    """
+    if not thread_pool_started():
+        return None
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+
+
+def _compute_shard(columns: np.ndarray) -> np.ndarray:
+    """Compute one shard of rows, given as a (4, n) array of the input columns."""
+    return forecast_arrays(*columns, _worker_table)
+
+
+def shard_indices(
+    trial_data: pd.DataFrame,
+    n_shards: int,
+    partition_by: Optional[Sequence[str]] = None,
+) -> List[np.ndarray]:
+    """Split the row positions of the trial data into shards.
+
+    Without partition columns the rows are split into contiguous blocks. With
+    partition columns (e.g. ["Location"] or ["Date"]) every row of a partition is
+    assigned to the same shard.
+    """
+    n_rows = len(trial_data)
+    if not partition_by:
+        return [
+            shard for shard in np.array_split(np.arange(n_rows), n_shards) if len(shard)
+        ]
+
+    if len(partition_by) == 1:
+        codes, _ = pd.factorize(trial_data[partition_by[0]])
+    else:
+        codes = trial_data.groupby(list(partition_by), sort=False).ngroup().to_numpy()
+    shard_ids = codes % n_shards
+    order = np.argsort(shard_ids, kind="stable")
+    bounds = np.searchsorted(shard_ids[order], np.arange(1, n_shards))
+    return [shard for shard in np.split(order, bounds) if len(shard)]
+
+
+class ParallelForecaster:
+    """Process pool that computes overnight minimums across CPU cores.
+
+    The reference table is sent to each worker once when the pool starts; tasks
+    only carry the four input columns of their shard. Use as a context manager
+    to reuse the same pool across several batches. Workers are not forked once
+    numba's thread pool is running (see _pool_context).
+    """
+
+    def __init__(
+        self,
+        reference: Union[pd.DataFrame, KTable],
+        workers: Optional[int] = None,
+    ):
+        if workers is not None and workers < 1:
+            raise ValueError(f"Workers must be positive, got {workers}.")
+        self.table = as_ktable(reference)
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self) -> "ParallelForecaster":
+        if self.workers > 1:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=_pool_context(),
+                initializer=_init_worker,
+                initargs=(self.table,),
+            )
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def compute(
+        self,
+        trial_data: pd.DataFrame,
+        partition_by: Optional[Sequence[str]] = None,
+        shards_per_worker: int = 4,
+    ) -> np.ndarray:
+        """Return the overnight minimum for every row, in the original row order."""
+        columns = trial_data[INPUT_COLUMNS].to_numpy(dtype=np.float64).T
+        if self._pool is None:
+            return forecast_arrays(*columns, self.table)
+
+        shards = shard_indices(
+            trial_data, self.workers * shards_per_worker, partition_by
+        )
+        futures = [
+            self._pool.submit(_compute_shard, columns[:, shard]) for shard in shards
+        ]
+        result = np.empty(len(trial_data), dtype=np.float64)
+        for shard, future in zip(shards, futures):
+            result[shard] = future.result()
+        return result
+
+
+def calculate_overnight_temp_parallel(
+    trial_data: pd.DataFrame,
+    reference: Union[pd.DataFrame, KTable],
+    workers: Optional[int] = None,
+    partition_by: Optional[Sequence[str]] = None,
+) -> pd.DataFrame:
+    """Calculate the overnight minimum temperature using a pool of processes.
+
+    Args:
+        trial_data (pd.DataFrame): Trial data with the input columns.
+        reference (pd.DataFrame | KTable): Reference data for the K lookup.
+        workers (int, optional): Number of processes, defaults to the CPU count.
+            Must be positive.
+        partition_by (Sequence[str], optional): Columns such as "Location" or
+            "Date" whose partitions are kept together on one worker.
+
+    Returns:
+        pd.DataFrame: The trial data with the overnight minimum column added.
+
+    Raises:
+        ValueError: If workers is less than one.
+    """
+    with ParallelForecaster(reference, workers) as forecaster:
+        trial_data[OUTPUT_COLUMN] = forecaster.compute(trial_data, partition_by)
+    trial_data.attrs[REFERENCE_VERSION_ATTR] = forecaster.table.version
+    return trial_data
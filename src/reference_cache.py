@@ -0,0 +1,91 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+from typing import Dict, Tuple
+
+from .utils import ARTIFACT_MAGIC, KTable
+
+
+class ReferenceCache:
+    """Process-level cache of compiled reference tables.
+
+    Entries are keyed on the file path and validated against the file's mtime and
+    size on every access. When those change the file is re-read, and only
+    recompiled if its content hash differs from the cached one.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], str, KTable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, file_path: str) -> KTable:
+        """Return the compiled table for a reference file, loading it if needed.
+
+        Args:
+            file_path (str): Path to the reference CSV, in long or wide layout,
+                or to a binary artifact written by KTable.save.
+
+        Returns:
+            KTable: The compiled lookup table.
+
+        Raises:
+            FileNotFoundError: If the file does not exist.
+        """
+        path = os.path.abspath(file_path)
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == signature:
+                self.hits += 1
+                return entry[2]
+
+            with open(path, "rb") as f:
+                content = f.read()
+            digest = hashlib.sha256(content).hexdigest()
+            if entry is not None and entry[1] == digest:
+                # Touched but unchanged: keep the compiled table
+                self._entries[path] = (signature, digest, entry[2])
+                self.hits += 1
+                return entry[2]
+
+            if content.startswith(ARTIFACT_MAGIC):
+                table = KTable.from_bytes(content)
+            else:
+                # pandas is only needed for CSV references, so import it on demand
+                import pandas as pd
+
+                table = KTable.from_frame(pd.read_csv(io.BytesIO(content)))
+            self._entries[path] = (signature, digest, table)
+            self.misses += 1
+            logging.info(f"Reference table compiled from file: {file_path}")
+            return table
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the number of cached tables."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+    def clear(self) -> None:
+        """Drop all cached tables and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+reference_cache = ReferenceCache()
+
+
+def get_reference_table(file_path: str) -> KTable:
+    """Return the compiled reference table from the process-level cache."""
+    return reference_cache.get(file_path)
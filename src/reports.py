@@ -0,0 +1,118 @@
+import io
+import zipfile
+from typing import Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from .calculations import CLOUD_BIN_COLUMN, OUTPUT_COLUMN, WIND_BIN_COLUMN
+from .instrumentation import timed
+from .utils import KTable, as_ktable
+
+REPORT_GROUPS = ("Location", "Date")
+# Forecasts below this temperature (°C) count as frost
+FROST_THRESHOLD = 0.0
+
+
+def _group_report(
+    keys: pd.Series,
+    values: np.ndarray,
+    frost: np.ndarray,
+    cells: np.ndarray,
+    cell_labels: Sequence[str],
+) -> pd.DataFrame:
+    """Aggregate the forecasts of one grouping column with bincount reductions.
+
+    Missing keys (NaN) form a group of their own, sorted last.
+    """
+    codes, uniques = pd.factorize(keys, sort=True, use_na_sentinel=False)
+    n_groups = len(uniques)
+    rows = np.bincount(codes, minlength=n_groups)
+    minimum = np.full(n_groups, np.inf)
+    maximum = np.full(n_groups, -np.inf)
+    np.minimum.at(minimum, codes, values)
+    np.maximum.at(maximum, codes, values)
+    cell_counts = np.bincount(
+        codes * len(cell_labels) + cells, minlength=n_groups * len(cell_labels)
+    ).reshape(n_groups, len(cell_labels))
+
+    report = pd.DataFrame(
+        {
+            "Rows": rows,
+            "Min (°C)": minimum,
+            "Mean (°C)": np.bincount(codes, weights=values, minlength=n_groups) / rows,
+            "Max (°C)": maximum,
+            "Frost Count": np.bincount(codes[frost], minlength=n_groups),
+        },
+        index=pd.Index(uniques, name=keys.name),
+    )
+    return report.join(
+        pd.DataFrame(cell_counts, index=report.index, columns=cell_labels)
+    )
+
+
+def forecast_reports(
+    forecasts: pd.DataFrame,
+    reference: Union[pd.DataFrame, KTable],
+    groups: Sequence[str] = REPORT_GROUPS,
+) -> Dict[str, pd.DataFrame]:
+    """Summarize forecasts per Location and per Date.
+
+    Each report has one row per group with the row count, min/mean/max overnight
+    minimum, the number of frost forecasts (below FROST_THRESHOLD) and the row
+    count in every K cell of the reference table, labelled "<wind> kn / <cloud>
+    oktas". Cells without a K value are left out.
+
+    Rows are bucketed by the "Wind Bin" and "Cloud Bin" columns added by
+    calculate_overnight_temp(keep_bins=True); without them the wind and cloud
+    values are binned again. Each report is then a handful of bincount
+    reductions over the forecast columns, with no pandas groupby.
+
+    Args:
+        forecasts (pd.DataFrame): Trial data with the overnight minimum column.
+        reference (pd.DataFrame | KTable): Reference data the forecasts used.
+        groups (Sequence[str]): Columns to report on; those missing from
+            forecasts are skipped.
+
+    Returns:
+        Dict[str, pd.DataFrame]: Report per grouping column present, indexed by
+        its values. Empty if none of the columns are present.
+    """
+    groups = [group for group in groups if group in forecasts.columns]
+    if not groups:
+        return {}
+    table = as_ktable(reference)
+    with timed("reports", rows=len(forecasts)):
+        if WIND_BIN_COLUMN in forecasts.columns and CLOUD_BIN_COLUMN in forecasts:
+            wind_codes = forecasts[WIND_BIN_COLUMN].to_numpy(np.intp)
+            cloud_codes = forecasts[CLOUD_BIN_COLUMN].to_numpy(np.intp)
+        else:
+            wind_codes = table.wind_codes(forecasts["Wind (Kn)"].to_numpy())
+            cloud_codes = table.cloud_codes(forecasts["Cloud (oktas)"].to_numpy())
+
+        n_cloud = len(table.cloud_ranges)
+        present = ~np.isnan(table.k_values).ravel()
+        cell_labels = [
+            f"{wind} kn / {cloud} oktas"
+            for wind in table.wind_ranges
+            for cloud in table.cloud_ranges
+        ]
+        # Renumber the cells that have a K value, so missing ones get no column
+        cell_index = np.cumsum(present) - 1
+        cells = cell_index[wind_codes * n_cloud + cloud_codes]
+        cell_labels = [label for label, ok in zip(cell_labels, present) if ok]
+
+        values = forecasts[OUTPUT_COLUMN].to_numpy(np.float64)
+        frost = values < FROST_THRESHOLD
+        return {
+            group: _group_report(forecasts[group], values, frost, cells, cell_labels)
+            for group in groups
+        }
+
+
+def reports_zip(reports: Dict[str, pd.DataFrame]) -> bytes:
+    """Bundle reports into a zip archive with one CSV per grouping column."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for group, report in reports.items():
+            archive.writestr(f"report_by_{group.lower()}.csv", report.to_csv())
+    return buffer.getvalue()
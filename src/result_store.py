@@ -0,0 +1,222 @@
+import gzip
+import logging
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Limits on the spill directory: files older than DEFAULT_SPILL_MAX_AGE seconds
+# are deleted, then the oldest files until the rest fit in DEFAULT_SPILL_MAX_BYTES
+DEFAULT_SPILL_MAX_BYTES = 4 * DEFAULT_MAX_BYTES
+DEFAULT_SPILL_MAX_AGE = 24 * 60 * 60
+_KEY_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+
+
+class ResultStore:
+    """Server-side store for forecast downloads, keyed by a random result ID.
+
+    Each forecast is serialized once to gzip-compressed CSV when it is stored.
+    Entries live in an in-process LRU bounded by their compressed size plus the
+    decoded copy of the last result read, kept for repeat downloads. If a spill
+    directory is configured, evicted entries are written there instead of being
+    dropped, and lookups that miss in memory fall back to it. With
+    write_through=True every entry is also written to the spill directory on
+    put, so workers sharing the directory can serve each other's results.
+
+    The spill directory is pruned after every write: files older than
+    spill_max_age seconds expire, and the oldest files are deleted until the
+    directory holds at most spill_max_bytes. Results whose file is deleted and
+    that are no longer in memory are gone, as after an eviction without spill.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        spill_dir: Optional[str] = None,
+        write_through: bool = False,
+        spill_max_bytes: int = DEFAULT_SPILL_MAX_BYTES,
+        spill_max_age: float = DEFAULT_SPILL_MAX_AGE,
+    ):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.write_through = write_through and spill_dir is not None
+        self.spill_max_bytes = spill_max_bytes
+        self.spill_max_age = spill_max_age
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        # Last result decoded by get(), so repeated downloads skip decompression;
+        # counted in _bytes and dropped first when over the limit
+        self._decoded: Optional[Tuple[str, bytes]] = None
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.spills = 0
+        self.expired = 0
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def put(self, forecasts: pd.DataFrame) -> str:
+        """Serialize and store forecasts, returning the new result ID."""
+        return self.put_bytes(forecasts.to_csv().encode("utf-8"))
+
+    def put_bytes(self, data: bytes, key: Optional[str] = None) -> str:
+        """Store an already serialized result, under a new ID unless one is given.
+
+        Passing the ID of a result held in another store keeps related outputs,
+        such as the reports for a forecast, under the same ID.
+        """
+        given = key is not None
+        if key is None:
+            key = uuid.uuid4().hex
+        elif not _KEY_PATTERN.match(key):
+            raise ValueError(f"Invalid result ID: {key!r}")
+        payload = gzip.compress(data, compresslevel=1)
+        if self.write_through:
+            self._write_spill(key, payload)
+        elif given and self.spill_dir is not None:
+            # A spilled copy of the replaced result would be stale
+            self._remove_spill(key)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            if self._decoded is not None and self._decoded[0] == key:
+                self._drop_decoded()
+            self._entries[key] = payload
+            self._bytes += len(payload)
+            self._evict()
+        return key
+
+    def get(self, key: Optional[str]) -> Optional[bytes]:
+        """Return the stored result bytes (CSV for forecasts), or None if unknown or expired."""
+        if not key or not _KEY_PATTERN.match(key):
+            return None
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if self._decoded is not None and self._decoded[0] == key:
+                    return self._decoded[1]
+
+        if payload is None:
+            payload = self._read_spill(key)
+            with self._lock:
+                if payload is None:
+                    self.misses += 1
+                    return None
+                self.hits += 1
+        data = gzip.decompress(payload)
+        with self._lock:
+            if key in self._entries:
+                self._drop_decoded()
+                self._decoded = (key, data)
+                self._bytes += len(data)
+                self._evict()
+        return data
+
+    def __contains__(self, key: Optional[str]) -> bool:
+        if not key or not _KEY_PATTERN.match(key):
+            return False
+        with self._lock:
+            if key in self._entries:
+                return True
+        return self.spill_dir is not None and os.path.exists(self._spill_path(key))
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters and the bytes held in memory."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "spills": self.spills,
+                "expired": self.expired,
+            }
+
+    def _drop_decoded(self) -> None:
+        if self._decoded is not None:
+            self._bytes -= len(self._decoded[1])
+            self._decoded = None
+
+    def _evict(self) -> None:
+        """Drop or spill least recently used entries until under the byte limit.
+
+        The decoded copy of the last result goes first, since it can be rebuilt
+        from its entry.
+        """
+        if self._bytes > self.max_bytes:
+            self._drop_decoded()
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, payload = self._entries.popitem(last=False)
+            self._bytes -= len(payload)
+            if self.spill_dir is not None and not self.write_through:
+                self._write_spill(key, payload)
+                self.spills += 1
+
+    def _spill_path(self, key: str) -> str:
+        return os.path.join(self.spill_dir, f"{key}.csv.gz")
+
+    def _write_spill(self, key: str, payload: bytes) -> None:
+        path = self._spill_path(key)
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(payload)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            logging.error(f"Error spilling forecast result to disk: {e}")
+        self._prune_spill()
+
+    def _prune_spill(self) -> None:
+        """Delete expired spill files, then the oldest ones over the size limit."""
+        files = []
+        try:
+            with os.scandir(self.spill_dir) as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith((".csv.gz", ".tmp")):
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError as e:
+            logging.error(f"Error listing the result spill directory: {e}")
+            return
+
+        files.sort()
+        cutoff = time.time() - self.spill_max_age
+        total = sum(size for _, size, _ in files)
+        for mtime, size, path in files:
+            if mtime >= cutoff and total <= self.spill_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Already pruned by another worker sharing the directory
+            except OSError as e:
+                logging.error(f"Error deleting expired result file: {e}")
+                continue
+            total -= size
+            with self._lock:
+                self.expired += 1
+
+    def _remove_spill(self, key: str) -> None:
+        try:
+            os.remove(self._spill_path(key))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Error deleting replaced result file: {e}")
+
+    def _read_spill(self, key: str) -> Optional[bytes]:
+        if self.spill_dir is None:
+            return None
+        try:
+            with open(self._spill_path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from .calculations import overnight_minimum_temp
+from .reference_cache import get_reference_table
+from .utils import KTable, as_ktable, k_value_lookup
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_REFERENCE = "./data/processed/transformed_reference.csv"
+# Distinct inputs remembered per forecaster
+DEFAULT_CACHE_SIZE = 65_536
+# Inputs are memoized exactly unless a number of decimal places is given
+DEFAULT_DECIMALS = None
+# Seconds between checks of the reference file by the shared forecasters
+RELOAD_INTERVAL = 1.0
+
+
+class ScalarForecaster:
+    """Single-point forecasts from a compiled K table, memoized on the inputs.
+
+    Each call skips pandas entirely: the wind and cloud ranges are found by
+    bisection in the KTable and the formula is evaluated on Python floats.
+    Results are kept in a bounded LRU keyed on the inputs, so repeated queries
+    cost a dictionary lookup. Errors are not cached.
+
+    With `decimals` set, inputs are rounded to that many places before the
+    forecast, so values differing only by floating point noise share an entry.
+    The forecast is then that of the rounded inputs, whatever was asked before:
+    a wind of 12.4996 gets the 12.5 forecast, where forecast_arrays raises.
+    """
+
+    def __init__(
+        self,
+        reference: Union[pd.DataFrame, KTable],
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        decimals: Optional[int] = DEFAULT_DECIMALS,
+    ):
+        self.table = as_ktable(reference)
+        self.decimals = decimals
+        self._cached = lru_cache(maxsize=maxsize)(self._compute)
+
+    def forecast(
+        self, midday_temp: float, midday_dew: float, wind: float, cloud: float
+    ) -> float:
+        """Return the overnight minimum temperature for one set of inputs.
+
+        Raises:
+            ValueError: If a value is out of range or not a number, or the
+                wind/cloud combination has no K value.
+        """
+        # float() first: rounding and hashing NumPy scalars is far slower
+        inputs = (float(midday_temp), float(midday_dew), float(wind), float(cloud))
+        decimals = self.decimals
+        if decimals is not None:
+            inputs = tuple(round(x, decimals) for x in inputs)
+        return self._cached(*inputs)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the LRU hit/miss counters and its current and maximum size."""
+        info = self._cached.cache_info()
+        return {
+            "hits": info.hits,
+            "misses": info.misses,
+            "entries": info.currsize,
+            "maxsize": info.maxsize,
+        }
+
+    def clear(self) -> None:
+        """Drop all memoized results and reset the counters."""
+        self._cached.cache_clear()
+
+    def _compute(
+        self, midday_temp: float, midday_dew: float, wind: float, cloud: float
+    ) -> float:
+        K = k_value_lookup(wind, cloud, self.table)
+        return overnight_minimum_temp(midday_temp, midday_dew, K)
+
+
+_forecasters: Dict[str, Tuple[ScalarForecaster, float]] = {}
+_forecasters_lock = threading.Lock()
+
+
+def get_forecaster(reference: str = DEFAULT_REFERENCE) -> ScalarForecaster:
+    """Return the shared forecaster for a reference CSV.
+
+    The reference file is checked at most every RELOAD_INTERVAL seconds, since a
+    stat call costs more than a cached forecast. The forecaster is rebuilt, with
+    an empty cache, whenever the reference cache recompiles the file.
+    """
+    now = time.monotonic()
+    entry = _forecasters.get(reference)
+    if entry is not None and now - entry[1] < RELOAD_INTERVAL:
+        return entry[0]
+
+    table = get_reference_table(reference)
+    with _forecasters_lock:
+        entry = _forecasters.get(reference)
+        if entry is None or entry[0].table is not table:
+            forecaster = ScalarForecaster(table)
+        else:
+            forecaster = entry[0]
+        _forecasters[reference] = (forecaster, now)
+    return forecaster
+
+
+def forecast_one(
+    midday_temp: float,
+    midday_dew: float,
+    wind: float,
+    cloud: float,
+    reference: str = DEFAULT_REFERENCE,
+) -> float:
+    """Forecast the overnight minimum for one set of inputs.
+
+    Args:
+        midday_temp (float): Midday temperature (°C).
+        midday_dew (float): Midday dew point (°C).
+        wind (float): Wind speed (kn).
+        cloud (float): Cloud cover (oktas).
+        reference (str): Path to the reference CSV.
+
+    Returns:
+        float: The overnight minimum temperature (°C).
+
+    Raises:
+        ValueError: If a value is out of range or not a number, or the
+            wind/cloud combination has no K value.
+    """
+    return get_forecaster(reference).forecast(midday_temp, midday_dew, wind, cloud)
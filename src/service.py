@@ -0,0 +1,219 @@
+import gzip
+import itertools
+import json
+import zlib
+from typing import Any, Dict, Iterable, Iterator, List
+
+import numpy as np
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+from werkzeug.exceptions import BadRequest, HTTPException, RequestEntityTooLarge
+
+from .calculations import forecast_arrays
+from .instrumentation import timed
+from .reference_cache import get_reference_table
+from .utils import KTable
+
+# Request fields, in forecast_arrays argument order
+API_FIELDS = ("temp", "dew", "wind", "cloud")
+NDJSON = "application/x-ndjson"
+
+# Limits on the request body as sent and after gzip decoding
+MAX_REQUEST_BYTES = 16 * 1024 * 1024
+MAX_DECODED_BYTES = 128 * 1024 * 1024
+# Rows computed and written per step of a streamed response
+STREAM_BLOCK_ROWS = 10_000
+
+
+def parse_json_batch(payload: Any) -> Dict[str, np.ndarray]:
+    """Convert a JSON batch into one float64 array per field.
+
+    The batch is either a list of {temp, dew, wind, cloud} records or an object
+    of same-length arrays keyed by field.
+
+    Raises:
+        BadRequest: If the batch has the wrong shape, misses a field or holds
+            values that are not numbers.
+    """
+    if isinstance(payload, list):
+        try:
+            columns = {field: [row[field] for row in payload] for field in API_FIELDS}
+        except (KeyError, TypeError) as e:
+            raise BadRequest(
+                f"Every record must be an object with fields {list(API_FIELDS)}."
+            ) from e
+    elif isinstance(payload, dict):
+        missing = [field for field in API_FIELDS if field not in payload]
+        if missing:
+            raise BadRequest(f"Missing fields: {missing}")
+        columns = {field: payload[field] for field in API_FIELDS}
+    else:
+        raise BadRequest("Expected a list of records or an object of arrays.")
+
+    try:
+        arrays = {
+            field: np.asarray(values, dtype=np.float64)
+            for field, values in columns.items()
+        }
+    except (TypeError, ValueError) as e:
+        raise BadRequest("All values must be numbers.") from e
+    shapes = {array.shape for array in arrays.values()}
+    if len(shapes) != 1 or len(shapes.pop()) != 1:
+        raise BadRequest("All fields must be arrays of the same length.")
+    return arrays
+
+
+def iter_ndjson_batches(
+    lines: Iterable[bytes], block_rows: int = STREAM_BLOCK_ROWS
+) -> Iterator[Dict[str, np.ndarray]]:
+    """Parse NDJSON records and yield them in batches of at most block_rows.
+
+    Raises:
+        BadRequest: If a line is not valid JSON or not a valid record.
+    """
+    block: List[Any] = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            block.append(json.loads(line))
+        except ValueError as e:
+            raise BadRequest(f"Line {number} is not valid JSON.") from e
+        if len(block) == block_rows:
+            yield parse_json_batch(block)
+            block = []
+    if block:
+        yield parse_json_batch(block)
+
+
+def forecast_batch(columns: Dict[str, np.ndarray], table: KTable) -> np.ndarray:
+    """Forecast a parsed batch, raising BadRequest for out-of-range inputs."""
+    with timed("api_forecast", rows=len(columns["temp"])):
+        try:
+            return forecast_arrays(*(columns[field] for field in API_FIELDS), table)
+        except ValueError as e:
+            raise BadRequest(str(e)) from e
+
+
+def read_request_body() -> bytes:
+    """Read the request body, decoding gzip, within the size limits.
+
+    Raises:
+        RequestEntityTooLarge: If the body is over a size limit.
+        BadRequest: If the body can't be decoded.
+    """
+    if (request.content_length or 0) > MAX_REQUEST_BYTES:
+        raise RequestEntityTooLarge(f"Request body over {MAX_REQUEST_BYTES} bytes.")
+    body = request.stream.read(MAX_REQUEST_BYTES + 1)
+    if len(body) > MAX_REQUEST_BYTES:
+        raise RequestEntityTooLarge(f"Request body over {MAX_REQUEST_BYTES} bytes.")
+
+    encoding = request.headers.get("Content-Encoding", "identity").lower()
+    if encoding == "identity":
+        return body
+    if encoding != "gzip":
+        raise BadRequest(f"Unsupported Content-Encoding '{encoding}'.")
+    decoder = zlib.decompressobj(wbits=31)
+    try:
+        # Bounded output guards against compression bombs
+        decoded = decoder.decompress(body, MAX_DECODED_BYTES + 1)
+    except zlib.error as e:
+        raise BadRequest("Request body is not valid gzip.") from e
+    if len(decoded) > MAX_DECODED_BYTES or decoder.unconsumed_tail:
+        raise RequestEntityTooLarge(f"Decoded body over {MAX_DECODED_BYTES} bytes.")
+    return decoded
+
+
+def _accepts_gzip() -> bool:
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+
+def _stream_ndjson(results: Iterator[np.ndarray], compress: bool) -> Iterator[bytes]:
+    """Yield one {"overnight_min": value} line per row, batch by batch.
+
+    Errors after the response has started are reported as a final
+    {"error": message} line, since the status code has already been sent.
+    """
+    encoder = zlib.compressobj(wbits=31) if compress else None
+    try:
+        for batch in results:
+            chunk = "".join(
+                f'{{"overnight_min": {value}}}\n' for value in batch.tolist()
+            ).encode("utf-8")
+            if encoder:
+                # Flush each batch so clients can consume results as they arrive
+                chunk = encoder.compress(chunk) + encoder.flush(zlib.Z_SYNC_FLUSH)
+            yield chunk
+    except HTTPException as e:
+        line = (json.dumps({"error": e.description}) + "\n").encode("utf-8")
+        yield encoder.compress(line) if encoder else line
+    if encoder:
+        yield encoder.flush()
+
+
+def create_forecast_api(reference_path: str) -> Blueprint:
+    """Build the blueprint serving batch forecasts at POST /api/forecast.
+
+    JSON bodies hold a list of {temp, dew, wind, cloud} records or an object of
+    arrays, and get {"overnight_min": [...], "reference_version": ...} back. NDJSON bodies (one record per
+    line), or requests that accept NDJSON, get one result line per record,
+    streamed in blocks of STREAM_BLOCK_ROWS. Request bodies may be gzipped and
+    responses are gzipped for clients that accept it. Every response carries
+    the reference version in an X-Reference-Version header.
+    """
+    api = Blueprint("forecast_api", __name__, url_prefix="/api")
+
+    @api.errorhandler(HTTPException)
+    def http_error(e: HTTPException):
+        return jsonify(error=e.description), e.code
+
+    @api.route("/forecast", methods=["POST"])
+    def forecast():
+        body = read_request_body()
+        table = get_reference_table(reference_path)
+        compress = _accepts_gzip()
+
+        if request.mimetype == NDJSON:
+            batches = iter_ndjson_batches(body.splitlines())
+        else:
+            try:
+                payload = json.loads(body)
+            except ValueError as e:
+                raise BadRequest("Request body is not valid JSON.") from e
+            columns = parse_json_batch(payload)
+            if NDJSON not in request.headers.get("Accept", ""):
+                results = forecast_batch(columns, table)
+                response = jsonify(
+                    overnight_min=results.tolist(), reference_version=table.version
+                )
+                if compress:
+                    response.set_data(gzip.compress(response.get_data(), 6))
+                    response.headers["Content-Encoding"] = "gzip"
+                response.headers["Vary"] = "Accept-Encoding"
+                response.headers["X-Reference-Version"] = table.version
+                return response
+            n_rows = len(columns["temp"])
+            batches = (
+                {
+                    field: array[start : start + STREAM_BLOCK_ROWS]
+                    for field, array in columns.items()
+                }
+                for start in range(0, n_rows, STREAM_BLOCK_ROWS)
+            )
+
+        # Forecast the first batch before the response starts, so malformed
+        # requests still get an error status rather than an error line
+        results = (forecast_batch(columns, table) for columns in batches)
+        first = next(results, None)
+        if first is not None:
+            results = itertools.chain([first], results)
+        response = Response(
+            stream_with_context(_stream_ndjson(results, compress)),
+            mimetype=NDJSON,
+        )
+        response.headers["X-Reference-Version"] = table.version
+        if compress:
+            response.headers["Content-Encoding"] = "gzip"
+        response.headers["Vary"] = "Accept-Encoding"
+        return response
+
+    return api
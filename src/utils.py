@@ -1,6 +1,23 @@
-import pandas as pd
+from __future__ import annotations
+
+import numpy as np
+import hashlib
+import json
 import logging
-from typing import Tuple
+import os
+import struct
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple, Union
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Binary reference artifacts written by KTable.to_bytes: magic, then a header of
+# format, SHA-256 digest, wind and cloud range counts and label JSON size
+ARTIFACT_MAGIC = b"KTBL"
+ARTIFACT_FORMAT = 1
+_ARTIFACT_HEADER = struct.Struct("<I32sIII")
 
 
 def round_value(value: float) -> int:
@@ -8,6 +25,14 @@ def round_value(value: float) -> int:
     return int(value + 0.5) if value >= 0 else int(value - 0.5)
 
 
+def round_values(values: np.ndarray) -> np.ndarray:
+    """Vectorized round_value: round half away from zero, returned as floats."""
+    values = np.asarray(values, dtype=np.float64)
+    # Same as trunc(v + 0.5) for v >= 0 and trunc(v - 0.5) below, in one pass each;
+    # adding 0.0 turns the -0.0 from values in (-0.5, 0) into 0.0, as round_value
+    return np.trunc(values + np.copysign(0.5, values)) + 0.0
+
+
 def parse_range(range_str: str) -> Tuple[float, float]:
     """Parse a range string into a tuple of floats."""
     lower, upper = map(float, range_str.split("-"))
@@ -16,37 +41,410 @@ def parse_range(range_str: str) -> Tuple[float, float]:
 
 def find_range(value: float, column: str, reference: pd.DataFrame) -> str:
     """Find the range for the given value from the reference DataFrame, considering both original and rounded values."""
-    value = float(value)
-    rounded_value = float(round_value(value))  # Use rounding to get the nearest integer
-
-    # Iterate through the DataFrame rows to find the matching range
-    for idx, row in reference.iterrows():
-        lower, upper = parse_range(row[column])
-        # Check if either the original or rounded value falls within the range
-        if (lower <= value <= upper) or (lower <= rounded_value < upper):
-            return row[column]
-
-    # Raise an error if no matching range is found
-    raise ValueError(
-        f"Value {value} (or its rounded value {rounded_value}) does not fall into any defined range."
+    # The column's labels are parsed once and cached, rather than on every call
+    return _column_bins(tuple(reference[column])).label(value)
+
+
+def unique_ranges(labels: Sequence[str]) -> List[str]:
+    """Return the distinct range labels in order of first appearance."""
+    return list(dict.fromkeys(labels))
+
+
+class RangeBins:
+    """Range labels such as "0-12" compiled into edge arrays for binning.
+
+    Binning follows find_range exactly: a value matches a range if it lies
+    within its inclusive bounds or its round_value-rounded value lies within
+    its half-open bounds, and the first matching range wins. Codes are the
+    index of that range in `labels`, so they can index lookup tables, group
+    rows or key caches directly.
+
+    When the ranges are in ascending order, as in the reference data, each
+    value is binned with two binary searches; otherwise the ranges are tried
+    in order.
+    """
+
+    def __init__(
+        self,
+        labels: Sequence[str],
+        lower: Optional[np.ndarray] = None,
+        upper: Optional[np.ndarray] = None,
+    ):
+        self.labels = list(labels)
+        if lower is None or upper is None:
+            bounds = [parse_range(label) for label in self.labels]
+            lower = [lo for lo, _ in bounds]
+            upper = [hi for _, hi in bounds]
+        self.lower = np.asarray(lower, dtype=np.float64)
+        self.upper = np.asarray(upper, dtype=np.float64)
+        if not len(self.lower) == len(self.upper) == len(self.labels):
+            raise ValueError("Range bounds do not match the range labels.")
+        self._lower_list = self.lower.tolist()
+        self._upper_list = self.upper.tolist()
+        self.is_sorted = all(
+            a <= b for a, b in zip(self._lower_list, self._lower_list[1:])
+        ) and all(a <= b for a, b in zip(self._upper_list, self._upper_list[1:]))
+        # A lower bound no value reaches, so a search past the last range fails
+        self._lower_padded = np.append(self.lower, np.inf)
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def code(self, value: float) -> int:
+        """Return the range index for a single value.
+
+        Raises:
+            ValueError: If the value does not fall into any range.
+        """
+        value = float(value)
+        rounded_value = float(round_value(value))
+        lower, upper = self._lower_list, self._upper_list
+        if self.is_sorted:
+            # With sorted edges the first range reaching the value is the only candidate
+            candidates = []
+            idx = bisect_left(upper, value)
+            if idx < len(upper) and lower[idx] <= value:
+                candidates.append(idx)
+            idx = bisect_right(upper, rounded_value)
+            if idx < len(upper) and lower[idx] <= rounded_value:
+                candidates.append(idx)
+            if candidates:
+                return min(candidates)
+        else:
+            for idx, (lo, hi) in enumerate(zip(lower, upper)):
+                if (lo <= value <= hi) or (lo <= rounded_value < hi):
+                    return idx
+        raise ValueError(
+            f"Value {value} (or its rounded value {rounded_value}) does not fall into any defined range."
+        )
+
+    def label(self, value: float) -> str:
+        """Return the range label for a single value."""
+        return self.labels[self.code(value)]
+
+    def codes(self, values: np.ndarray, strict: bool = True) -> np.ndarray:
+        """Return the range index for every value, or -1 if none and not strict.
+
+        Raises:
+            ValueError: If strict and any value does not fall into a range.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        rounded = round_values(values)
+        n_bins = len(self.labels)
+        if self.is_sorted:
+            raw = np.searchsorted(self.upper, values, side="left")
+            raw = np.where(self._lower_padded.take(raw) <= values, raw, n_bins)
+            near = np.searchsorted(self.upper, rounded, side="right")
+            near = np.where(self._lower_padded.take(near) <= rounded, near, n_bins)
+            codes = np.minimum(raw, near)
+        else:
+            codes = np.full(values.shape, n_bins, dtype=np.intp)
+            # Reversed, so the first matching range is written last
+            for idx in reversed(range(n_bins)):
+                lo, hi = self._lower_list[idx], self._upper_list[idx]
+                match = ((lo <= values) & (values <= hi)) | (
+                    (lo <= rounded) & (rounded < hi)
+                )
+                codes[match] = idx
+
+        missing = codes == n_bins
+        if missing.any():
+            if strict:
+                raise ValueError(
+                    f"Value {values[missing][0]} (or its rounded value {rounded[missing][0]}) does not fall into any defined range."
+                )
+            codes[missing] = -1
+        return codes
+
+
+@lru_cache(maxsize=32)
+def _column_bins(labels: Tuple[str, ...]) -> RangeBins:
+    """Compile the distinct labels of a reference column, once per label set."""
+    return RangeBins(unique_ranges(labels))
+
+
+def assign_ranges(
+    values: np.ndarray, labels: Sequence[str], strict: bool = True
+) -> np.ndarray:
+    """Assign each value to the index of its range label, with find_range semantics.
+
+    Raises:
+        ValueError: If strict and any value does not fall into a defined range.
+    """
+    return RangeBins(labels).codes(values, strict)
+
+
+class KTable:
+    """Precompiled K-value lookup table: parsed bin edges plus a dense K matrix.
+
+    Rows of the matrix are wind speed ranges and columns are cloud cover ranges,
+    both in order of first appearance in the reference. Missing combinations are
+    NaN. Values are binned by the wind_bins and cloud_bins RangeBins, which
+    follow find_range exactly.
+    """
+
+    def __init__(
+        self,
+        wind_ranges: Sequence[str],
+        cloud_ranges: Sequence[str],
+        k_values: np.ndarray,
+    ):
+        self.wind_ranges = list(wind_ranges)
+        self.cloud_ranges = list(cloud_ranges)
+        self.k_values = np.asarray(k_values, dtype=np.float64)
+        if self.k_values.shape != (len(self.wind_ranges), len(self.cloud_ranges)):
+            raise ValueError(
+                f"K matrix shape {self.k_values.shape} does not match "
+                f"{len(self.wind_ranges)} wind and {len(self.cloud_ranges)} cloud ranges."
+            )
+        self.wind_bins = RangeBins(self.wind_ranges)
+        self.cloud_bins = RangeBins(self.cloud_ranges)
+        self._digest: Optional[str] = None
+
+    @classmethod
+    def from_long(cls, reference: pd.DataFrame) -> "KTable":
+        """Build the table from the long format used by transformed_reference.csv."""
+        wind_ranges = unique_ranges(reference["Wind Speed Range (kn)"])
+        cloud_ranges = unique_ranges(reference["Cloud Cover Range (oktas)"])
+        wind_index = {label: idx for idx, label in enumerate(wind_ranges)}
+        cloud_index = {label: idx for idx, label in enumerate(cloud_ranges)}
+
+        k_values = np.full((len(wind_ranges), len(cloud_ranges)), np.nan)
+        filled = np.zeros(k_values.shape, dtype=bool)
+        for wind_range, cloud_range, k_value in zip(
+            reference["Wind Speed Range (kn)"],
+            reference["Cloud Cover Range (oktas)"],
+            reference["K Value"],
+        ):
+            i, j = wind_index[wind_range], cloud_index[cloud_range]
+            # The first matching reference row wins, as in the DataFrame filter
+            if not filled[i, j]:
+                k_values[i, j] = k_value
+                filled[i, j] = True
+        return cls(wind_ranges, cloud_ranges, k_values)
+
+    @classmethod
+    def from_wide(cls, reference: pd.DataFrame) -> "KTable":
+        """Build the table from the wide format used by reference.csv."""
+        reference = reference.drop_duplicates(subset="Wind Speed (knots)")
+        cloud_ranges = [col for col in reference.columns if col != "Wind Speed (knots)"]
+        return cls(
+            reference["Wind Speed (knots)"].tolist(),
+            cloud_ranges,
+            reference[cloud_ranges].to_numpy(dtype=np.float64),
+        )
+
+    @classmethod
+    def from_frame(cls, reference: pd.DataFrame) -> "KTable":
+        """Build the table from either reference layout, detected from its columns."""
+        if "Wind Speed Range (kn)" in reference.columns:
+            return cls.from_long(reference)
+        if "Wind Speed (knots)" in reference.columns:
+            return cls.from_wide(reference)
+        raise ValueError("Reference DataFrame is neither in long nor wide format.")
+
+    @classmethod
+    def from_csv(cls, file_path: str) -> "KTable":
+        """Load and compile a reference CSV in either layout."""
+        import pandas as pd
+
+        return cls.from_frame(pd.read_csv(file_path))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "KTable":
+        """Rebuild a table from to_bytes() output, without parsing range labels.
+
+        Raises:
+            ValueError: If the data is not a reference artifact, has an
+                unsupported format or does not match its recorded digest.
+        """
+        if data[: len(ARTIFACT_MAGIC)] != ARTIFACT_MAGIC:
+            raise ValueError("Data is not a reference artifact.")
+        artifact_format, digest, n_wind, n_cloud, labels_size = (
+            _ARTIFACT_HEADER.unpack_from(data, len(ARTIFACT_MAGIC))
+        )
+        if artifact_format != ARTIFACT_FORMAT:
+            raise ValueError(
+                f"Unsupported reference artifact format: {artifact_format}"
+            )
+        offset = len(ARTIFACT_MAGIC) + _ARTIFACT_HEADER.size
+        wind_ranges, cloud_ranges = json.loads(data[offset : offset + labels_size])
+        offset += labels_size
+        n_bounds = 2 * n_wind + 2 * n_cloud
+        n_values = n_bounds + n_wind * n_cloud
+        # astype copies out of the read-only buffer
+        values = np.frombuffer(data, dtype="<f8", count=n_values, offset=offset).astype(
+            np.float64
+        )
+        missing = np.frombuffer(
+            data, dtype=np.bool_, count=n_wind * n_cloud, offset=offset + 8 * n_values
+        )
+        wind_bounds = values[: 2 * n_wind].reshape(2, n_wind)
+        cloud_bounds = values[2 * n_wind : n_bounds].reshape(2, n_cloud)
+        k_values = values[n_bounds:].reshape(n_wind, n_cloud)
+
+        table = cls.__new__(cls)
+        table.wind_ranges = wind_ranges
+        table.cloud_ranges = cloud_ranges
+        k_values[missing.reshape(n_wind, n_cloud)] = np.nan
+        table.k_values = k_values
+        table.wind_bins = RangeBins(wind_ranges, *wind_bounds)
+        table.cloud_bins = RangeBins(cloud_ranges, *cloud_bounds)
+        table._digest = None
+        if table.digest() != digest.hex():
+            raise ValueError("Reference artifact does not match its digest.")
+        return table
+
+    def to_bytes(self) -> bytes:
+        """Serialize the compiled table into a versioned binary artifact.
+
+        The artifact holds a header (format, SHA-256 digest, table shape), the
+        range labels as JSON, the parsed bin edges and the K matrix as
+        little-endian float64, and the missing-combination mask.
+        """
+        labels = json.dumps([self.wind_ranges, self.cloud_ranges]).encode("utf-8")
+        n_wind, n_cloud = self.k_values.shape
+        values = np.concatenate(
+            [
+                self.wind_bins.lower,
+                self.wind_bins.upper,
+                self.cloud_bins.lower,
+                self.cloud_bins.upper,
+                np.nan_to_num(self.k_values, nan=0.0).ravel(),
+            ]
+        )
+        return b"".join(
+            [
+                ARTIFACT_MAGIC,
+                _ARTIFACT_HEADER.pack(
+                    ARTIFACT_FORMAT,
+                    bytes.fromhex(self.digest()),
+                    n_wind,
+                    n_cloud,
+                    len(labels),
+                ),
+                labels,
+                values.astype("<f8").tobytes(),
+                np.isnan(self.k_values).tobytes(),
+            ]
+        )
+
+    @classmethod
+    def load(cls, file_path: str) -> "KTable":
+        """Load a reference artifact written by save()."""
+        with open(file_path, "rb") as f:
+            return cls.from_bytes(f.read())
+
+    def save(self, file_path: str) -> None:
+        """Write the table as a reference artifact, replacing the file atomically."""
+        with open(file_path + ".tmp", "wb") as f:
+            f.write(self.to_bytes())
+        os.replace(file_path + ".tmp", file_path)
+
+    def wind_range(self, value: float) -> str:
+        """Return the wind speed range label for a single value."""
+        return self.wind_bins.label(value)
+
+    def cloud_range(self, value: float) -> str:
+        """Return the cloud cover range label for a single value."""
+        return self.cloud_bins.label(value)
+
+    def wind_codes(self, values: np.ndarray, strict: bool = True) -> np.ndarray:
+        """Return the wind range index for every value, -1 if none and not strict."""
+        return self.wind_bins.codes(values, strict)
+
+    def cloud_codes(self, values: np.ndarray, strict: bool = True) -> np.ndarray:
+        """Return the cloud range index for every value, -1 if none and not strict."""
+        return self.cloud_bins.codes(values, strict)
+
+    def lookup(self, wind_value: float, cloud_value: float) -> float:
+        """Lookup a single K value, NaN when the combination is missing."""
+        return float(
+            self.k_values[
+                self.wind_bins.code(wind_value),
+                self.cloud_bins.code(cloud_value),
+            ]
+        )
+
+    def lookup_array(
+        self, wind_values: np.ndarray, cloud_values: np.ndarray
+    ) -> np.ndarray:
+        """Lookup K values for whole columns, NaN where the combination is missing."""
+        return self.k_values[
+            self.wind_codes(wind_values), self.cloud_codes(cloud_values)
+        ]
+
+    def digest(self) -> str:
+        """Return a SHA-256 hex digest of the ranges and K values."""
+        if self._digest is None:
+            h = hashlib.sha256()
+            h.update(json.dumps([self.wind_ranges, self.cloud_ranges]).encode("utf-8"))
+            h.update(np.ascontiguousarray(self.k_values).tobytes())
+            self._digest = h.hexdigest()
+        return self._digest
+
+    @property
+    def version(self) -> str:
+        """Short content hash identifying the reference, recorded with forecasts."""
+        return self.digest()[:12]
+
+
+def _frame_key(reference: pd.DataFrame) -> Tuple:
+    """Hashable snapshot of a reference DataFrame's columns and values.
+
+    Numeric columns are keyed by their bytes, so NaN K values compare equal.
+    """
+    key = []
+    for column in reference.columns:
+        values = reference[column].to_numpy()
+        if values.dtype.kind in "biuf":
+            key.append((column, values.dtype.str, values.tobytes()))
+        else:
+            key.append((column, None, tuple(values.tolist())))
+    return tuple(key)
+
+
+@lru_cache(maxsize=32)
+def _frame_table(key: Tuple) -> KTable:
+    """Compile a reference DataFrame from its _frame_key, once per content."""
+    import pandas as pd
+
+    return KTable.from_frame(
+        pd.DataFrame(
+            {
+                column: values if dtype is None else np.frombuffer(values, dtype)
+                for column, dtype, values in key
+            }
+        )
     )
 
 
+def as_ktable(reference: Union[pd.DataFrame, KTable]) -> KTable:
+    """Return the reference as a compiled KTable.
+
+    DataFrames are compiled once per content: equal frames, including the same
+    frame passed again, share a table, and a frame changed in place is
+    compiled afresh.
+    """
+    if isinstance(reference, KTable):
+        return reference
+    return _frame_table(_frame_key(reference))
+
+
 def k_value_lookup(
-    wind_value: float, cloud_value: float, reference: pd.DataFrame
+    wind_value: float, cloud_value: float, reference: Union[pd.DataFrame, KTable]
 ) -> float:
-    """Lookup the K value based on wind and cloud cover values from the reference DataFrame."""
-    wind_range = find_range(wind_value, "Wind Speed Range (kn)", reference)
-    cloud_range = find_range(cloud_value, "Cloud Cover Range (oktas)", reference)
-    # Lookup the K value from the reference DataFrame
-    k_value = reference[
-        (reference["Wind Speed Range (kn)"] == wind_range)
-        & (reference["Cloud Cover Range (oktas)"] == cloud_range)
-    ]
-
-    if k_value.empty:
+    """Lookup the K value based on wind and cloud cover values from the reference.
+
+    A reference DataFrame is compiled once per content (see as_ktable), but is
+    still snapshotted on every call; pass a KTable when looking up many values.
+    """
+    table = as_ktable(reference)
+    k_value = table.lookup(wind_value, cloud_value)
+
+    if np.isnan(k_value):
         raise ValueError(
-            f"Combination of wind range {wind_range} and cloud range {cloud_range} is not found in the reference DataFrame."
+            f"Combination of wind range {table.wind_range(wind_value)} and cloud range {table.cloud_range(cloud_value)} is not found in the reference DataFrame."
         )
 
-    return k_value["K Value"].values[0]
+    return k_value
@@ -1,6 +1,10 @@
 import pytest
 import pandas as pd
-from src.data_preperation import create_reference_data, create_trial_data
+from src.data_preperation import (
+    create_reference_data,
+    create_trial_data,
+    transform_reference_data,
+)
 
 
 @pytest.fixture
@@ -19,3 +23,9 @@ def trial_df():
 def sample_calculation_data():
     """Fixture to provide sample data for calculation tests."""
     return {"midday_temp": 18, "dew_point": 10, "k_value": 0}
+
+
+@pytest.fixture
+def transformed_reference_df(reference_df):
+    """Fixture to provide the long-format reference DataFrame used for lookups."""
+    return transform_reference_data(reference_df)
@@ -0,0 +1,139 @@
+import base64
+import io
+import zipfile
+import threading
+import pytest
+from dash._callback_context import context_value
+from dash._utils import AttributeDict
+
+import app
+
+
+def trigger(prop_id, value=None):
+    """Set the Dash callback context as if prop_id had fired."""
+    context_value.set(
+        AttributeDict(triggered_inputs=[{"prop_id": prop_id, "value": value}])
+    )
+
+
+@pytest.fixture
+def upload_contents(trial_df):
+    encoded = base64.b64encode(trial_df.to_csv(index=False).encode("utf-8"))
+    return "data:text/csv;base64," + encoded.decode("ascii")
+
+
+def call(trigger_id, value=None, **kwargs):
+    """Invoke handle_forecast as Dash would when trigger_id fires."""
+    trigger(trigger_id, value)
+    args = dict.fromkeys(
+        [
+            "upload_contents",
+            "calc_clicks",
+            "download_clicks",
+            "poll_intervals",
+            "cancel_clicks",
+            "filename",
+            "midday_temp",
+            "dew_point_temp",
+            "wind_speed",
+            "cloud_cover",
+            "result_key",
+            "job_id",
+        ]
+    )
+    args.update(kwargs)
+    return app.handle_forecast(*args.values())
+
+
+def upload(contents):
+    """Submit an upload and return the job ID from the callback outputs."""
+    outputs = call("upload-data.contents", contents, upload_contents=contents)
+    assert outputs[-2] is False  # polling enabled
+    return outputs[-3]
+
+
+def test_upload_then_download(upload_contents):
+    job_id = upload(upload_contents)
+    app.job_queue.wait(job_id, timeout=30)
+
+    outputs = call("job-poll.n_intervals", 1, poll_intervals=1, job_id=job_id)
+    result_key = outputs[9]
+    assert outputs[1] is False  # download enabled
+    assert outputs[3]["data"][0]["type"] == "scatter"
+    assert outputs[-2] is True  # polling stopped
+    assert app.job_queue.status(job_id) is None
+
+    outputs = call("download-btn.n_clicks", 1, download_clicks=1, result_key=result_key)
+    content = base64.b64decode(outputs[2]["content"]).decode("utf-8")
+    assert "Overnight Min Temperature (°C)" in content.splitlines()[0]
+    assert "Wind Bin" not in content.splitlines()[0]
+    assert len(content.splitlines()) == 5
+
+    assert app.toggle_reports(result_key) is False
+    reports = app.download_reports(1, result_key)
+    with zipfile.ZipFile(io.BytesIO(base64.b64decode(reports["content"]))) as archive:
+        assert archive.namelist() == ["report_by_location.csv", "report_by_date.csv"]
+
+
+def test_upload_without_report_columns(trial_df):
+    inputs = trial_df.drop(columns=["Date", "Location"])
+    encoded = base64.b64encode(inputs.to_csv(index=False).encode("utf-8"))
+    job_id = upload("data:text/csv;base64," + encoded.decode("ascii"))
+    app.job_queue.wait(job_id, timeout=30)
+
+    outputs = call("job-poll.n_intervals", 1, poll_intervals=1, job_id=job_id)
+    result_key = outputs[9]
+    assert outputs[1] is False  # download enabled
+    assert app.toggle_reports(result_key) is True
+    assert app.download_reports(1, result_key) is app.dash.no_update
+
+
+def test_upload_missing_columns(trial_df):
+    encoded = base64.b64encode(b"a,b\n1,2\n").decode("ascii")
+    job_id = upload("data:text/csv;base64," + encoded)
+    app.job_queue.wait(job_id, timeout=30)
+
+    outputs = call("job-poll.n_intervals", 1, poll_intervals=1, job_id=job_id)
+    assert outputs[0] == "Uploaded file is missing required columns."
+    assert outputs[1] is True
+
+
+def test_upload_cancel(monkeypatch, upload_contents):
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_parse(contents):
+        started.set()
+        release.wait(10)
+        return app.pd.DataFrame()
+
+    monkeypatch.setattr(app, "parse_uploaded_file", slow_parse)
+    job_id = upload(upload_contents)
+    started.wait(10)
+    call("cancel-btn.n_clicks", 1, cancel_clicks=1, job_id=job_id)
+    release.set()
+    app.job_queue.wait(job_id, timeout=30)
+
+    outputs = call("job-poll.n_intervals", 1, poll_intervals=1, job_id=job_id)
+    assert outputs[0].children == "Upload cancelled."
+
+
+def test_manual_calculation():
+    outputs = call(
+        "calculate-btn.n_clicks",
+        1,
+        calc_clicks=1,
+        midday_temp=18,
+        dew_point_temp=10,
+        wind_speed=15,
+        cloud_cover=3,
+    )
+    assert "10.0 °C" in outputs[0].children
+    assert app.result_store.get(outputs[9]) is not None
+    assert app.toggle_reports(outputs[9]) is True
+
+
+def test_download_of_unknown_result():
+    outputs = call("download-btn.n_clicks", 1, download_clicks=1, result_key="0" * 32)
+    assert outputs[0].color == "warning"
+    assert outputs[2] is None
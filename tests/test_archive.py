@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.archive import convert_to_archive, forecast_archive, open_archive
+from src.calculations import calculate_overnight_temp
+
+
+def test_convert_to_archive(tmp_path, trial_df):
+    input_path = tmp_path / "trial.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    manifest = convert_to_archive(str(input_path), str(tmp_path / "archive"), 3)
+
+    assert manifest["rows"] == 4
+    assert manifest["columns"]["Location"]["categories"] == ["A", "B", "C"]
+    _, arrays = open_archive(str(tmp_path / "archive"))
+    assert isinstance(arrays["Wind (Kn)"], np.memmap)
+    np.testing.assert_array_equal(arrays["Location"], [0, 1, 1, 2])
+    np.testing.assert_array_equal(
+        arrays["Midday Temperature (°C)"], trial_df["Midday Temperature (°C)"]
+    )
+
+
+def test_forecast_archive(tmp_path, trial_df, transformed_reference_df):
+    input_path = tmp_path / "trial.csv"
+    archive_dir = str(tmp_path / "archive")
+    trial_df.to_csv(input_path, index=False)
+    convert_to_archive(str(input_path), archive_dir)
+
+    result = forecast_archive(
+        archive_dir, transformed_reference_df, block_rows=3, save=True
+    )
+
+    expected = calculate_overnight_temp(trial_df.copy(), transformed_reference_df)
+    np.testing.assert_array_equal(result, expected["Overnight Min Temperature (°C)"])
+    manifest, arrays = open_archive(archive_dir, ["Overnight Min Temperature (°C)"])
+    assert "Overnight Min Temperature (°C)" in manifest["columns"]
+    np.testing.assert_array_equal(arrays["Overnight Min Temperature (°C)"], result)
+
+
+def test_convert_to_archive_codes_text_in_chunks(tmp_path, trial_df):
+    trial_df["Location"] = ["B", np.nan, "A", "B"]
+    input_path = tmp_path / "trial.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    manifest = convert_to_archive(str(input_path), str(tmp_path / "archive"), 2)
+
+    assert manifest["columns"]["Location"]["categories"] == ["B", "A"]
+    _, arrays = open_archive(str(tmp_path / "archive"))
+    np.testing.assert_array_equal(arrays["Location"], [0, -1, 1, 0])
+
+
+def test_convert_to_archive_rejects_file_name_collisions(tmp_path, trial_df):
+    trial_df["wind (kn)"] = trial_df["Wind (Kn)"]
+    input_path = tmp_path / "trial.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    with pytest.raises(ValueError, match="wind_kn.npy"):
+        convert_to_archive(str(input_path), str(tmp_path / "archive"))
@@ -0,0 +1,84 @@
+import pandas as pd
+import pytest
+from src.batch import forecast_csv_in_chunks
+from src.calculations import calculate_overnight_temp
+from src.cli import main
+from src.parallel import ParallelForecaster
+
+
+def test_forecast_csv_in_chunks(tmp_path, trial_df, transformed_reference_df):
+    input_path = tmp_path / "trial.csv"
+    output_path = tmp_path / "forecasts.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    stats = forecast_csv_in_chunks(
+        str(input_path), str(output_path), transformed_reference_df, chunksize=3
+    )
+
+    assert stats["rows"] == 4
+    assert stats["chunks"] == 2
+    expected = calculate_overnight_temp(trial_df.copy(), transformed_reference_df)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
+
+    with pytest.raises(ValueError, match="vectorized engine"):
+        forecast_csv_in_chunks(
+            str(input_path),
+            str(output_path),
+            transformed_reference_df,
+            engine="apply",
+            workers=2,
+        )
+
+
+def test_forecast_csv_rejects_bad_chunksize(tmp_path, transformed_reference_df):
+    with pytest.raises(ValueError):
+        forecast_csv_in_chunks(
+            "missing.csv", str(tmp_path / "out.csv"), transformed_reference_df, 0
+        )
+
+
+def test_rejects_non_positive_workers(tmp_path, transformed_reference_df, capsys):
+    with pytest.raises(ValueError, match="Workers must be positive"):
+        forecast_csv_in_chunks(
+            "missing.csv",
+            str(tmp_path / "out.csv"),
+            transformed_reference_df,
+            workers=0,
+        )
+    with pytest.raises(ValueError, match="Workers must be positive"):
+        ParallelForecaster(transformed_reference_df, workers=0)
+    with pytest.raises(SystemExit):
+        main(["in.csv", "out.csv", "--workers", "0"])
+    assert "must be positive" in capsys.readouterr().err
+
+
+def test_cli_main(tmp_path, trial_df, capsys):
+    input_path = tmp_path / "trial.csv"
+    output_path = tmp_path / "forecasts.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    assert main([str(input_path), str(output_path), "--chunksize", "2"]) == 0
+    assert "4 rows" in capsys.readouterr().out
+    assert pd.read_csv(output_path)["Overnight Min Temperature (°C)"].tolist() == [
+        12.0,
+        11.0,
+        9.0,
+        9.0,
+    ]
+
+
+def test_forecast_csv_in_chunks_parallel(tmp_path, trial_df, transformed_reference_df):
+    input_path = tmp_path / "trial.csv"
+    output_path = tmp_path / "forecasts.csv"
+    trial_df.to_csv(input_path, index=False)
+
+    forecast_csv_in_chunks(
+        str(input_path),
+        str(output_path),
+        transformed_reference_df,
+        chunksize=3,
+        workers=2,
+    )
+
+    expected = calculate_overnight_temp(trial_df.copy(), transformed_reference_df)
+    pd.testing.assert_frame_equal(pd.read_csv(output_path), expected)
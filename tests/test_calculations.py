@@ -1,4 +1,14 @@
-from src.calculations import overnight_minimum_temp
+import numpy as np
+import pandas as pd
+import pytest
+from src.calculations import (
+    ENGINES,
+    calculate_overnight_temp,
+    overnight_minimum_temp,
+)
+from src.data_preperation import load_data
+from src.utils import KTable
+from tests.test_utils import scan_overnight_minimum
 
 
 def test_calculate_overnight_temp(sample_calculation_data):
@@ -9,3 +19,130 @@ def test_calculate_overnight_temp(sample_calculation_data):
     expected_result = 10.0
     result = overnight_minimum_temp(midday_temp, dew_point, k_value)
     assert result == expected_result
+
+
+def test_vectorized_matches_trial_forecasts(trial_df, transformed_reference_df):
+    result = calculate_overnight_temp(trial_df, transformed_reference_df)
+    assert result["Overnight Min Temperature (°C)"].tolist() == [12.0, 11.0, 9.0, 9.0]
+    assert (
+        result.attrs["reference_version"]
+        == KTable.from_frame(transformed_reference_df).version
+    )
+
+
+def test_engines_match_original_row_scan(transformed_reference_df):
+    rng = np.random.default_rng(42)
+    n = 1000
+    wind = np.concatenate(
+        [rng.uniform(0, 51.4, n), [0, 12, 12.5, 13, 25, 25.5, 38.5, 51, 51.4]]
+    ).round(rng.integers(0, 3))
+    cloud = np.concatenate(
+        [rng.uniform(0, 8.4, n), [0, 2, 4, 6, 8, 1.5, 3.5, 5.5, 7.5]]
+    ).round(rng.integers(0, 3))
+    trial = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": rng.uniform(-50, 60, len(wind)).round(2),
+            "Midday Dew Point (°C)": rng.uniform(-50, 50, len(wind)).round(2),
+            "Wind (Kn)": wind,
+            "Cloud (oktas)": cloud,
+        }
+    )
+    # Raw value in (-0.5, 0): must round to 0.0, not -0.0
+    trial.loc[len(trial)] = [0.0, 0.0, 20.0, 7.0]
+
+    # Forecast with the original row scan; every engine must reject the rows it
+    # rejects, one at a time, and match it on the rest
+    def scan(row):
+        try:
+            return scan_overnight_minimum(*row, transformed_reference_df)
+        except ValueError:
+            return np.nan
+
+    expected = trial.apply(scan, axis=1)
+    rejected = np.flatnonzero(expected.isna())
+    assert len(rejected)
+    for i in rejected:
+        for engine in ENGINES:
+            with pytest.raises(ValueError):
+                calculate_overnight_temp(
+                    trial.iloc[[i]].copy(), transformed_reference_df, engine=engine
+                )
+
+    trial = trial[expected.notna()].reset_index(drop=True)
+    slow = trial.copy()
+    slow["Overnight Min Temperature (°C)"] = expected.dropna().to_numpy()
+
+    for engine in ENGINES:
+        fast = calculate_overnight_temp(
+            trial.copy(), transformed_reference_df, engine=engine
+        )
+        pd.testing.assert_frame_equal(fast, slow)
+        # assert_frame_equal treats -0.0 and 0.0 as equal; the CSV output does not
+        assert fast.to_csv(index=False) == slow.to_csv(index=False)
+
+
+@pytest.mark.parametrize("wind, cloud", [(12.3, 3), (45, 7), (60, 1), (10, 8.4)])
+def test_vectorized_rejects_what_apply_rejects(transformed_reference_df, wind, cloud):
+    trial = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": [20.0],
+            "Midday Dew Point (°C)": [10.0],
+            "Wind (Kn)": [wind],
+            "Cloud (oktas)": [cloud],
+        }
+    )
+    for engine in ENGINES:
+        with pytest.raises(ValueError):
+            calculate_overnight_temp(
+                trial.copy(), transformed_reference_df, engine=engine
+            )
+
+
+@pytest.mark.parametrize("temp", [np.inf, -np.inf])
+def test_engines_reject_infinite_inputs(transformed_reference_df, temp):
+    trial = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": [temp, 20.0],
+            "Midday Dew Point (°C)": [10.0, 10.0],
+            "Wind (Kn)": [5.0, 5.0],
+            "Cloud (oktas)": [3.0, 3.0],
+        }
+    )
+    for engine in ("vectorized", "fused"):
+        with pytest.raises(ValueError, match="non-finite"):
+            calculate_overnight_temp(
+                trial.copy(), transformed_reference_df, engine=engine
+            )
+    # The row-by-row reference fails converting the rounded value to int
+    with pytest.raises(OverflowError):
+        calculate_overnight_temp(trial.copy(), transformed_reference_df, engine="apply")
+
+
+def test_unknown_engine(trial_df, transformed_reference_df):
+    with pytest.raises(ValueError):
+        calculate_overnight_temp(trial_df, transformed_reference_df, engine="gpu")
+    with pytest.raises(ValueError, match="keep_bins"):
+        calculate_overnight_temp(
+            trial_df, transformed_reference_df, engine="apply", keep_bins=True
+        )
+
+
+def test_compact_mode(tmp_path, trial_df, transformed_reference_df):
+    path = tmp_path / "trial.csv"
+    trial_df.to_csv(path, index=False)
+    compact_df = load_data(str(path), compact=True)
+
+    assert compact_df["Wind (Kn)"].dtype == "float32"
+    assert compact_df["Location"].dtype == "category"
+    assert compact_df["Date"].dtype == "int8"
+
+    result = calculate_overnight_temp(
+        compact_df, transformed_reference_df, compact=True
+    )
+    assert result["Overnight Min Temperature (°C)"].dtype == "int16"
+    assert result["Overnight Min Temperature (°C)"].tolist() == [12, 11, 9, 9]
+
+    with pytest.raises(ValueError):
+        calculate_overnight_temp(
+            compact_df, transformed_reference_df, engine="apply", compact=True
+        )
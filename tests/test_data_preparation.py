@@ -1,4 +1,7 @@
+import numpy as np
 import pandas as pd
+import pytest
+from src.data_preperation import load_compact_csv, load_data, save_data
 
 
 def test_create_reference_data(reference_df):
@@ -24,3 +27,44 @@ def test_create_trial_data(trial_df):
     }
     expected_df = pd.DataFrame(expected_data)
     pd.testing.assert_frame_equal(trial_df, expected_df)
+
+
+@pytest.mark.parametrize("extension", [".csv", ".parquet", ".feather"])
+def test_load_and_save_data_round_trip(tmp_path, trial_df, extension):
+    pytest.importorskip("pyarrow")
+    path = str(tmp_path / f"trial{extension}")
+    save_data(trial_df, path)
+
+    pd.testing.assert_frame_equal(load_data(path), trial_df)
+    projected = load_data(path, columns=["Wind (Kn)", "Cloud (oktas)"])
+    assert list(projected.columns) == ["Wind (Kn)", "Cloud (oktas)"]
+
+
+def test_save_data_compacts_forecasts(tmp_path, trial_df):
+    pytest.importorskip("pyarrow")
+    trial_df["Overnight Min Temperature (°C)"] = [12.0, 11.0, 9.0, -9.0]
+    path = str(tmp_path / "forecasts.parquet")
+    save_data(trial_df, path)
+
+    loaded = load_data(path)
+    assert loaded["Overnight Min Temperature (°C)"].dtype == "int8"
+    assert loaded["Overnight Min Temperature (°C)"].tolist() == [12, 11, 9, -9]
+
+
+def test_load_data_rejects_unknown_extension():
+    with pytest.raises(ValueError):
+        load_data("trial.xlsx")
+
+
+def test_load_compact_csv_across_chunks(tmp_path, trial_df):
+    path = str(tmp_path / "trial.csv")
+    save_data(trial_df, path)
+
+    compact_df = load_compact_csv(path, chunksize=2)
+
+    assert compact_df["Location"].dtype == "category"
+    assert compact_df["Location"].tolist() == ["A", "B", "B", "C"]
+    assert compact_df["Midday Temperature (°C)"].dtype == "float32"
+    np.testing.assert_allclose(
+        compact_df["Midday Temperature (°C)"], trial_df["Midday Temperature (°C)"]
+    )
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from src.calculations import forecast_arrays
+from src.ensemble import ensemble_forecast, member_forecasts
+from src.utils import KTable
+
+
+def random_members(n_stations=40, n_members=25):
+    rng = np.random.default_rng(5)
+    temp = rng.uniform(-5, 30, (n_stations, 1)) + rng.normal(
+        0, 2, (n_stations, n_members)
+    )
+    dew = rng.uniform(-10, 15, (n_stations, 1))
+    wind = rng.integers(0, 38, (n_stations, n_members)).astype(float)
+    cloud = rng.integers(0, 9, (n_stations, n_members)).astype(float)
+    return temp, dew, wind, cloud
+
+
+def test_ensemble_matches_per_member_forecasts(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    temp, dew, wind, cloud = random_members()
+    summary = ensemble_forecast(temp, dew, wind, cloud, table, block_elements=100)
+
+    shape = temp.shape
+    expected = np.column_stack(
+        [
+            forecast_arrays(
+                temp[:, m],
+                np.broadcast_to(dew, shape)[:, m],
+                wind[:, m],
+                cloud[:, m],
+                table,
+            )
+            for m in range(shape[1])
+        ]
+    )
+    assert (summary["Valid Members"] == shape[1]).all()
+    np.testing.assert_allclose(summary["Mean (°C)"], expected.mean(axis=1))
+    for q in (10, 50, 90):
+        np.testing.assert_allclose(
+            summary[f"P{q} (°C)"], np.percentile(expected, q, axis=1)
+        )
+    np.testing.assert_allclose(
+        summary["Frost Probability"], (expected < 0).mean(axis=1)
+    )
+
+
+def test_ensemble_block_size_does_not_change_results(transformed_reference_df):
+    members = random_members()
+    whole = ensemble_forecast(*members, transformed_reference_df)
+    blocked = ensemble_forecast(*members, transformed_reference_df, block_elements=1)
+    assert whole.equals(blocked)
+
+
+def test_unforecastable_members_are_left_out(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    # 12.4 kn falls between ranges; 45 kn with 7 oktas has no K value
+    wind = np.array([[5.0, 12.4, 45.0, 5.0], [12.4, 12.4, 12.4, 12.4]])
+    cloud = np.array([[2.0, 2.0, 7.0, np.nan], [2.0, 2.0, 2.0, 2.0]])
+    summary = ensemble_forecast(20.0, 10.0, wind, cloud, table, index=["A", "B"])
+
+    assert summary["Valid Members"].tolist() == [1, 0]
+    single = forecast_arrays([20.0], [10.0], [5.0], [2.0], table)[0]
+    assert summary.loc["A", "P50 (°C)"] == single
+    assert summary.loc["B"].drop("Valid Members").isna().all()
+    assert np.isnan(member_forecasts(20.0, 10.0, wind, cloud, table)[0, 1:]).all()
+
+
+def test_ensemble_rejects_bad_shapes(transformed_reference_df):
+    with pytest.raises(ValueError):
+        ensemble_forecast(
+            np.zeros(3), np.zeros(3), np.zeros(3), np.zeros(3), transformed_reference_df
+        )
+    with pytest.raises(ValueError):
+        ensemble_forecast(
+            np.zeros((2, 3)), 0.0, np.zeros((3, 2)), 0.0, transformed_reference_df
+        )
+    with pytest.raises(ValueError):
+        ensemble_forecast(
+            np.zeros((2, 3)), 0.0, 0.0, 0.0, transformed_reference_df, percentiles=[150]
+        )
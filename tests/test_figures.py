@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+from src import figures
+from src.calculations import calculate_overnight_temp
+
+
+def make_forecast_df(n_rows):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame(
+        {
+            "Midday Temperature (°C)": rng.uniform(-10, 35, n_rows),
+            "Midday Dew Point (°C)": rng.uniform(-15, 25, n_rows),
+            "Wind (Kn)": rng.integers(0, 38, n_rows).astype(float),
+            "Cloud (oktas)": rng.integers(0, 9, n_rows).astype(float),
+            "Overnight Min Temperature (°C)": rng.integers(-10, 20, n_rows),
+        }
+    )
+
+
+def test_correlation_matrix_matches_pandas():
+    df = make_forecast_df(5000)
+    df["Midday Temperature (°C)"] += 1000  # large offset
+    result = figures.correlation_matrix(df, block_rows=777)
+    pd.testing.assert_frame_equal(result, df.corr(), atol=1e-9)
+
+    compact = df.astype("float32")
+    result = figures.correlation_matrix(compact, block_rows=777)
+    pd.testing.assert_frame_equal(result, compact.astype("float64").corr(), atol=1e-9)
+
+
+def test_scatter_figure_tiers(monkeypatch):
+    monkeypatch.setattr(figures, "WEBGL_THRESHOLD", 100)
+    monkeypatch.setattr(figures, "MAX_SCATTER_POINTS", 200)
+    monkeypatch.setattr(figures, "DENSITY_THRESHOLD", 1000)
+    x, y = "Midday Temperature (°C)", "Overnight Min Temperature (°C)"
+
+    small = figures.scatter_figure(make_forecast_df(50), x, y, "t")
+    assert small.data[0].type == "scatter"
+
+    webgl = figures.scatter_figure(make_forecast_df(500), x, y, "t")
+    assert webgl.data[0].type == "scattergl"
+    assert len(webgl.data[0].x) == 200
+
+    density = figures.scatter_figure(make_forecast_df(5000), x, y, "t")
+    assert density.data[0].type == "heatmap"
+    assert np.nansum(density.data[0].z) == 5000
+
+
+def test_build_forecast_figures(trial_df, transformed_reference_df):
+    df = calculate_overnight_temp(trial_df, transformed_reference_df)
+    midday, dew, corr = figures.build_forecast_figures(df)
+    assert midday.data[0].type == "scatter"
+    assert corr.data[0].type == "heatmap"
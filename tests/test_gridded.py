@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from src.calculations import forecast_arrays
+from src.gridded import forecast_grid, grid_tiles
+from src.utils import KTable
+
+
+def random_grid(shape):
+    rng = np.random.default_rng(11)
+    return (
+        rng.uniform(-10, 30, shape),
+        rng.uniform(-15, 20, shape),
+        rng.integers(0, 38, shape).astype(float),
+        rng.integers(0, 9, shape).astype(float),
+    )
+
+
+@pytest.mark.parametrize("shape", [(6, 7), (4, 6, 7)])
+@pytest.mark.parametrize("workers", [1, 3])
+def test_grid_matches_flat_forecasts(transformed_reference_df, shape, workers):
+    table = KTable.from_frame(transformed_reference_df)
+    fields = random_grid(shape)
+    result = forecast_grid(*fields, table, tile_elements=10, workers=workers)
+
+    expected = forecast_arrays(*(field.ravel() for field in fields), table)
+    assert result.shape == shape
+    np.testing.assert_array_equal(result.ravel(), expected)
+
+
+def test_grid_propagates_nan(transformed_reference_df):
+    temp, dew, wind, cloud = random_grid((3, 4))
+    wind[0, 0], cloud[0, 0] = 45.0, 7.0  # no K value for 39-51 kn, 6-8 oktas
+    wind[1, 1] = 12.4  # between ranges
+    temp[2, 2] = np.nan  # masked input
+    result = forecast_grid(temp, dew, wind, cloud, transformed_reference_df)
+
+    nan = np.zeros((3, 4), dtype=bool)
+    nan[0, 0] = nan[1, 1] = nan[2, 2] = True
+    np.testing.assert_array_equal(np.isnan(result), nan)
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_grid_propagates_nan_in_compiled_kernel(transformed_reference_df, dtype):
+    pytest.importorskip("numba")
+    from src import kernels
+
+    temp, dew, wind, cloud = (field.astype(dtype) for field in random_grid((4, 5)))
+    wind[1, 2], cloud[1, 2] = 45.0, 7.0  # no K value for 39-51 kn, 6-8 oktas
+    wind[3, 0], cloud[3, 0] = 39.0, 8.0
+    result = forecast_grid(
+        temp, dew, wind, cloud, transformed_reference_df, tile_elements=7, workers=2
+    )
+
+    assert kernels._kernels is not None  # the compiled loop ran
+    nan = np.zeros((4, 5), dtype=bool)
+    nan[1, 2] = nan[3, 0] = True
+    np.testing.assert_array_equal(np.isnan(result), nan)
+
+
+def test_grid_keeps_float32(transformed_reference_df):
+    fields = [field.astype(np.float32) for field in random_grid((2, 5, 5))]
+    assert forecast_grid(*fields, transformed_reference_df).dtype == np.float32
+
+
+def test_grid_tiles_cover_grid_once():
+    shape = (3, 5, 7)
+    for tile_elements in (1, 8, 35, 36, 1000):
+        hits = np.zeros(shape, dtype=int)
+        for tile in grid_tiles(shape, tile_elements):
+            hits[tile] += 1
+            assert hits[tile].size <= max(tile_elements, 1)
+        assert (hits == 1).all()
+
+
+def test_grid_rejects_bad_shapes(transformed_reference_df):
+    with pytest.raises(ValueError):
+        forecast_grid(
+            np.zeros((2, 3)),
+            np.zeros((2, 3)),
+            np.zeros((3, 2)),
+            np.zeros((2, 3)),
+            transformed_reference_df,
+        )
+    with pytest.raises(ValueError):
+        forecast_grid(*[np.zeros(4)] * 4, transformed_reference_df)
@@ -0,0 +1,53 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CORE_MODULES = [
+    "src.calculations",
+    "src.gridded",
+    "src.kernels",
+    "src.reference_cache",
+    "src.scalar",
+    "src.utils",
+    "src.cli",
+]
+
+
+def run_python(code):
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=REPO_ROOT,
+    ).stdout.strip()
+
+
+@pytest.mark.parametrize("module", CORE_MODULES)
+def test_core_modules_import_without_pandas(module):
+    loaded = run_python(
+        f"import sys, {module}; "
+        "print([m for m in ('pandas', 'numba', 'plotly', 'dash', 'pydantic') "
+        "if m in sys.modules])"
+    )
+    assert loaded == "[]"
+
+
+def test_forecast_from_artifact_without_pandas():
+    output = run_python(
+        "import sys; sys.modules['pandas'] = None; "
+        "from src.scalar import forecast_one; "
+        "print(forecast_one(20, 10, 5, 2, 'data/processed/reference.ktable'))"
+    )
+    assert float(output) == 8.0
+
+
+def test_data_preparation_import_leaves_logging_alone():
+    handlers = run_python(
+        "import logging, src.data_preperation; print(len(logging.getLogger().handlers))"
+    )
+    assert handlers == "0"
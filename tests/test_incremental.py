@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import incremental
+from src.calculations import OUTPUT_COLUMN, calculate_overnight_temp
+from src.cli import main
+from src.data_preperation import compact_dtypes
+from src.incremental import ForecastStore
+from src.utils import KTable
+
+
+def test_update_recomputes_only_new_and_changed_rows(
+    tmp_path, trial_df, transformed_reference_df
+):
+    store = ForecastStore(str(tmp_path / "store"))
+    expected = calculate_overnight_temp(trial_df.copy(), transformed_reference_df)
+
+    first = trial_df.iloc[:3].copy()
+    assert store.update(first, transformed_reference_df) == {
+        "rows": 3,
+        "reused": 0,
+        "recomputed": 3,
+        "stored": 3,
+    }
+
+    # Day two: one correction, one new row and two unchanged rows
+    second = trial_df.copy()
+    second.loc[1, "Wind (Kn)"] = 7.0
+    stats = store.update(second, transformed_reference_df)
+    assert stats == {"rows": 4, "reused": 2, "recomputed": 2, "stored": 4}
+
+    corrected = trial_df.copy()
+    corrected.loc[1, "Wind (Kn)"] = 7.0
+    pd.testing.assert_series_equal(
+        second[OUTPUT_COLUMN],
+        calculate_overnight_temp(corrected, transformed_reference_df)[OUTPUT_COLUMN],
+    )
+
+    # Rows left out of the input stay stored
+    assert store.update(trial_df.iloc[[0]].copy(), transformed_reference_df) == {
+        "rows": 1,
+        "reused": 1,
+        "recomputed": 0,
+        "stored": 4,
+    }
+    assert np.isin(
+        expected[OUTPUT_COLUMN].iloc[[0, 2, 3]], store.load()[OUTPUT_COLUMN]
+    ).all()
+
+
+def test_update_recomputes_all_after_reference_change(
+    tmp_path, trial_df, transformed_reference_df
+):
+    store = ForecastStore(str(tmp_path / "store"))
+    store.update(trial_df.copy(), transformed_reference_df)
+
+    table = KTable.from_frame(transformed_reference_df)
+    shifted = KTable(table.wind_ranges, table.cloud_ranges, table.k_values + 1)
+    forecasts = trial_df.copy()
+    assert store.update(forecasts, shifted)["recomputed"] == 4
+    assert store.update(trial_df.copy(), shifted)["reused"] == 4
+
+
+def test_update_rejects_partial_input_after_reference_change(
+    tmp_path, trial_df, transformed_reference_df
+):
+    store = ForecastStore(str(tmp_path / "store"))
+    store.update(trial_df.copy(), transformed_reference_df)
+
+    table = KTable.from_frame(transformed_reference_df)
+    shifted = KTable(table.wind_ranges, table.cloud_ranges, table.k_values + 1)
+    new_row = trial_df.iloc[[0]].copy()
+    new_row["Location"] = "New"
+    with pytest.raises(ValueError, match="4 stored rows are missing"):
+        store.update(new_row, shifted)
+    assert len(store.load()) == 4
+
+    everything = pd.concat([trial_df, new_row], ignore_index=True)
+    assert store.update(everything, shifted)["stored"] == 5
+
+
+def test_update_rejects_duplicate_keys(tmp_path, trial_df, transformed_reference_df):
+    duplicated = pd.concat([trial_df, trial_df.iloc[[0]]], ignore_index=True)
+    with pytest.raises(ValueError, match="duplicate"):
+        ForecastStore(str(tmp_path)).update(duplicated, transformed_reference_df)
+
+
+def test_cli_store(tmp_path, trial_df, capsys):
+    input_path = tmp_path / "trial.csv"
+    output_path = tmp_path / "forecasts.csv"
+    trial_df.to_csv(input_path, index=False)
+    args = [str(input_path), str(output_path), "--store", str(tmp_path / "store")]
+
+    assert main(args) == 0
+    assert main(args) == 0
+    assert "4 rows: 4 reused, 0 recomputed" in capsys.readouterr().out
+    assert pd.read_csv(output_path)[OUTPUT_COLUMN].tolist() == [12.0, 11.0, 9.0, 9.0]
+
+
+def test_update_reuses_rows_across_compact_and_full_loads(
+    tmp_path, trial_df, transformed_reference_df
+):
+    store = ForecastStore(str(tmp_path / "store"))
+    full = trial_df.copy()
+    full["Midday Dew Point (°C)"] += 0.1  # Not exact in float32
+    store.update(full.copy(), transformed_reference_df)
+
+    compact = compact_dtypes(full.copy())
+    assert store.update(compact, transformed_reference_df)["reused"] == 4
+    assert store.update(full.copy(), transformed_reference_df)["reused"] == 4
+
+
+def test_update_appends_parts_and_merges_them(
+    tmp_path, trial_df, transformed_reference_df, monkeypatch
+):
+    monkeypatch.setattr(incremental, "MAX_PARTS", 3)
+    store_dir = tmp_path / "store"
+    store = ForecastStore(str(store_dir))
+    store.update(trial_df.copy(), transformed_reference_df)
+
+    for wind in (7.0, 8.0):
+        changed = trial_df.iloc[[1]].copy()
+        changed["Wind (Kn)"] = wind
+        assert store.update(changed, transformed_reference_df)["stored"] == 4
+    assert len(list(store_dir.glob("*.parquet"))) == 3
+    stored = store.load()
+    assert len(stored) == 4
+    expected = trial_df.copy()
+    expected.loc[1, "Wind (Kn)"] = 8.0
+    expected = calculate_overnight_temp(expected, transformed_reference_df)
+    assert stored[OUTPUT_COLUMN].sort_values().tolist() == sorted(
+        expected[OUTPUT_COLUMN]
+    )
+
+    new_row = trial_df.iloc[[0]].copy()
+    new_row["Location"] = "New"
+    assert store.update(new_row, transformed_reference_df)["stored"] == 5
+    assert len(list(store_dir.glob("*.parquet"))) == 1
+    assert len(store.load()) == 5
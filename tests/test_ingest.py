@@ -0,0 +1,37 @@
+import base64
+import pandas as pd
+import pytest
+from src.ingest import decode_upload, iter_upload_chunks, parse_upload
+
+
+def to_data_url(data: bytes) -> str:
+    return "data:text/csv;base64," + base64.b64encode(data).decode("ascii")
+
+
+def test_decode_upload_in_chunks():
+    data = bytes(range(256)) * 10
+    with decode_upload(to_data_url(data), chunk_chars=8) as buffer:
+        assert buffer.read() == data
+
+
+def test_parse_upload(trial_df):
+    contents = to_data_url(trial_df.to_csv(index=False).encode("utf-8"))
+
+    pd.testing.assert_frame_equal(parse_upload(contents), trial_df)
+    pd.testing.assert_frame_equal(parse_upload(contents, chunksize=3), trial_df)
+    chunks = list(iter_upload_chunks(contents, chunksize=3))
+    assert [len(chunk) for chunk in chunks] == [3, 1]
+
+
+def test_parse_upload_rejects_missing_columns():
+    contents = to_data_url(b"Date,Location\n" + b"1,A\n" * 10)
+    with pytest.raises(ValueError, match="missing required columns"):
+        parse_upload(contents)
+
+
+@pytest.mark.parametrize(
+    "contents", ["not a data url", "data:text/csv,plain", "data:text/csv;base64,@@@"]
+)
+def test_parse_upload_rejects_malformed_contents(contents):
+    with pytest.raises(ValueError):
+        parse_upload(contents)
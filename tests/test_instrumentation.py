@@ -0,0 +1,44 @@
+import pytest
+from src import instrumentation
+from src.calculations import calculate_overnight_temp
+
+
+@pytest.fixture
+def metrics_enabled():
+    instrumentation.reset()
+    instrumentation.configure(enabled=True)
+    yield
+    instrumentation.configure(enabled=False)
+    instrumentation.reset()
+
+
+def test_timed_is_noop_when_disabled():
+    instrumentation.configure(enabled=False)
+    instrumentation.reset()
+    with instrumentation.timed("calculate", rows=10):
+        pass
+    assert instrumentation.snapshot() == {}
+
+
+def test_timed_records_stages(metrics_enabled, trial_df, transformed_reference_df):
+    calculate_overnight_temp(trial_df, transformed_reference_df)
+    with pytest.raises(ValueError):
+        with instrumentation.timed("parse_upload") as timer:
+            timer.rows = 3
+            raise ValueError("bad upload")
+
+    stages = instrumentation.snapshot()
+    assert stages["calculate"]["calls"] == 1
+    assert stages["calculate"]["rows"] == 4
+    assert stages["parse_upload"]["errors"] == 1
+    assert stages["parse_upload"]["rows"] == 3
+
+
+def test_render_prometheus(metrics_enabled):
+    with instrumentation.timed("build_figures", rows=5):
+        pass
+
+    text = instrumentation.render_prometheus()
+    assert "# TYPE forecast_stage_seconds_total counter" in text
+    assert 'forecast_stage_rows_total{stage="build_figures"} 5' in text
+    assert 'forecast_stage_calls_total{stage="build_figures"} 1' in text
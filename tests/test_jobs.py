@@ -0,0 +1,51 @@
+import threading
+import pytest
+from src.jobs import CANCELLED, DONE, FAILED, JobQueue, JobQueueFull
+
+
+@pytest.fixture
+def queue():
+    queue = JobQueue(max_workers=1, max_pending=2)
+    yield queue
+    queue.shutdown()
+
+
+def test_job_runs_and_reports_result(queue):
+    def job(context, value):
+        context.progress(0.5, "Halfway")
+        return {"value": value * 2}
+
+    job_id = queue.submit(job, 21)
+    record = queue.wait(job_id, timeout=10)
+    assert record["state"] == DONE
+    assert record["progress"] == 1.0
+    assert record["result"] == {"value": 42}
+
+
+def test_job_failure_is_recorded(queue):
+    def job(context):
+        raise ValueError("bad input")
+
+    record = queue.wait(queue.submit(job), timeout=10)
+    assert record["state"] == FAILED
+    assert record["message"] == "bad input"
+
+
+def test_pending_limit_and_cancellation(queue):
+    release = threading.Event()
+
+    def blocking_job(context):
+        release.wait(10)
+        context.progress(0.9)
+
+    running = queue.submit(blocking_job)
+    queued = queue.submit(blocking_job)
+    with pytest.raises(JobQueueFull):
+        queue.submit(blocking_job)
+
+    assert queue.cancel(queued)
+    assert queue.status(queued)["state"] == CANCELLED
+    assert queue.cancel(running)
+    release.set()
+    assert queue.wait(running, timeout=10)["state"] == CANCELLED
+    assert not queue.cancel(running)
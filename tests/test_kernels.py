@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.calculations import INPUT_COLUMNS, calculate_overnight_temp, forecast_arrays
+from src.kernels import _forecast_loop, _forecast_numpy, forecast_fused
+from src.utils import KTable
+
+
+def random_inputs(n=500, dtype=np.float64):
+    rng = np.random.default_rng(7)
+    inputs = [
+        rng.uniform(-10, 30, n).round(1),
+        rng.uniform(-15, 20, n).round(1),
+        rng.uniform(0, 55, n).round(rng.integers(0, 3)),
+        rng.uniform(0, 9, n).round(1),
+    ]
+    # Range gaps, the cell without a K value, rounding edges and masked inputs
+    inputs[2][:6] = [12.4, 12.5, 45.0, 25.5, 38.49, np.nan]
+    inputs[3][:6] = [1.0, 1.0, 7.0, 8.0, 2.0, 3.0]
+    inputs[0][6] = np.nan
+    # Raw formula value in (-0.5, 0), which must round to 0.0 rather than -0.0
+    inputs[0][7], inputs[1][7], inputs[2][7], inputs[3][7] = 0.0, 0.0, 20.0, 7.0
+    return [values.astype(dtype) for values in inputs]
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+def test_kernel_loop_matches_numpy_path(transformed_reference_df, dtype):
+    table = KTable.from_frame(transformed_reference_df)
+    inputs = random_inputs(dtype=dtype)
+    out = np.empty(len(inputs[0]))
+    _forecast_loop(
+        *inputs,
+        table.wind_bins.lower,
+        table.wind_bins.upper,
+        table.cloud_bins.lower,
+        table.cloud_bins.upper,
+        table.k_values,
+        out,
+    )
+    expected = _forecast_numpy(*inputs, table)
+    np.testing.assert_array_equal(out, expected)
+    np.testing.assert_array_equal(np.signbit(out), np.signbit(expected))
+    assert out[7] == 0.0 and not np.signbit(out[7])
+    assert np.isnan(out[[0, 2, 4, 5, 6]]).all()
+
+
+def test_forecast_fused_matches_forecast_arrays(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    inputs = random_inputs()
+    result = forecast_fused(*inputs, table)
+
+    valid = ~np.isnan(result)
+    np.testing.assert_array_equal(
+        result[valid], forecast_arrays(*(x[valid] for x in inputs), table)
+    )
+
+
+def test_fused_engine_matches_vectorized(transformed_reference_df):
+    inputs = random_inputs()
+    valid = ~np.isnan(
+        forecast_fused(*inputs, KTable.from_frame(transformed_reference_df))
+    )
+    trial = pd.DataFrame(
+        {column: values[valid] for column, values in zip(INPUT_COLUMNS, inputs)}
+    )
+
+    vectorized = calculate_overnight_temp(trial.copy(), transformed_reference_df)
+    fused = calculate_overnight_temp(
+        trial.copy(), transformed_reference_df, engine="fused"
+    )
+    pd.testing.assert_frame_equal(fused, vectorized)
+    assert fused.to_csv(index=False) == vectorized.to_csv(index=False)
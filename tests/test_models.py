@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pydantic import ValidationError
+from src.models import BATCH_COLUMNS, WeatherInput, validate_weather_batch
+
+
+def test_validate_weather_batch_matches_weather_input():
+    rng = np.random.default_rng(0)
+    n = 500
+    df = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": rng.uniform(-70, 80, n).round(1),
+            "Midday Dew Point (°C)": rng.uniform(-70, 70, n).round(1),
+            "Wind (Kn)": rng.uniform(-5, 60, n).round(1),
+            "Cloud (oktas)": rng.integers(-2, 11, n).astype(float),
+        }
+    )
+    df.iloc[::50, 0] = -50.0  # Exclusive bound
+    df.iloc[::60, 3] = 8.0  # Inclusive bound
+
+    _, report = validate_weather_batch(df)
+
+    expected = []
+    for index, row in enumerate(df.itertuples(index=False)):
+        try:
+            WeatherInput(**dict(zip(BATCH_COLUMNS, row)))
+        except ValidationError:
+            expected.append(index)
+    assert sorted(report["row"].unique()) == expected
+
+
+def test_validate_weather_batch_modes():
+    df = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": [20.0, 70.0, 15.0],
+            "Midday Dew Point (°C)": [10.0, 5.0, 5.0],
+            "Wind (Kn)": ["5", "3", "calm"],
+            "Cloud (oktas)": [3.5, 9.0, 2.0],
+        },
+        index=[10, 11, 12],
+    )
+
+    unchanged, report = validate_weather_batch(df)
+    assert unchanged is df
+    assert report.to_dict("records") == [
+        {"row": 11, "field": "Midday Temperature (°C)", "reason": "must be < 60"},
+        {"row": 11, "field": "Cloud (oktas)", "reason": "must be <= 8"},
+        {"row": 12, "field": "Wind (Kn)", "reason": "not a number"},
+    ]
+
+    dropped, _ = validate_weather_batch(df, on_error="drop")
+    assert list(dropped.index) == [10]
+    flagged, _ = validate_weather_batch(df, on_error="flag")
+    assert list(flagged["Valid Input"]) == [True, False, False]
+    with pytest.raises(ValueError, match="2 rows failed validation, first at row 11"):
+        validate_weather_batch(df, on_error="raise")
+
+
+def test_validate_weather_batch_rejects_bad_arguments(trial_df):
+    with pytest.raises(ValueError, match="Unknown on_error"):
+        validate_weather_batch(trial_df, on_error="ignore")
+    with pytest.raises(ValueError, match="Missing required columns"):
+        validate_weather_batch(trial_df.drop(columns="Wind (Kn)"))
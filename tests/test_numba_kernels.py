@@ -0,0 +1,63 @@
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from src.calculations import forecast_arrays
+from src.kernels import _compiled_kernels, _forecast_numpy, forecast_fused
+from src.utils import KTable
+from tests.test_kernels import random_inputs
+
+pytest.importorskip("numba")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("dtype", [np.float64, np.float32])
+@pytest.mark.parametrize("threads", [1, 2])
+def test_compiled_kernels_match_forecast_arrays(
+    transformed_reference_df, dtype, threads
+):
+    table = KTable.from_frame(transformed_reference_df)
+    inputs = random_inputs(n=5000, dtype=dtype)
+    result = forecast_fused(*inputs, table, threads=threads)
+
+    expected = _forecast_numpy(*inputs, table)
+    np.testing.assert_array_equal(result, expected)
+    np.testing.assert_array_equal(np.signbit(result), np.signbit(expected))
+    valid = ~np.isnan(result)
+    assert np.isnan(result[[0, 2, 4, 5, 6]]).all()
+    np.testing.assert_array_equal(
+        result[valid], forecast_arrays(*(x[valid] for x in inputs), table)
+    )
+
+
+def test_compiled_kernels_are_jitted():
+    numba, serial_loop, parallel_loop = _compiled_kernels()
+    assert isinstance(serial_loop, numba.core.registry.CPUDispatcher)
+    assert isinstance(parallel_loop, numba.core.registry.CPUDispatcher)
+    assert _compiled_kernels()[1] is serial_loop
+
+
+def test_parallel_pool_after_multithreaded_kernel_exits():
+    # Forking after numba's thread pool started used to hang at exit
+    script = """
+import pandas as pd
+from src.data_preperation import (
+    create_reference_data,
+    create_trial_data,
+    transform_reference_data,
+)
+from src.kernels import forecast_fused
+from src.parallel import calculate_overnight_temp_parallel
+from src.utils import KTable
+
+table = KTable.from_frame(transform_reference_data(create_reference_data()))
+trial = pd.concat([create_trial_data()] * 50, ignore_index=True)
+forecast_fused(20.0, 10.0, [5.0] * 1000, 3.0, table, threads=0)
+calculate_overnight_temp_parallel(trial, table, workers=2)
+"""
+    subprocess.run(
+        [sys.executable, "-c", script], check=True, timeout=120, cwd=REPO_ROOT
+    )
@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src import kernels
+from src.calculations import calculate_overnight_temp
+from src.parallel import (
+    _pool_context,
+    calculate_overnight_temp_parallel,
+    shard_indices,
+)
+
+
+@pytest.fixture
+def large_trial_df(trial_df):
+    return pd.concat([trial_df] * 50, ignore_index=True)
+
+
+@pytest.mark.parametrize("partition_by", [None, ["Location"], ["Date", "Location"]])
+def test_parallel_matches_serial(
+    large_trial_df, transformed_reference_df, partition_by
+):
+    expected = calculate_overnight_temp(large_trial_df.copy(), transformed_reference_df)
+    result = calculate_overnight_temp_parallel(
+        large_trial_df, transformed_reference_df, workers=2, partition_by=partition_by
+    )
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_shard_indices_keep_partitions_together(large_trial_df):
+    shards = shard_indices(large_trial_df, 2, ["Location"])
+
+    assert sorted(np.concatenate(shards).tolist()) == list(range(len(large_trial_df)))
+    locations = [set(large_trial_df["Location"].iloc[shard]) for shard in shards]
+    assert sum(len(found) for found in locations) == 3
+
+
+def test_parallel_propagates_errors(transformed_reference_df):
+    trial = pd.DataFrame(
+        {
+            "Midday Temperature (°C)": [20.0, 20.0],
+            "Midday Dew Point (°C)": [10.0, 10.0],
+            "Wind (Kn)": [5.0, 45.0],
+            "Cloud (oktas)": [1.0, 7.0],
+        }
+    )
+    with pytest.raises(ValueError):
+        calculate_overnight_temp_parallel(trial, transformed_reference_df, workers=2)
+
+
+def test_parallel_does_not_fork_after_numba_threads(
+    monkeypatch, large_trial_df, transformed_reference_df
+):
+    monkeypatch.setattr(kernels, "_thread_pool_started", False)
+    assert _pool_context() is None
+    monkeypatch.setattr(kernels, "_thread_pool_started", True)
+    assert _pool_context().get_start_method() in ("forkserver", "spawn")
+
+    expected = calculate_overnight_temp(large_trial_df.copy(), transformed_reference_df)
+    result = calculate_overnight_temp_parallel(
+        large_trial_df, transformed_reference_df, workers=2
+    )
+    pd.testing.assert_frame_equal(result, expected)
@@ -0,0 +1,48 @@
+import os
+import numpy as np
+from src.data_preperation import build_reference_artifact
+from src.reference_cache import ReferenceCache
+from src.utils import KTable
+
+
+def test_reference_cache_hits_and_invalidates(tmp_path, transformed_reference_df):
+    path = tmp_path / "reference.csv"
+    transformed_reference_df.to_csv(path, index=False)
+    cache = ReferenceCache()
+
+    first = cache.get(str(path))
+    assert cache.get(str(path)) is first
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+    # Touching the file without changing it keeps the compiled table
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.get(str(path)) is first
+    assert cache.stats()["misses"] == 1
+
+    changed = transformed_reference_df.copy()
+    changed.loc[0, "K Value"] = -5.0
+    changed.to_csv(path, index=False)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    table = cache.get(str(path))
+    assert table is not first
+    assert table.lookup(5, 1) == -5.0
+    assert cache.stats()["misses"] == 2
+
+
+def test_reference_cache_clear(tmp_path, reference_df):
+    path = tmp_path / "reference.csv"
+    reference_df.to_csv(path, index=False)
+    cache = ReferenceCache()
+
+    assert np.isnan(cache.get(str(path)).lookup(45, 7))
+    cache.clear()
+    assert cache.stats() == {"hits": 0, "misses": 0, "entries": 0}
+
+
+def test_reference_cache_loads_artifacts(tmp_path, transformed_reference_df):
+    path = str(tmp_path / "reference.ktable")
+    build_reference_artifact(transformed_reference_df, path)
+
+    table = ReferenceCache().get(path)
+    assert table.version == KTable.from_frame(transformed_reference_df).version
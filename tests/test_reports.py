@@ -0,0 +1,77 @@
+import io
+import zipfile
+import numpy as np
+import pandas as pd
+from src.calculations import OUTPUT_COLUMN, calculate_overnight_temp
+from src.reports import forecast_reports, reports_zip
+
+
+def random_forecasts(reference, n=2000):
+    rng = np.random.default_rng(3)
+    trial_data = pd.DataFrame(
+        {
+            "Date": rng.integers(1, 30, n),
+            "Location": rng.choice(list("ABCDE"), n),
+            "Midday Temperature (°C)": rng.uniform(-10, 30, n).round(1),
+            "Midday Dew Point (°C)": rng.uniform(-15, 20, n).round(1),
+            "Wind (Kn)": rng.integers(0, 38, n).astype(float),
+            "Cloud (oktas)": rng.integers(0, 9, n).astype(float),
+        }
+    )
+    return calculate_overnight_temp(trial_data, reference, keep_bins=True)
+
+
+def test_reports_match_pandas_groupby(transformed_reference_df):
+    forecasts = random_forecasts(transformed_reference_df)
+    reports = forecast_reports(forecasts, transformed_reference_df)
+
+    for group in ["Location", "Date"]:
+        report = reports[group]
+        grouped = forecasts.groupby(group)[OUTPUT_COLUMN]
+        expected = pd.DataFrame(
+            {
+                "Rows": grouped.size(),
+                "Min (°C)": grouped.min(),
+                "Mean (°C)": grouped.mean(),
+                "Max (°C)": grouped.max(),
+                "Frost Count": (forecasts[OUTPUT_COLUMN] < 0)
+                .groupby(forecasts[group])
+                .sum(),
+            }
+        )
+        pd.testing.assert_frame_equal(
+            report[expected.columns], expected, check_dtype=False
+        )
+        cells = report.columns[5:]
+        assert (report[cells].sum(axis=1) == report["Rows"]).all()
+        assert "39-51 kn / 6-8 oktas" not in cells
+
+    # Without the bin columns the same reports are built by re-binning
+    unbinned = forecasts.drop(columns=["Wind Bin", "Cloud Bin"])
+    rebinned = forecast_reports(unbinned, transformed_reference_df)
+    for group, report in reports.items():
+        pd.testing.assert_frame_equal(rebinned[group], report)
+
+
+def test_reports_zip(trial_df, transformed_reference_df):
+    forecasts = calculate_overnight_temp(trial_df, transformed_reference_df)
+    reports = forecast_reports(forecasts, transformed_reference_df)
+
+    with zipfile.ZipFile(io.BytesIO(reports_zip(reports))) as archive:
+        by_location = pd.read_csv(archive.open("report_by_location.csv"), index_col=0)
+    assert by_location["Rows"].to_dict() == {"A": 1, "B": 2, "C": 1}
+    assert by_location.loc["B", "Mean (°C)"] == 10.0
+
+
+def test_reports_group_missing_keys(trial_df, transformed_reference_df):
+    trial_df.loc[1, "Location"] = np.nan
+    forecasts = calculate_overnight_temp(trial_df, transformed_reference_df)
+    reports = forecast_reports(
+        forecasts.drop(columns=["Date"]), transformed_reference_df
+    )
+
+    assert list(reports) == ["Location"]
+    by_location = reports["Location"]
+    assert by_location["Rows"].tolist() == [1, 1, 1, 1]
+    assert pd.isna(by_location.index[-1])  # Sorted last
+    assert forecast_reports(forecasts[[OUTPUT_COLUMN]], transformed_reference_df) == {}
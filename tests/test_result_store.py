@@ -0,0 +1,111 @@
+import io
+import os
+import time
+import pandas as pd
+import pytest
+from src.result_store import ResultStore
+
+
+def test_result_store_round_trip(trial_df):
+    store = ResultStore()
+    key = store.put(trial_df)
+
+    csv = store.get(key)
+    pd.testing.assert_frame_equal(pd.read_csv(io.BytesIO(csv), index_col=0), trial_df)
+    assert store.get("0" * 32) is None
+    assert store.get("../../etc/passwd") is None
+    assert store.stats()["hits"] == 1
+
+
+def test_result_store_evicts_and_spills(tmp_path, trial_df):
+    store = ResultStore(max_bytes=1, spill_dir=str(tmp_path))
+    first = store.put(trial_df)
+    second = store.put(trial_df)
+
+    assert store.stats()["entries"] == 1
+    assert store.stats()["spills"] == 1
+    assert (tmp_path / f"{first}.csv.gz").exists()
+    assert store.get(first) == store.get(second)
+
+
+def test_result_store_evicts_without_spill(trial_df):
+    store = ResultStore(max_bytes=1)
+    first = store.put(trial_df)
+    store.put(trial_df)
+    assert store.get(first) is None
+
+
+def test_result_store_write_through_shares_results(tmp_path, trial_df):
+    writer = ResultStore(spill_dir=str(tmp_path), write_through=True)
+    reader = ResultStore(spill_dir=str(tmp_path))
+    key = writer.put(trial_df)
+    assert reader.get(key) == writer.get(key)
+
+
+def test_result_store_put_bytes_under_shared_key(trial_df):
+    forecasts = ResultStore()
+    reports = ResultStore()
+    key = forecasts.put(trial_df)
+
+    assert reports.put_bytes(b"report", key=key) == key
+    assert key in reports and "0" * 32 not in reports
+    assert reports.get(key) == b"report"
+    reports.put_bytes(b"replaced", key=key)
+    assert reports.get(key) == b"replaced"
+    assert reports.stats()["entries"] == 1
+    with pytest.raises(ValueError, match="Invalid result ID"):
+        reports.put_bytes(b"report", key="../escape")
+
+
+def test_result_store_prunes_spill_directory(tmp_path, trial_df):
+    store = ResultStore(max_bytes=1, spill_dir=str(tmp_path))
+    first = store.put(trial_df)
+    second = store.put(trial_df)
+    store.spill_max_bytes = (tmp_path / f"{first}.csv.gz").stat().st_size
+    # Make the first file the older one, but not old enough to expire by age
+    older = time.time() - 60
+    os.utime(tmp_path / f"{first}.csv.gz", (older, older))
+    third = store.put(trial_df)
+
+    # Spilling the second result leaves room for one file, so the oldest goes
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{second}.csv.gz"]
+    assert store.get(first) is None
+    assert store.get(third) is not None
+    assert store.stats()["expired"] == 1
+
+
+def test_result_store_expires_old_spill_files(tmp_path, trial_df):
+    writer = ResultStore(spill_dir=str(tmp_path), write_through=True)
+    key = writer.put(trial_df)
+    stale = tmp_path / f"{'0' * 32}.csv.gz"
+    stale.write_bytes(b"stale")
+    os.utime(stale, (0, 0))
+
+    writer.put(trial_df)
+    assert not stale.exists()
+    assert (tmp_path / f"{key}.csv.gz").exists()
+
+
+def test_result_store_reuses_decoded_result(trial_df):
+    store = ResultStore()
+    key = store.put_bytes(b"first")
+    assert store.get(key) is store.get(key)
+    store.put_bytes(b"second", key=key)
+    assert store.get(key) == b"second"
+
+
+def test_result_store_counts_decoded_result(trial_df):
+    data = trial_df.to_csv().encode("utf-8")
+    store = ResultStore()
+    key = store.put_bytes(data)
+    payload_bytes = store.stats()["bytes"]
+    store.get(key)
+    assert store.stats()["bytes"] == payload_bytes + len(data)
+
+    # Room for the compressed result but not its decoded copy as well
+    tight = ResultStore(max_bytes=payload_bytes + len(data) - 1)
+    key = tight.put_bytes(data)
+    assert tight.get(key) == data
+    assert tight.stats()["bytes"] == payload_bytes
+    assert tight.get(key) is not tight.get(key)
+    assert tight.stats()["entries"] == 1
@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+from src import scalar
+from src.calculations import forecast_arrays
+from src.scalar import ScalarForecaster, forecast_one, get_forecaster
+from src.utils import KTable
+
+
+def test_forecaster_matches_array_engine(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    forecaster = ScalarForecaster(table)
+    rng = np.random.default_rng(1)
+    n = 500
+    temps = rng.uniform(-10, 35, n).round(1)
+    dews = rng.uniform(-15, 25, n).round(1)
+    winds = rng.integers(0, 38, n) + rng.choice([0.0, 0.5], n)
+    clouds = rng.integers(0, 9, n).astype(float)
+
+    expected = forecast_arrays(temps, dews, winds, clouds, table)
+    results = [forecaster.forecast(*row) for row in zip(temps, dews, winds, clouds)]
+    np.testing.assert_array_equal(results, expected)
+
+
+def test_forecaster_memoizes_quantized_inputs(transformed_reference_df):
+    forecaster = ScalarForecaster(transformed_reference_df, maxsize=2, decimals=3)
+
+    first = forecaster.forecast(20.3, 10.1, 5.2, 3)
+    assert forecaster.forecast(20.3 + 1e-9, 10.1, 5.2, 3.0) == first
+    forecaster.forecast(21.0, 10.1, 5.2, 3)
+    forecaster.forecast(22.0, 10.1, 5.2, 3)
+    assert forecaster.stats() == {"hits": 1, "misses": 3, "entries": 2, "maxsize": 2}
+
+    forecaster.clear()
+    assert forecaster.stats()["entries"] == 0
+
+
+def test_forecaster_rejects_invalid_inputs(transformed_reference_df):
+    forecaster = ScalarForecaster(transformed_reference_df)
+    with pytest.raises(ValueError, match="does not fall into any defined range"):
+        forecaster.forecast(20.0, 10.0, 12.4, 3)
+    with pytest.raises(ValueError, match="is not found"):
+        forecaster.forecast(20.0, 10.0, 45.0, 7)
+    assert forecaster.stats()["entries"] == 0
+
+
+def test_forecast_one_reloads_changed_reference(
+    tmp_path, transformed_reference_df, monkeypatch
+):
+    path = str(tmp_path / "reference.csv")
+    transformed_reference_df.to_csv(path, index=False)
+    assert forecast_one(20.3, 10.1, 5.2, 3, reference=path) == 9.0
+    assert get_forecaster(path) is get_forecaster(path)
+
+    changed = transformed_reference_df.copy()
+    changed["K Value"] += 10
+    changed.to_csv(path, index=False)
+    monkeypatch.setattr(scalar, "RELOAD_INTERVAL", 0.0)
+    assert forecast_one(20.3, 10.1, 5.2, 3, reference=path) != 9.0
+
+
+def test_forecaster_computes_from_exact_inputs(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    # 12.4996 is in no wind range, though it rounds to 12.5 at three places
+    with pytest.raises(ValueError, match="does not fall into any defined range"):
+        forecast_arrays(20.0, 10.0, 12.4996, 3, table)
+    forecaster = ScalarForecaster(table)
+    forecaster.forecast(20.0, 10.0, 12.5, 3)
+    with pytest.raises(ValueError, match="does not fall into any defined range"):
+        forecaster.forecast(20.0, 10.0, 12.4996, 3)
+
+    # Rounded inputs give the same forecast whether or not 12.5 was asked first
+    expected = forecast_arrays(20.0, 10.0, 12.5, 3, table)
+    assert (
+        ScalarForecaster(table, decimals=3).forecast(20.0, 10.0, 12.4996, 3) == expected
+    )
@@ -0,0 +1,103 @@
+import gzip
+import json
+import pytest
+from flask import Flask
+from src import service
+from src.calculations import calculate_overnight_temp
+from src.service import NDJSON, create_forecast_api
+from src.utils import KTable
+
+REFERENCE_PATH = "./data/processed/transformed_reference.csv"
+
+
+@pytest.fixture
+def client(transformed_reference_df):
+    server = Flask(__name__)
+    server.register_blueprint(create_forecast_api(REFERENCE_PATH))
+    return server.test_client()
+
+
+@pytest.fixture
+def records(trial_df):
+    return [
+        {"temp": t, "dew": d, "wind": w, "cloud": c}
+        for t, d, w, c in trial_df.iloc[:, 2:6].itertuples(index=False)
+    ]
+
+
+@pytest.fixture
+def expected(trial_df, transformed_reference_df):
+    forecasts = calculate_overnight_temp(trial_df.copy(), transformed_reference_df)
+    return forecasts["Overnight Min Temperature (°C)"].tolist()
+
+
+def test_json_records_and_columns(client, records, expected, transformed_reference_df):
+    version = KTable.from_frame(transformed_reference_df).version
+    response = client.post("/api/forecast", json=records)
+    assert response.status_code == 200
+    assert response.get_json() == {
+        "overnight_min": expected,
+        "reference_version": version,
+    }
+    assert response.headers["X-Reference-Version"] == version
+
+    columns = {field: [row[field] for row in records] for field in records[0]}
+    response = client.post("/api/forecast", json=columns)
+    assert response.get_json()["overnight_min"] == expected
+
+
+def test_ndjson_streaming_with_gzip(client, records, expected, monkeypatch):
+    monkeypatch.setattr(service, "STREAM_BLOCK_ROWS", 3)
+    body = "\n".join(json.dumps(row) for row in records).encode("utf-8")
+    response = client.post(
+        "/api/forecast",
+        data=gzip.compress(body),
+        headers={
+            "Content-Type": NDJSON,
+            "Content-Encoding": "gzip",
+            "Accept-Encoding": "gzip",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    lines = gzip.decompress(response.get_data()).decode("utf-8").splitlines()
+    assert [json.loads(line)["overnight_min"] for line in lines] == expected
+
+
+def test_streamed_error_after_first_batch(client, monkeypatch):
+    monkeypatch.setattr(service, "STREAM_BLOCK_ROWS", 1)
+    columns = {"temp": [20, 20], "dew": [10, 10], "wind": [5, 12.4], "cloud": [3, 3]}
+    response = client.post("/api/forecast", json=columns, headers={"Accept": NDJSON})
+    lines = [json.loads(line) for line in response.get_data().splitlines()]
+    assert response.status_code == 200
+    assert lines[0] == {"overnight_min": 9.0}
+    assert "does not fall into any defined range" in lines[1]["error"]
+
+
+@pytest.mark.parametrize(
+    "payload, message",
+    [
+        ({"temp": [1], "dew": [1], "wind": [1]}, "Missing fields"),
+        ([{"temp": 1}], "Every record must be an object"),
+        ({"temp": ["x"], "dew": [1], "wind": [1], "cloud": [1]}, "must be numbers"),
+        ({"temp": [1, 2], "dew": [1], "wind": [1], "cloud": [1]}, "same length"),
+        ({"temp": [1], "dew": [1], "wind": [45], "cloud": [7]}, "is not found"),
+    ],
+)
+def test_rejects_invalid_batches(client, payload, message):
+    response = client.post("/api/forecast", json=payload)
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
+def test_rejects_oversized_bodies(client, monkeypatch):
+    monkeypatch.setattr(service, "MAX_REQUEST_BYTES", 100)
+    monkeypatch.setattr(service, "MAX_DECODED_BYTES", 1000)
+    response = client.post("/api/forecast", data=b"[" + b" " * 200 + b"]")
+    assert response.status_code == 413
+
+    bomb = gzip.compress(b" " * 10_000)
+    response = client.post(
+        "/api/forecast", data=bomb, headers={"Content-Encoding": "gzip"}
+    )
+    assert len(bomb) < 100 and response.status_code == 413
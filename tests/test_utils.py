@@ -1,6 +1,7 @@
 import pytest
+import numpy as np
 import pandas as pd
-from src.utils import find_range, k_value_lookup
+from src.utils import KTable, RangeBins, as_ktable, find_range, k_value_lookup
 
 
 def test_find_range():
@@ -34,3 +35,187 @@ def test_k_lookup():
 
     with pytest.raises(ValueError):
         k_value_lookup(100, 100, df)
+
+
+def scan_round_value(value):
+    """The original round_value, kept so the oracles don't share src code."""
+    return int(value + 0.5) if value >= 0 else int(value - 0.5)
+
+
+def scan_find_range(value, column, reference):
+    """The original row-scanning find_range, used as an oracle for RangeBins."""
+    value = float(value)
+    rounded_value = float(scan_round_value(value))
+    for _, row in reference.iterrows():
+        lower, upper = map(float, row[column].split("-"))
+        if (lower <= value <= upper) or (lower <= rounded_value < upper):
+            return row[column]
+    raise ValueError(f"Value {value} does not fall into any defined range.")
+
+
+def random_labels(rng):
+    """Draw range labels: ascending or shuffled, with gaps, overlaps and repeats."""
+    n = rng.integers(1, 7)
+    step = rng.choice([1.0, 0.5, 2.5])
+    lower = np.cumsum(rng.integers(0, 4, n)) * step
+    upper = lower + rng.integers(0, 4, n) * step
+    labels = [f"{lo:g}-{hi:g}" for lo, hi in zip(lower, upper)]
+    if rng.random() < 0.5:
+        rng.shuffle(labels)
+    if rng.random() < 0.5:
+        labels += list(rng.choice(labels, rng.integers(1, 4)))
+    return labels
+
+
+def random_values(rng, labels, n=60):
+    """Draw values on, next to and between the edges, halfway points included."""
+    edges = np.array([float(x) for label in labels for x in label.split("-")])
+    near_edges = rng.choice(edges, n) + rng.choice(
+        [0.0, 0.5, -0.5, 0.49, -0.49, 1e-9, -1e-9, 0.25], n
+    )
+    spread = rng.uniform(edges.min() - 2, edges.max() + 2, n).round(rng.integers(0, 3))
+    return np.concatenate([near_edges, spread])
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_range_bins_match_find_range_scan(seed):
+    rng = np.random.default_rng(seed)
+    labels = random_labels(rng)
+    reference = pd.DataFrame({"Range": labels})
+    bins = RangeBins(list(dict.fromkeys(labels)))
+    values = random_values(rng, labels)
+
+    expected = []
+    for value in values:
+        try:
+            label = scan_find_range(value, "Range", reference)
+        except ValueError:
+            expected.append(-1)
+            with pytest.raises(ValueError):
+                find_range(value, "Range", reference)
+            with pytest.raises(ValueError):
+                bins.code(value)
+            continue
+        expected.append(bins.labels.index(label))
+        assert find_range(value, "Range", reference) == label
+        assert bins.code(value) == expected[-1]
+
+    np.testing.assert_array_equal(bins.codes(values, strict=False), expected)
+    if -1 in expected:
+        with pytest.raises(ValueError):
+            bins.codes(values)
+    else:
+        np.testing.assert_array_equal(bins.codes(values), expected)
+
+
+def test_range_bins_codes_keep_shape():
+    bins = RangeBins(["0-12", "13-25", "26-38"])
+    values = np.array([[0.0, 12.4, 13.0], [25.0, 38.0, np.nan]])
+    np.testing.assert_array_equal(
+        bins.codes(values, strict=False), [[0, -1, 1], [1, 2, -1]]
+    )
+
+
+def scan_k_value_lookup(wind_value, cloud_value, reference):
+    """The original row-scanning lookup, used as an oracle for KTable."""
+    wind_range = scan_find_range(wind_value, "Wind Speed Range (kn)", reference)
+    cloud_range = scan_find_range(cloud_value, "Cloud Cover Range (oktas)", reference)
+    k_value = reference[
+        (reference["Wind Speed Range (kn)"] == wind_range)
+        & (reference["Cloud Cover Range (oktas)"] == cloud_range)
+    ]
+    if k_value.empty:
+        return np.nan
+    return k_value["K Value"].values[0]
+
+
+def scan_overnight_minimum(midday_temp, midday_dew, wind, cloud, reference):
+    """The original per-row forecast, used as an oracle for the engines."""
+    k_value = scan_k_value_lookup(wind, cloud, reference)
+    if np.isnan(k_value):
+        raise ValueError(f"K value for wind {wind} and cloud {cloud} is not found.")
+    return float(
+        scan_round_value((0.316 * midday_temp) + (0.548 * midday_dew) - 1.24 + k_value)
+    )
+
+
+def test_ktable_matches_reference_scan(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    rng = np.random.default_rng(0)
+    winds = np.concatenate([rng.uniform(0, 52, 200).round(1), [12, 12.5, 25, 51]])
+    clouds = np.concatenate([rng.uniform(0, 8.5, 200).round(1), [2, 4, 6, 8]])
+
+    for wind, cloud in zip(winds, clouds):
+        try:
+            expected = scan_k_value_lookup(wind, cloud, transformed_reference_df)
+        except ValueError:
+            with pytest.raises(ValueError):
+                table.lookup(wind, cloud)
+            continue
+        np.testing.assert_equal(table.lookup(wind, cloud), expected)
+
+
+def test_ktable_wide_and_long_layouts_agree(reference_df, transformed_reference_df):
+    wide = KTable.from_frame(reference_df)
+    long = KTable.from_frame(transformed_reference_df)
+
+    assert wide.wind_ranges == long.wind_ranges == ["0-12", "13-25", "26-38", "39-51"]
+    assert wide.cloud_ranges == long.cloud_ranges == ["0-2", "2-4", "4-6", "6-8"]
+    np.testing.assert_array_equal(wide.k_values, long.k_values)
+    assert np.isnan(long.lookup(45, 7))
+
+
+def test_as_ktable_compiles_each_reference_once(transformed_reference_df):
+    table = as_ktable(transformed_reference_df)
+    assert as_ktable(transformed_reference_df) is table
+    assert as_ktable(transformed_reference_df.copy()) is table
+    assert as_ktable(table) is table
+
+    changed = transformed_reference_df.copy()
+    changed.loc[0, "K Value"] += 1
+    assert as_ktable(changed) is not table
+    assert k_value_lookup(5, 1, changed) == k_value_lookup(5, 1, table) + 1
+
+
+def test_ktable_lookup_array(transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    winds = np.array([14.56, 3.4, 0.0, 12.5, 45.0])
+    clouds = np.array([3.9, 6.0, 0.0, 4.1, 7.0])
+
+    result = table.lookup_array(winds, clouds)
+    expected = [table.lookup(w, c) for w, c in zip(winds, clouds)]
+    np.testing.assert_array_equal(result, expected)
+
+    with pytest.raises(ValueError):
+        table.lookup_array(np.array([12.3]), np.array([1.0]))
+
+
+def test_k_lookup_missing_combination(transformed_reference_df):
+    with pytest.raises(ValueError):
+        k_value_lookup(45, 7, transformed_reference_df)
+
+
+def test_ktable_artifact_round_trip(tmp_path, transformed_reference_df):
+    table = KTable.from_frame(transformed_reference_df)
+    path = str(tmp_path / "reference.ktable")
+    table.save(path)
+
+    loaded = KTable.load(path)
+    assert loaded.version == table.version
+    assert loaded.wind_ranges == table.wind_ranges
+    np.testing.assert_array_equal(loaded.k_values, table.k_values)
+    for wind in [0, 12.5, 25, 38, 51]:
+        assert loaded.wind_range(wind) == table.wind_range(wind)
+    assert np.isnan(loaded.lookup(45, 7))
+
+    changed = KTable(table.wind_ranges, table.cloud_ranges, table.k_values + 0.1)
+    assert changed.version != table.version
+
+
+def test_ktable_artifact_rejects_bad_data(transformed_reference_df):
+    data = bytearray(KTable.from_frame(transformed_reference_df).to_bytes())
+    with pytest.raises(ValueError, match="not a reference artifact"):
+        KTable.from_bytes(b"Wind Speed Range (kn),...")
+    data[-30] ^= 0xFF  # Corrupt a K value
+    with pytest.raises(ValueError, match="does not match its digest"):
+        KTable.from_bytes(bytes(data))